@@ -0,0 +1,232 @@
+"""
+Declarative rules attributing PowerplayMerits to the activity that earned them.
+
+Each rule names the journal event that earns the merits, the tests on its fields, where it may appear in
+the recent journal (position 0 being the PowerplayMerits entry itself) and, by its place in the list, its
+precedence. ActivityRules compiles the list into a table from event code to the rules that event can
+trigger, so classifying a merits entry only evaluates the rules whose event is actually in the window.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Pattern, Sequence
+
+Predicate = Callable[[dict], bool]
+
+#Interned event codes, shared by every RecentJournal, assigned the first time a lower case event name is seen
+_event_codes: dict[str, int] = {}
+
+def event_code(event: str) -> int:
+    """
+    The interned code for a lower case event name.
+    """
+    code = _event_codes.get(event)
+    if code is None:
+        code = _event_codes.setdefault(event, len(_event_codes))
+    return code
+
+def field_in(name: str, values: Iterable[Any]) -> Predicate:
+    values = frozenset(values)
+    return lambda entry: entry.get(name, "") in values
+
+def field_equals(name: str, value: Any, default: Any = "") -> Predicate:
+    return lambda entry: entry.get(name, default) == value
+
+def field_matches(name: str, pattern: Pattern[str]) -> Predicate:
+    return lambda entry: pattern.match(entry.get(name, "")) is not None
+
+def field_at_least(name: str, value: float) -> Predicate:
+    return lambda entry: entry.get(name, 0) >= value
+
+def field_at_most(name: str, value: float) -> Predicate:
+    return lambda entry: entry.get(name, 0) <= value
+
+def field_false(name: str) -> Predicate:
+    """
+    The field is present and false, e.g. ShipTargeted TargetLocked.
+    """
+    return lambda entry: not entry.get(name, True)
+
+def all_of(tests: Sequence[Predicate]) -> Predicate:
+    """
+    A single predicate for a list of them.
+    """
+    if not tests:
+        return lambda entry: True
+    if len(tests) == 1:
+        return tests[0]
+    return lambda entry: all(test(entry) for test in tests)
+
+def sale_markup_at_least(ratio: float) -> Predicate:
+    """
+    A MarketSell at the ratio or more of the price paid, bought goods only.
+    """
+    return lambda entry: entry.get("AvgPricePaid", 0) > 0 and entry.get("SellPrice", 1) / entry.get("AvgPricePaid", 1) >= ratio
+
+
+class Classification(NamedTuple):
+    """
+    The activity a PowerplayMerits entry was earned by, see RecentJournal.classify.
+    """
+    activity: str                   # One of the RecentJournal activity names, e.g. RecentJournal.BOUNTY
+    evidence: tuple[int, ...] = ()  # Indices (most recent first) of the records the activity was matched on
+    mined_commodity: str = ""       # The commodity sold, for RecentJournal.MINED
+    mined_tonnage: int = 0          # The tonnage sold, for RecentJournal.MINED
+
+
+class ActivityRule(NamedTuple):
+    """
+    One way of earning merits.
+    """
+    activity: str
+    event: Optional[str]                        # The event that earns the merits, as written in the journal, None for a rule on the journal state alone
+    where: tuple[Predicate, ...] = ()           # Tests on the fields of that event
+    positions: tuple[int, ...] = (1, 2)         # Where the event may be, most recent first
+    min_records: int = 3                        # Records needed in the journal for the rule to apply at all
+    merits_where: tuple[Predicate, ...] = ()    # Tests on the fields of the PowerplayMerits entry
+    unchecked: tuple[int, ...] = ()             # Positions at which position 0 is not required to be a PowerplayMerits entry
+    skip: Optional[frozenset[str]] = None       # Events allowed between position 0 and the event, None for any
+    skip_once: frozenset[str] = frozenset()     # Events allowed once between position 0 and the event
+    state: Optional[Callable[[Any], bool]] = None  # Test on the RecentJournal, for rules without an event
+    mined: bool = False                         # The event is a mined commodity sale
+
+    def compile(self) -> Callable[[Sequence[Any], bool, Any], Optional[int]]:
+        """
+        Build the function that applies the rule, called with the JournalRecords (most recent first), whether
+        position 0 is a PowerplayMerits entry and the RecentJournal. It returns the position of the event that
+        satisfies the rule, 0 for a state rule, or None.
+        """
+        if self.event is None:
+            state = self.state
+            return lambda log, is_merits, journal: 0 if state is not None and state(journal) else None
+
+        event = self.event
+        positions = self.positions
+        min_records = self.min_records
+        unchecked = frozenset(self.unchecked)
+        test = all_of(self.where)
+        merits_test = all_of(self.merits_where)
+
+        if self.skip is None:
+            def match(log: Sequence[Any], is_merits: bool, journal: Any) -> Optional[int]:
+                # The whole journal, the log may stop short at the evidence window
+                if len(journal) < min_records:
+                    return None
+                count = len(log)
+                merits = is_merits and merits_test(log[0].entry)
+                for position in positions:
+                    if position >= count:
+                        return None
+                    record = log[position]
+                    if record.name == event and (merits or position in unchecked) and test(record.entry):
+                        return position
+                return None
+            return match
+
+        skip = self.skip
+        skip_once = self.skip_once
+
+        def match_through(log: Sequence[Any], is_merits: bool, journal: Any) -> Optional[int]:
+            if len(journal) < min_records:
+                return None
+            count = len(log)
+            merits = is_merits and merits_test(log[0].entry)
+            skipped = False
+            for position in positions:
+                if position >= count:
+                    return None
+                record = log[position]
+                name = record.name
+                if name == event and (merits or position in unchecked) and test(record.entry):
+                    return position
+                if name in skip:
+                    continue
+                if name in skip_once and not skipped:
+                    skipped = True
+                    continue
+                return None
+            return None
+        return match_through
+
+
+class ActivityRules:
+    """
+    A list of ActivityRules, in precedence order, compiled into a dispatch table keyed by event code.
+    """
+
+    def __init__(self, rules: Sequence[ActivityRule], unknown: str, merits_event: str = "powerplaymerits") -> None:
+        """
+        :param rules: The rules, the first that matches wins
+        :param unknown: The activity when no rule matches
+        :param merits_event: The lower case name of the merits event at position 0
+        """
+        self.rules = tuple(rules)
+        self.matchers = tuple(rule.compile() for rule in self.rules)
+        self.unknown = unknown
+        self.merits_code = event_code(merits_event)
+        # Bit i of a mask is rule i, so lower bits are higher precedence
+        self.by_code: dict[int, int] = {}
+        self.always = 0
+        self.through: set[int] = set()
+        self.reach = 1
+        for index, rule in enumerate(self.rules):
+            if rule.event is None:
+                self.always |= 1 << index
+                continue
+            code = event_code(rule.event.lower())
+            self.by_code[code] = self.by_code.get(code, 0) | 1 << index
+            if rule.skip is None:
+                self.reach = max(self.reach, max(rule.positions))
+            else:
+                self.through.update(event_code(event.lower()) for event in rule.skip | rule.skip_once)
+
+    def candidates(self, log: Sequence[Any]) -> int:
+        """
+        The mask of the rules whose event is in the window of the most recent records.
+        """
+        mask = self.always
+        by_code = self.by_code
+        through = self.through
+        reach = self.reach
+        for position in range(1, len(log)):
+            code = log[position].code
+            mask |= by_code.get(code, 0)
+            # Past the fixed positions, only look further while the records could be skipped over
+            if position >= reach and code not in through:
+                break
+        return mask
+
+    def matches(self, log: Sequence[Any], journal: Any, activity: str, event: Optional[str] = None) -> bool:
+        """
+        Whether any rule for the activity matches the records, most recent first, whatever the precedence.
+
+        :param activity: The activity of the rules
+        :param event: Only the rules for this event, e.g. "MaterialCollected" of the scan rules, any if None
+        """
+        is_merits = bool(log) and log[0].code == self.merits_code
+        return any(matcher(log, is_merits, journal) is not None for rule, matcher in zip(self.rules, self.matchers)
+                   if rule.activity == activity and (event is None or rule.event == event))
+
+    def classify(self, log: Sequence[Any], journal: Any) -> Classification:
+        """
+        Apply the first matching rule to the records, most recent first.
+        """
+        is_merits = bool(log) and log[0].code == self.merits_code
+        rules = self.rules
+        matchers = self.matchers
+        mask = self.candidates(log)
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            index = low.bit_length() - 1
+            position = matchers[index](log, is_merits, journal)
+            if position is None:
+                continue
+            rule = rules[index]
+            if rule.event is None:
+                return Classification(rule.activity)
+            evidence = (0, position) if is_merits else (position,)
+            if rule.mined:
+                entry = log[position].entry
+                return Classification(rule.activity, evidence, entry.get("Type", ""), entry.get("Count", 0))
+            return Classification(rule.activity, evidence)
+        return Classification(self.unknown)
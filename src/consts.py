@@ -1,3 +1,4 @@
 PLUGIN_NAME: str = 'PowerPlayProgress'
 plugin_version: str = '0.9.25'
-mined_heading: str = "Mined:"
\ No newline at end of file
+mined_heading: str = "Mined:"
+refresh_interval_ms: int = 250 # Minimum time between display refreshes
@@ -0,0 +1,98 @@
+"""
+Start up seeding of the power, rank and merits.
+
+Until a Powerplay or PowerplayMerits entry arrives the plugin does not know the power or the total merits
+and the progress bar shows "Awaiting data". The game writes a Powerplay entry when it loads and the totals
+only move with the entries after it, so the latest values are in the last few Powerplay* lines of the newest
+journals. Rather than parse the files from the start, they are memory mapped and searched backwards for
+those lines, and only those lines are parsed.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Union
+from journalcatchup import newest_journals
+from powerplaystate import PowerPlayState, Section
+from pluginlogger import logger
+
+# Also matches PowerplayCollect, PowerplayDeliver etc, which are skipped once parsed
+_marker = b'"event":"Powerplay'
+_events = frozenset({"Powerplay", "PowerplayMerits", "PowerplayRank"})
+
+
+def reverse_powerplay_entries(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    The Powerplay, PowerplayMerits and PowerplayRank entries of a journal file, newest first.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = size
+            while True:
+                position = mm.rfind(_marker, 0, end)
+                if position < 0:
+                    return
+                start = mm.rfind(b"\n", 0, position) + 1
+                line_end = mm.find(b"\n", position)
+                end = start
+                try:
+                    entry = json.loads(mm[start:line_end if line_end >= 0 else size])
+                except ValueError:
+                    # e.g. the last line while the game is writing it
+                    continue
+                if entry.get("event") in _events:
+                    yield entry
+
+
+def bootstrap(ppp: PowerPlayState, journal_dir: Union[str, Path], max_files: int = 2) -> bool:
+    """
+    Seed the power, rank and merits from the newest journals.
+
+    :param ppp: The state to seed
+    :param journal_dir: The folder the game writes its journals to
+    :param max_files: The most journal files to search, newest first, for the Powerplay entry
+    :return: True if the merits were found
+    """
+    powerplay = merits = rank = None
+    try:
+        for journal in newest_journals(journal_dir)[:max_files]:
+            for entry in reverse_powerplay_entries(journal):
+                event = entry["event"]
+                if event == "Powerplay":
+                    # Written when the game loads, everything before it is out of date
+                    powerplay = entry
+                    break
+                if event == "PowerplayMerits" and merits is None:
+                    merits = entry
+                elif event == "PowerplayRank" and rank is None:
+                    rank = entry
+            if powerplay is not None:
+                break
+    except OSError as e:
+        logger.error(f"Journal bootstrap failed: {e}")
+    if powerplay is None and merits is None:
+        return False
+
+    session = ppp.current_session
+    if powerplay is not None:
+        # The same as JournalProcessor.on_powerplay, the session starts when the game was loaded
+        session.power_play = powerplay["Power"]
+        session.power_play_rank = int(powerplay["Rank"])
+        ppp.starting_merits = int(powerplay["Merits"])
+        ppp.total_merits = int(powerplay["Merits"])
+    else:
+        session.power_play = merits["Power"]
+        session.power_play_rank = ppp.CurrentRank(int(merits["TotalMerits"]))
+        ppp.starting_merits = int(merits["TotalMerits"]) - int(merits["MeritsGained"])
+    if merits is not None:
+        ppp.total_merits = int(merits["TotalMerits"])
+    if rank is not None:
+        session.power_play_rank = int(rank["Rank"])
+    ppp.changed_sections |= Section.PROGRESS | Section.SOCIALS | Section.TOTALS
+    logger.debug(f"Bootstrapped {session.power_play}, rank {session.power_play_rank}, merits {ppp.total_merits}")
+    return True
@@ -0,0 +1,208 @@
+"""
+Start up catch up from the current journal.
+
+When EDMC (or the plugin) is started mid session the plugin only sees the journal entries written from then
+on. JournalCatchUp reads the entries of the active journal file that were missed, from the checkpoint saved
+when the plugin last stopped or else from the start of the file, and feeds them through the same
+JournalProcessor as load.journal_entry. A journal without a checkpoint that already ends with the game
+shutting down is not caught up, that session is over. The file is streamed a line at a time and only the lines for events
+the processor uses are parsed.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Optional, Union
+from journalprocessor import JournalProcessor
+from meritstore import Checkpoint
+from powerplaystate import PowerPlayState
+from recentjournal import RecentJournal
+from pluginlogger import logger
+
+_event = re.compile(rb'"event"\s*:\s*"([^"]*)"')
+_timestamp = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+
+
+def newest_journals(journal_dir: Union[str, Path]) -> list[Path]:
+    """
+    The Journal.*.log files in the folder, most recently modified first.
+    """
+    return sorted(Path(journal_dir).glob("Journal.*.log"), key=lambda path: (path.stat().st_mtime, path.name), reverse=True)
+
+
+def active_journal(journal_dir: Union[str, Path]) -> Optional[Path]:
+    """
+    The journal file the game is writing to, the most recently modified Journal.*.log in the folder.
+    """
+    journals = newest_journals(journal_dir)
+    return journals[0] if journals else None
+
+
+def end_checkpoint(ppp: PowerPlayState, journal_dir: Union[str, Path]) -> Optional[Checkpoint]:
+    """
+    A checkpoint at the end of the active journal, in the current system, e.g. when the plugin stops.
+    """
+    journal = active_journal(journal_dir)
+    if journal is None:
+        return None
+    system = ppp.current_system
+    return Checkpoint(journal.name, journal.stat().st_size, system.system, system.system_address, system.position)
+
+
+def starts_new_game(path: Union[str, Path]) -> bool:
+    """
+    Whether the journal was started by the game being loaded, rather than continuing the last journal (part 2 on).
+    """
+    with open(path, "rb") as f:
+        line = f.readline()
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return False
+    return header.get("event") == "Fileheader" and int(header.get("part", 1)) <= 1
+
+
+def has_shut_down(path: Union[str, Path]) -> bool:
+    """
+    Whether the last entry of the journal is Shutdown, i.e. the game it was written by has exited.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        # Far more than a Shutdown entry, the last line is only looked at if it is complete within this
+        f.seek(max(size - 4096, 0))
+        lines = f.read().splitlines()
+    last = next((line for line in reversed(lines) if line.strip()), b"")
+    match = _event.search(last)
+    return match is not None and match.group(1) == b"Shutdown"
+
+
+def first_timestamp(path: Union[str, Path], offset: int) -> Optional[str]:
+    """
+    The timestamp of the first entry at or after the offset, None if there are no entries there.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            match = _timestamp.search(line)
+            if match is not None:
+                return match.group(1).decode("utf-8")
+    return None
+
+
+class JournalCatchUp:
+    """
+    Feeds the entries of a journal file the plugin has not seen through a JournalProcessor.
+    """
+
+    def __init__(self, processor: JournalProcessor) -> None:
+        self.processor = processor
+        # Mimic the bits of EDMC's monitor state the processor relies on
+        self.system = ""
+        self.state: dict = {}
+        # The events the processor does anything with, any others are skipped without being parsed
+        self.events = frozenset(event.encode("utf-8") for event in (*processor.handlers, *RecentJournal.classifier_events))
+        self.entries = 0
+
+    def run(self, journal_dir: Union[str, Path]) -> int:
+        """
+        Restore the merits from the merit store up to where the active journal is resumed from, then feed the
+        rest of the journal and checkpoint the end of it.
+
+        :param journal_dir: The folder the game writes its journals to
+        :return: The number of entries fed to the processor
+        """
+        ppp = self.processor.ppp
+        store = ppp.merit_store
+        try:
+            journal = active_journal(journal_dir)
+            checkpoint = None
+            if journal is not None and store is not None:
+                checkpoint = store.checkpoint()
+                if checkpoint is not None and (checkpoint.journal != journal.name or checkpoint.offset > journal.stat().st_size):
+                    # A new journal since the plugin stopped, or not the file it was checkpointed in
+                    checkpoint = None
+            offset = checkpoint.offset if checkpoint is not None else 0
+            if journal is None:
+                self.processor.restore()
+                return 0
+            if checkpoint is None and has_shut_down(journal):
+                # Started after the game exited, e.g. EDMC before the game, so there is no session in progress
+                logger.info(f"Not catching up {journal.name}, the game has shut down")
+                return 0
+            if checkpoint is not None or not starts_new_game(journal):
+                # The store has the merits up to the first entry being fed, the entries have the rest
+                self.processor.restore(until=first_timestamp(journal, offset))
+            # else the game has been loaded again since the plugin stopped, so the last session is over even if
+            # it was not shut down, and the new one is all in the journal
+            if checkpoint is not None:
+                self.resume_at(checkpoint)
+            offset = self.play(journal, offset)
+        except OSError as e:
+            logger.error(f"Journal catch up failed: {e}")
+            return self.entries
+        if store is not None:
+            store.save_checkpoint(Checkpoint(journal.name, offset, self.system, self.state.get("SystemAddress"),
+                                             tuple(self.state.get("StarPos", (0.0, 0.0, 0.0)))))
+        logger.info(f"Caught up {self.entries} journal entries from {journal.name}")
+        return self.entries
+
+    def resume_at(self, checkpoint: Checkpoint) -> None:
+        """
+        Start from the system the plugin was in at the checkpoint.
+        """
+        ppp = self.processor.ppp
+        self.system = checkpoint.system
+        self.state["SystemAddress"] = checkpoint.system_address
+        self.state["StarPos"] = list(checkpoint.star_pos)
+        system = ppp.systems.get(checkpoint.system, checkpoint.system_address)
+        if system is not None:
+            ppp.current_system = system
+
+    def play(self, path: Union[str, Path], offset: int = 0) -> int:
+        """
+        Feed the complete lines of the file from the offset.
+
+        :return: The offset after the last complete line, where the next catch up would start
+        """
+        processor = self.processor
+        ppp = processor.ppp
+        store = ppp.merit_store
+        # Merits already in the store (e.g. EDMC stopped without a checkpoint) are not stored again
+        latest = store.latest_timestamp() if store is not None else None
+        events = self.events
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Still being written, EDMC will pass it on
+                        break
+                    offset += len(line)
+                    match = _event.search(line)
+                    # The multi sell wait counts every entry, so while waiting nothing is skipped
+                    if match is None or (match.group(1) not in events and processor.wait_for_multi_sell_carto_data < 0):
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if latest is not None:
+                        ppp.merit_store = store if entry.get("timestamp", "") > latest else None
+                    self.feed(entry)
+        finally:
+            ppp.merit_store = store
+        return offset
+
+    def feed(self, entry: dict) -> None:
+        """
+        Process a single entry, tracking the current system as EDMC would.
+        """
+        if "StarSystem" in entry:
+            self.system = entry["StarSystem"]
+        if "StarPos" in entry:
+            self.state["StarPos"] = entry["StarPos"]
+        if "SystemAddress" in entry:
+            self.state["SystemAddress"] = entry["SystemAddress"]
+        self.processor.process(self.system, entry, self.state)
+        self.entries += 1
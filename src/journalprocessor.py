@@ -0,0 +1,366 @@
+"""
+Journal processing for the plugin.
+
+Applies each journal entry to the power play state: systems, sessions, commodities and the merits by activity.
+There are no tkinter or EDMC dependencies here, load.journal_entry handles the display side.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, Optional
+from meritstore import MeritEvent
+from powerplaystate import PowerPlayState, Section
+from recentjournal import RecentJournal
+from sessionprogress import ActivityKind, SessionProgress
+from systemprogress import SystemProgress
+from pluginlogger import logger
+
+
+class JournalProcessor:
+    """
+    Feeds journal entries into a PowerPlayState.
+    """
+
+    #The ActivityKind the merits of each RecentJournal.classify activity are attributed to
+    activity_kinds: dict[str, ActivityKind] = {
+        RecentJournal.BOUNTY: ActivityKind.BOUNTIES,
+        RecentJournal.RIVAL_POWER_KILLS: ActivityKind.RIVAL_POWER_KILLS,
+        RecentJournal.SCAN: ActivityKind.SHIP_SCANS,
+        RecentJournal.POWERPLAY_DELIVERY: ActivityKind.POWERPLAY_DELIVERIES,
+        RecentJournal.DONATION_MISSION: ActivityKind.DONATION_MISSIONS,
+        RecentJournal.SCAN_DATA_LINKS: ActivityKind.SCAN_DATA_LINKS,
+        RecentJournal.HOLOSCREEN_HACK: ActivityKind.HOLOSCREEN_HACKS,
+        RecentJournal.RARE_GOODS: ActivityKind.RARE_GOODS,
+        RecentJournal.SALVAGE: ActivityKind.SALVAGE,
+        RecentJournal.CARTOGRAPHY: ActivityKind.CARTOGRAPHY,
+        RecentJournal.HIGH_VALUE_COMMODITIES: ActivityKind.HIGH_VALUE_COMMODITIES,
+        RecentJournal.LOW_VALUE_COMMODITIES: ActivityKind.LOW_VALUE_COMMODITIES,
+        RecentJournal.EXOBIOLOGY: ActivityKind.EXOBIOLOGY,
+        RecentJournal.MINED: ActivityKind.MINED,
+        RecentJournal.ON_FOOT: ActivityKind.ON_FOOT,
+        RecentJournal.COMMIT_CRIMES: ActivityKind.COMMIT_CRIMES,
+        RecentJournal.UNKNOWN: ActivityKind.UNKNOWN,
+    }
+
+    def __init__(self, ppp: PowerPlayState) -> None:
+        self.ppp = ppp
+        self.wait_for_multi_sell_carto_data = -1
+        # Keyed by the exact journal event name so dispatch is a single lookup, no lower() per entry
+        self.handlers: dict[str, Callable[[str, dict, dict], Section]] = {
+            "Location": self.on_location,
+            "FSDJump": self.on_fsd_jump,
+            "Died": self.on_docked_or_died,
+            "Docked": self.on_docked_or_died,
+            "PowerplayCollect": self.on_powerplay_commodity,
+            "PowerplayDeliver": self.on_powerplay_commodity,
+            "DeliverPowerMicroResources": self.on_powerplay_commodity,
+            "PowerplayMerits": self.on_powerplay_merits,
+            "PowerplayRank": self.on_powerplay_rank,
+            "Powerplay": self.on_powerplay,
+            "MissionCompleted": self.on_mission_completed,
+            "MultiSellExplorationData": self.on_multi_sell_exploration_data,
+            "LoadGame": self.on_load_game,
+            "Shutdown": self.on_shutdown,
+        }
+
+    def process(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        Process the given journal entry.
+
+        :param system: The current system name, as tracked by EDMC
+        :param entry: The journal entry
+        :param state: The EDMC state dictionary, only StarPos and SystemAddress are used
+        :return: The display sections the entry changed, Section.NONE (falsy) if nothing displayed changed
+        """
+        event = entry.get('event', '')
+        handler = self.handlers.get(event)
+        relevant = handler is not None or event in RecentJournal.classifier_events
+        if relevant:
+            self.ppp.recent_journal_log.add_entry(entry)
+        changes = Section.NONE
+        # The wait counts every journal entry, not just the relevant ones
+        if self.wait_for_multi_sell_carto_data >= 0:
+            changes |= self.count_down_multi_sell_carto_data(entry)
+        if handler is not None:
+            changes |= handler(system, entry, state)
+        self.ppp.changed_sections |= changes
+        return changes
+
+    def count_down_multi_sell_carto_data(self, entry: dict) -> Section:
+        """
+        Assign the multi sell cartography merits once enough entries have been seen after the MultiSellExplorationData.
+        """
+        ppp = self.ppp
+        changes = Section.NONE
+        if self.wait_for_multi_sell_carto_data > 0: 
+            logger.debug(f"Waiting for multi sell carto data: {self.wait_for_multi_sell_carto_data}")
+            self.wait_for_multi_sell_carto_data -= 1
+        if self.wait_for_multi_sell_carto_data == 0:
+            #Now process the multi sell carto data, we have waited for 5 journal entries to be more sure we have all the data
+            logger.debug("Processing multi sell carto data")
+            multi_carto_merits = ppp.recent_journal_log.get_multiple_cartography()
+            logger.debug(f"Multi carto merits: {ppp.recent_journal_log.get_multiple_cartography()}")
+            if multi_carto_merits > 0:
+                self.move_merits(entry, ActivityKind.UNKNOWN, ActivityKind.CARTOGRAPHY, multi_carto_merits)
+                changes = Section.ACTIVITIES
+            self.wait_for_multi_sell_carto_data= -1
+        return changes
+
+    def move_merits(self, entry: dict, from_kind: ActivityKind, to_kind: ActivityKind, merits: int) -> None:
+        """
+        Re-attribute merits already assigned to an activity, e.g. unknowns found to be cartography.
+        """
+        activities = self.ppp.current_session.activities
+        activities.add(to_kind, merits)
+        activities.add(from_kind, -merits)
+        store = self.ppp.merit_store
+        if store is not None:
+            timestamp = entry.get("timestamp", "")
+            store.record(MeritEvent(timestamp, None, "", to_kind, merits))
+            store.record(MeritEvent(timestamp, None, "", from_kind, -merits))
+
+    def restore(self, since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """
+        Rebuild the merits by activity and by system from the merit store, e.g. when EDMC is restarted mid game.
+
+        :param since: The timestamp to rebuild from, the start of the session in progress if None
+        :param until: The timestamp to rebuild up to (not including), e.g. where a journal catch up starts
+        :return: The merits restored, none if the last session has ended
+        """
+        ppp = self.ppp
+        store = ppp.merit_store
+        if store is None:
+            return 0
+        if since is None:
+            since = store.session_start()
+            if since is None:
+                return 0
+        activities = ppp.current_session.activities
+        for kind, commodity, merits, tonnage in store.activity_totals(since, until):
+            if kind == ActivityKind.MINED:
+                activities.add_mined(merits, commodity, tonnage)
+            else:
+                activities.add(kind, merits)
+        restored = 0
+        for system_address, system, merits in store.system_totals(since, until):
+            ppp.systems.add(SystemProgress(system, system_address)).earnings += merits
+            restored += merits
+        ppp.changed_sections |= Section.SYSTEMS | Section.ACTIVITIES
+        logger.debug(f"Restored {restored} merits since {since!r}")
+        return restored
+
+    def on_location(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        Update the current system.
+        'cmdr = "xyz", is_beta = "False", system = "HIP 101587", station = "JBQ-90Q", event = "Location"'
+        """
+        ppp = self.ppp
+        #{"timestamp":"2025-04-08T20:23:51Z","event":"Location","DistFromStarLS":313.110615,"Docked":true,"StationName":"Pratchett Gateway","StationType":"Orbis","MarketID":3226027008,"StationFaction":{"Name":"Casual Crew"},"StationGovernment":"$government_Democracy;","StationGovernment_Localised":"Democracy","StationServices":["dock","autodock","blackmarket","commodities","contacts","exploration","missions","outfitting","crewlounge","rearm","refuel","repair","shipyard","tuning","engineer","missionsgenerated","flightcontroller","stationoperations","powerplay","searchrescue","stationMenu","shop","livery","socialspace","bartender","vistagenomics","pioneersupplies","apexinterstellar","frontlinesolutions","registeringcolonisation"],"StationEconomy":"$economy_Agri;","StationEconomy_Localised":"Agriculture","StationEconomies":[{"Name":"$economy_Agri;","Name_Localised":"Agriculture","Proportion":1.0}],"Taxi":false,"Multicrew":false,"StarSystem":"Tobala","SystemAddress":3618266663283,"StarPos":[23.34375,-42.46875,79.3125],"SystemAllegiance":"Independent","SystemEconomy":"$economy_Agri;","SystemEconomy_Localised":"Agriculture","SystemSecondEconomy":"$economy_Terraforming;","SystemSecondEconomy_Localised":"Terraforming","SystemGovernment":"$government_Democracy;","SystemGovernment_Localised":"Democracy","SystemSecurity":"$SYSTEM_SECURITY_medium;","SystemSecurity_Localised":"Medium Security","Population":4779808034,"Body":"Pratchett Gateway","BodyID":47,"BodyType":"Station",
+        # "ControllingPower":"Denton Patreus","Powers":["Denton Patreus","Yuri Grom","Jerome Archer"],"PowerplayState":"Fortified","PowerplayStateControlProgress":0.278852,"PowerplayStateReinforcement":11942,"PowerplayStateUndermining":88,"Factions":[{"Name":"Revolutionary Tobala Democrats","FactionState":"None","Government":"Democracy","Influence":0.014985,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":-22.0847},{"Name":"Tobala Vision Industries","FactionState":"None","Government":"Corporate","Influence":0.00999,"Allegiance":"Empire","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"Traditional Tobala Nationalists","FactionState":"None","Government":"Dictatorship","Influence":0.011988,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"Tobala Gold Posse","FactionState":"None","Government":"Anarchy","Influence":0.00999,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":-18.7796},{"Name":"Tobala Jet Creative & Co","FactionState":"None","Government":"Corporate","Influence":0.034965,"Allegiance":"Federation","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":-9.51682,"RecoveringStates":[{"State":"PublicHoliday","Trend":0}]},{"Name":"Loosely Organized Lunatics","FactionState":"None","Government":"Dictatorship","Influence":0.144855,"Allegiance":"Empire","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"RecoveringStates":[{"State":"Blight","Trend":0}]},{"Name":"Casual Crew","FactionState":"None","Government":"Democracy","Influence":0.773227,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"PendingStates":[{"State":"Expansion","Trend":0}]}],"SystemFaction":{"Name":"Casual Crew"}}
+        #logger.debug(f"Location event: {state}")
+        system_address = entry.get("SystemAddress", state.get("SystemAddress"))
+        sys = ppp.systems.get(system, system_address)
+        if sys is not None:
+            sys.earnings += ppp.current_system.earnings
+            if sys.controlling_power == '' and entry.get("ControllingPower", "") != "":
+                # If the system is found, set the original values as some scenarios it is possible to have a location event before a fsdjump event.
+                sys.orig_power_play_state_control_progress = entry["PowerplayStateControlProgress"]
+                sys.orig_power_play_state_reinforcement = entry["PowerplayStateReinforcement"]
+                sys.orig_power_play_state_undermining = entry["PowerplayStateUndermining"]
+            if entry.get("ControllingPower", "") != "":
+                sys.controlling_power = entry["ControllingPower"]
+                sys.power_play_state = entry["PowerplayState"]
+                sys.power_play_state_control_progress = entry["PowerplayStateControlProgress"]
+                sys.power_play_state_reinforcement = entry["PowerplayStateReinforcement"]
+                sys.power_play_state_undermining = entry["PowerplayStateUndermining"]
+        elif entry.get("ControllingPower", "") != "":
+            logger.debug(f"System not found: {system}")
+            ppp.current_system = SystemProgress()
+            ppp.current_system.system = system
+            ppp.current_system.system_address = system_address
+            ppp.current_system.earnings = 0
+            ppp.current_system.controlling_power = entry["ControllingPower"]
+            ppp.current_system.power_play_state = entry["PowerplayState"]
+            ppp.current_system.power_play_state_control_progress = entry["PowerplayStateControlProgress"]
+            ppp.current_system.power_play_state_reinforcement = entry["PowerplayStateReinforcement"]
+            ppp.current_system.power_play_state_undermining = entry["PowerplayStateUndermining"]
+            ppp.current_system.orig_power_play_state_control_progress = entry["PowerplayStateControlProgress"]
+            ppp.current_system.orig_power_play_state_reinforcement = entry["PowerplayStateReinforcement"]
+            ppp.current_system.orig_power_play_state_undermining = entry["PowerplayStateUndermining"]
+            ppp.current_system.set_position(state.get("StarPos", [0, 0, 0]))
+            ppp.systems.add(ppp.current_system)
+        return Section.SYSTEMS
+
+    def on_fsd_jump(self, system: str, entry: dict, state: dict) -> Section:
+        ppp = self.ppp
+        logger.debug("fsdjump event")
+
+        #{"timestamp":"2025-04-09T18:14:33Z","event":"FSDJump","Taxi":false,"Multicrew":false,"StarSystem":"Fusang","SystemAddress":2656177228139,"StarPos":[-12.59375,-19.03125,39.71875],"SystemAllegiance":"Federation","SystemEconomy":"$economy_HighTech;","SystemEconomy_Localised":"High Tech","SystemSecondEconomy":"$economy_Refinery;","SystemSecondEconomy_Localised":"Refinery","SystemGovernment":"$government_Democracy;","SystemGovernment_Localised":"Democracy","SystemSecurity":"$SYSTEM_SECURITY_medium;","SystemSecurity_Localised":"Medium Security","Population":4828680,"Body":"Fusang","BodyID":0,"BodyType":"Star",
+        # "ControllingPower":"Yuri Grom","Powers":["Yuri Grom","Jerome Archer"],"PowerplayState":"Fortified","PowerplayStateControlProgress":0.430706,"PowerplayStateReinforcement":9232,"PowerplayStateUndermining":273,"JumpDist":9.845,"FuelUsed":0.041981,"FuelLevel":31.958019,"Factions":[{"Name":"Fusang Fortune Commodities","FactionState":"None","Government":"Corporate","Influence":0.013225,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"Fusang Focus","FactionState":"Election","Government":"Dictatorship","Influence":0.080366,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"ActiveStates":[{"State":"Election"}]},{"Name":"Liberals of Fusang","FactionState":"Boom","Government":"Democracy","Influence":0.674466,"Allegiance":"Federation","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"ActiveStates":[{"State":"Boom"},{"State":"CivilLiberty"}]},{"Name":"Fusang Society","FactionState":"None","Government":"Anarchy","Influence":0.010173,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"Fusang Regulatory State","FactionState":"Election","Government":"Dictatorship","Influence":0.080366,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand1;","Happiness_Localised":"Elated","MyReputation":0.0,"ActiveStates":[{"State":"CivilLiberty"},{"State":"Election"}]},{"Name":"EG Union","FactionState":"None","Government":"Dictatorship","Influence":0.10885,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":6.70655,"RecoveringStates":[{"State":"Expansion","Trend":0}]},{"Name":"Pheonix Legion","FactionState":"None","Government":"Confederacy","Influence":0.032553,"Allegiance":"Federation","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0}],"SystemFaction":{"Name":"Liberals of Fusang","FactionState":"Boom"},"Conflicts":[{"WarType":"election","Status":"active","Faction1":{"Name":"Fusang Focus","Stake":"Marchand Military Facility","WonDays":1},"Faction2":{"Name":"Fusang Regulatory State","Stake":"Francisco de Almeida Beacon","WonDays":0}}],"EDDMapColor":-65536}
+
+        #{"timestamp":"2025-04-09T18:06:29Z","event":"FSDJump","Taxi":false,"Multicrew":false,"StarSystem":"LP 926-40","SystemAddress":422794217835,"StarPos":[-9.78125,-26.71875,45.1875],"SystemAllegiance":"Independent","SystemEconomy":"$economy_Industrial;","SystemEconomy_Localised":"Industrial","SystemSecondEconomy":"$economy_Refinery;","SystemSecondEconomy_Localised":"Refinery","SystemGovernment":"$government_Patronage;","SystemGovernment_Localised":"Patronage","SystemSecurity":"$SYSTEM_SECURITY_high;","SystemSecurity_Localised":"High Security","Population":51036582,"Body":"LP 926-40 A","BodyID":1,"BodyType":"Star",
+        # "ControllingPower":"Jerome Archer","Powers":["Yuri Grom","Jerome Archer"],"PowerplayState":"Exploited","PowerplayStateControlProgress":0.361932,"PowerplayStateReinforcement":2412,"PowerplayStateUndermining":135,"JumpDist":10.94,"FuelUsed":0.062701,"FuelLevel":31.9373,"Factions":[{"Name":"Future of LP 926-40","FactionState":"CivilWar","Government":"Democracy","Influence":0.118762,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"ActiveStates":[{"State":"CivilWar"}]},{"Name":"Party of LP 926-40","FactionState":"None","Government":"Dictatorship","Influence":0.027944,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"LP 926-40 Blue State Network","FactionState":"CivilWar","Government":"Corporate","Influence":0.118762,"Allegiance":"Federation","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"ActiveStates":[{"State":"CivilWar"}]},{"Name":"Law Party of LP 926-40","FactionState":"War","Government":"Dictatorship","Influence":0.122754,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"ActiveStates":[{"State":"War"}]},{"Name":"Knights of the Void","FactionState":"None","Government":"Patronage","Influence":0.4002,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0},{"Name":"Old Space Cowboys ABDE","FactionState":"War","Government":"Democracy","Influence":0.122754,"Allegiance":"Federation","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":0.0,"PendingStates":[{"State":"Expansion","Trend":0}],"ActiveStates":[{"State":"War"}]},{"Name":"Gilgamesh Corps Orbital Protection","FactionState":"None","Government":"Dictatorship","Influence":0.088822,"Allegiance":"Independent","Happiness":"$Faction_HappinessBand2;","Happiness_Localised":"Happy","MyReputation":3.80893}],"SystemFaction":{"Name":"Knights of the Void"},"Conflicts":[{"WarType":"civilwar","Status":"active","Faction1":{"Name":"Future of LP 926-40","Stake":"Wei's Wandering","WonDays":0},"Faction2":{"Name":"LP 926-40 Blue State Network","Stake":"Marino Metallurgic Exchange","WonDays":0}},{"WarType":"war","Status":"active","Faction1":{"Name":"Law Party of LP 926-40","Stake":"","WonDays":0},"Faction2":{"Name":"Old Space Cowboys ABDE","Stake":"Baturin Arsenal","WonDays":0}}],"EDDMapColor":-65536}
+        system_address = entry.get("SystemAddress", state.get("SystemAddress"))
+        sys = ppp.systems.get(system, system_address)
+        if sys is not None and entry.get("ControllingPower", "") != "":
+            sys.controlling_power = entry["ControllingPower"]
+            sys.power_play_state = entry["PowerplayState"]
+            sys.power_play_state_control_progress = entry["PowerplayStateControlProgress"]
+            sys.power_play_state_reinforcement = entry["PowerplayStateReinforcement"]
+            sys.power_play_state_undermining = entry["PowerplayStateUndermining"]
+
+        ppp.current_system = SystemProgress()
+        ppp.current_system.system = system
+        ppp.current_system.system_address = system_address
+        #ppp.current_system.earnings = 0
+        ppp.current_system.controlling_power = entry.get("ControllingPower", "")
+        ppp.current_system.power_play_state = entry.get("PowerplayState", "")
+        ppp.current_system.power_play_state_control_progress = entry.get("PowerplayStateControlProgress", 0)
+        ppp.current_system.power_play_state_reinforcement = entry.get("PowerplayStateReinforcement", 0)
+        ppp.current_system.power_play_state_undermining = entry.get("PowerplayStateUndermining", 0)
+        ppp.current_system.orig_power_play_state_control_progress = entry.get("PowerplayStateControlProgress", 0)
+        ppp.current_system.orig_power_play_state_reinforcement = entry.get("PowerplayStateReinforcement", 0)
+        ppp.current_system.orig_power_play_state_undermining = entry.get("PowerplayStateUndermining", 0)
+        ppp.current_system.set_position(state.get("StarPos", [0, 0, 0]))
+        #If its a new system and it has a controlling power otherwise there is no power play to track
+        if (sys is None) and (entry.get("ControllingPower", "") != ""):
+            ppp.systems.add(ppp.current_system)
+        return Section.SYSTEMS
+
+    def on_docked_or_died(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        Update the current session and start a new one.
+        """
+        ppp = self.ppp
+        logger.debug("Docked or died event")
+        #{"timestamp":"2025-03-29T11:57:38Z","event":"Docked","StationName":"Gelfand Dock","StationType":"Coriolis","Taxi":false,"Multicrew":false,"StarSystem":"Misisture","SystemAddress":5368172137360,"MarketID":3225950976,"StationFaction":{"Name":"Blackiron","FactionState":"Expansion"},"StationGovernment":"$government_Corporate;","StationGovernment_Localised":"Corporate","StationAllegiance":"Federation","StationServices":["dock","autodock","commodities","contacts","exploration","missions","outfitting","crewlounge","rearm","refuel","repair","shipyard","tuning","engineer","missionsgenerated","flightcontroller","stationoperations","powerplay","searchrescue","stationMenu","shop","livery","socialspace","bartender","vistagenomics","pioneersupplies","apexinterstellar","frontlinesolutions","registeringcolonisation"],"StationEconomy":"$economy_Industrial;","StationEconomy_Localised":"Industrial","StationEconomies":[{"Name":"$economy_Industrial;","Name_Localised":"Industrial","Proportion":1.0}],"DistFromStarLS":225.201053,"ActiveFine":true,"LandingPads":{"Small":17,"Medium":18,"Large":9}}
+        #{"timestamp":"2025-03-29T11:42:44Z","event":"Died","KillerName":"Exobyte Corp","KillerShip":"cobramkiv","KillerRank":"Competent"}
+        ppp.previous_session = ppp.current_session
+        ppp.current_session = SessionProgress()
+        ppp.current_session.time = datetime.now()
+        ppp.current_session.earned_merits = 0
+        ppp.current_session.power_play = ppp.previous_session.power_play
+        ppp.current_session.power_play_rank = ppp.previous_session.power_play_rank
+        ppp.current_session.carry_over(ppp.previous_session)
+        return Section.TOTALS
+
+    def on_powerplay_commodity(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        PowerplayCollect, PowerplayDeliver and DeliverPowerMicroResources (on foot deliveries).
+        """
+        #The marketid in PowerplayDeliver refers to the stronghold carrier and not the originating system/settlement
+        self.ppp.current_session.add_commodity_entry(system, entry)
+        return Section.COMMODITIES
+
+    def on_powerplay_merits(self, system: str, entry: dict, state: dict) -> Section:
+        ppp = self.ppp
+        logger.debug("PowerplayMerits event")
+        #{"timestamp":"2025-03-29T10:30:53Z","event":"PowerplayMerits","Power":"Jerome Archer","MeritsGained":20,"TotalMerits":1084567}
+        changes = Section.PROGRESS | Section.TOTALS | Section.SYSTEMS | Section.ACTIVITIES
+        #First check if EDMC was loaded after the game was started.
+        if ppp.current_session.power_play == '':
+            changes |= Section.SOCIALS
+            ppp.current_session.power_play = entry["Power"]
+            ppp.current_session.power_play_rank = ppp.CurrentRank(entry["TotalMerits"])
+            ppp.starting_merits = int(entry["TotalMerits"]) - int(entry["MeritsGained"])
+            ppp.total_merits = int(entry["TotalMerits"])  
+
+        #Record the merits gained
+        ppp.current_session.earned_merits += entry["MeritsGained"]
+        ppp.total_merits = int(entry["TotalMerits"])
+        #Apportion the merits to the appropriate system
+        system_address = state.get("SystemAddress")
+        sys = ppp.systems.get(system, system_address)
+        if sys is not None:
+            sys.earnings += entry["MeritsGained"]
+        #Add the system to thje list of merit systems if it is not already there
+        else:
+            ppp.current_system = SystemProgress()
+            ppp.current_system.system = system
+            ppp.current_system.system_address = system_address
+            ppp.current_system.set_position(state.get("StarPos", [0, 0, 0]))
+            ppp.current_system.earnings = entry["MeritsGained"]
+            ppp.systems.add(ppp.current_system)
+
+        #Assign merits to appropriate activity, the order the activities are tested in is in RecentJournal.classify
+        activities = ppp.current_session.activities
+        found = ppp.recent_journal_log.classify()
+        kind = self.activity_kinds[found.activity]
+        if kind == ActivityKind.MINED:
+            activities.add_mined(entry["MeritsGained"], found.mined_commodity, found.mined_tonnage)
+        else:
+            activities.add(kind, entry["MeritsGained"])
+        if ppp.merit_store is not None:
+            ppp.merit_store.record(MeritEvent(entry.get("timestamp", ""), system_address, system, kind, entry["MeritsGained"],
+                                              found.mined_commodity, found.mined_tonnage))
+        if kind == ActivityKind.UNKNOWN:
+            logger.debug(f"Unknowns: {entry['MeritsGained']}")
+        elif kind == ActivityKind.RIVAL_POWER_KILLS:
+            logger.debug(f"Is Rival kill: {entry['MeritsGained']}")
+            for log_entry in ppp.recent_journal_log.entries[:5]:
+                logger.debug(f"{log_entry}")
+        elif kind == ActivityKind.DONATION_MISSIONS:
+            logger.debug(f"Donation mission merits first: {entry['MeritsGained']}")
+
+        ppp.last_merits_gained = entry["MeritsGained"]
+        return changes
+
+    def on_powerplay_rank(self, system: str, entry: dict, state: dict) -> Section:
+        ppp = self.ppp
+        #{"timestamp":"2025-03-29T10:47:35Z","event":"PowerplayRank","Power":"Jerome Archer","Rank":139}
+        ppp.current_session.power_play_rank = entry["Rank"]
+        return Section.PROGRESS
+
+    def on_powerplay(self, system: str, entry: dict, state: dict) -> Section:
+        ppp = self.ppp
+        #{"timestamp":"2025-03-23T08:39:26Z","event":"Powerplay","Power":"Jerome Archer","Rank":138,"Merits":1084487,"TimePledged":12319106}
+        ppp.current_session.power_play = entry["Power"]
+        ppp.current_session.power_play_rank = int(entry["Rank"])
+        ppp.starting_merits = int(entry["Merits"])
+        ppp.total_merits = int(entry["Merits"])
+
+        if system != '':
+            ppp.current_system = SystemProgress()
+            ppp.current_system.system = system
+            ppp.current_system.system_address = state.get("SystemAddress")
+            ppp.current_system.earnings = 0
+            ppp.current_system.set_position(state.get("StarPos", [0, 0, 0]))
+            ppp.systems.add(ppp.current_system)
+        return Section.PROGRESS | Section.SOCIALS | Section.TOTALS | Section.SYSTEMS
+
+    def on_mission_completed(self, system: str, entry: dict, state: dict) -> Section:
+        ppp = self.ppp
+        changes = Section.NONE
+        # need to check for this for donation missions as they potnetially complete after the merits are awarded
+        #{"timestamp":"2025-04-19T13:19:53Z","event":"MissionCompleted","Faction":"United CD-63 1560 Bureau","Name":"Mission_AltruismCredits_name",
+        # "LocalisedName":"Donate 1,000,000 Cr to the cause","MissionID":1012529686,"Donation":"1000000","Donated":1000000,"FactionEffects":[{"Faction":"United CD-63 1560 Bureau","Effects":[{"Effect":"$MISSIONUTIL_Interaction_Summary_EP_up;","Effect_Localised":"The economic status of $#MinorFaction; has improved in the $#System; system.","Trend":"UpGood"}],"Influence":[{"SystemAddress":2282942829282,"Trend":"UpGood","Influence":"++"}],"ReputationTrend":"UpGood","Reputation":"++"}]}
+        #{"timestamp":"2025-04-19T13:19:53Z","event":"PowerplayMerits","Power":"Jerome Archer","MeritsGained":44,"TotalMerits":1113351}
+        activities = ppp.current_session.activities
+        if activities[ActivityKind.UNKNOWN] > 0 and ppp.recent_journal_log.isDonationMissionMeritsSecond:
+            #We have waited for 1 journal entries to be more sure we have all the data
+            logger.debug(f"Processing donation mission merits second, unknownn merits: {activities[ActivityKind.UNKNOWN]}, last merits gained: {ppp.last_merits_gained}")
+            self.move_merits(entry, ActivityKind.UNKNOWN, ActivityKind.DONATION_MISSIONS, ppp.last_merits_gained)
+            logger.debug(f"Processing donation mission merits second, after unknownn merits: {activities[ActivityKind.UNKNOWN]}")
+            changes = Section.ACTIVITIES
+        return changes
+
+    def on_multi_sell_exploration_data(self, system: str, entry: dict, state: dict) -> Section:
+        #wait for 5 further journal entries before processing, 5 is a guess, even with a full page this should cover it most times
+        self.wait_for_multi_sell_carto_data = 5
+        return Section.NONE
+
+    def on_load_game(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        The game has been started, merits earned from here on are the ones restored if EDMC is restarted.
+        """
+        if self.ppp.merit_store is not None:
+            self.ppp.merit_store.start_session(entry.get("timestamp", ""))
+        return Section.NONE
+
+    def on_shutdown(self, system: str, entry: dict, state: dict) -> Section:
+        """
+        The game has exited, so nothing is restored if EDMC is restarted before it is started again.
+        """
+        if self.ppp.merit_store is not None:
+            self.ppp.merit_store.end_session(entry.get("timestamp", ""))
+        return Section.NONE
@@ -0,0 +1,239 @@
+"""
+Persistent history of the merits earned.
+
+An append-only SQLite log of every PowerplayMerits entry, with the activity it was attributed to, so the
+session can be rebuilt when EDMC restarts mid game rather than starting again from nothing. The journal
+handlers only queue the rows, a background thread writes them in batches so the hot path never waits on
+the disk.
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from itertools import groupby
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence, Union
+from sessionprogress import ActivityKind
+from pluginlogger import logger
+
+_schema = """
+CREATE TABLE IF NOT EXISTS merit_events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    system_address INTEGER,
+    system TEXT NOT NULL DEFAULT '',
+    activity INTEGER NOT NULL,
+    merits INTEGER NOT NULL,
+    commodity TEXT NOT NULL DEFAULT '',
+    tonnage INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS merit_events_timestamp ON merit_events (timestamp);
+CREATE INDEX IF NOT EXISTS merit_events_system ON merit_events (system_address, system);
+CREATE INDEX IF NOT EXISTS merit_events_activity ON merit_events (activity, commodity);
+CREATE TABLE IF NOT EXISTS session_starts (
+    timestamp TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS session_ends (
+    timestamp TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    journal TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    system TEXT NOT NULL,
+    system_address INTEGER,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    z REAL NOT NULL
+);
+"""
+
+_insert_event = ("INSERT INTO merit_events (timestamp, system_address, system, activity, merits, commodity, tonnage) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_insert_session_start = "INSERT OR IGNORE INTO session_starts (timestamp) VALUES (?)"
+_insert_session_end = "INSERT OR IGNORE INTO session_ends (timestamp) VALUES (?)"
+_replace_checkpoint = ("INSERT OR REPLACE INTO checkpoint (id, journal, offset, system, system_address, x, y, z) "
+                       "VALUES (0, ?, ?, ?, ?, ?, ?, ?)")
+
+
+class MeritEvent(NamedTuple):
+    """
+    Merits attributed to an activity. Merits moved between activities after the event (e.g. a multi sell of
+    cartography data) are recorded as a pair of events with no system, one negative.
+    """
+    timestamp: str                  # The journal timestamp, e.g. 2025-03-29T10:30:53Z
+    system_address: Optional[int]
+    system: str
+    activity: ActivityKind
+    merits: int
+    commodity: str = ""             # The commodity sold, for ActivityKind.MINED
+    tonnage: int = 0
+
+
+class Checkpoint(NamedTuple):
+    """
+    How far through a journal file the plugin had got, and the system it was in at that point.
+    """
+    journal: str                    # The file name, e.g. Journal.2025-05-13T210941.01.log
+    offset: int                     # The byte offset of the first entry not yet processed
+    system: str = ""
+    system_address: Optional[int] = None
+    star_pos: tuple[float, float, float] = (0.0, 0.0, 0.0)
+
+
+class MeritStore:
+    """
+    The merit events in a SQLite database, written by a background thread.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 256) -> None:
+        """
+        :param path: The database file, created if it does not exist
+        :param batch_size: The most rows written in one transaction
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_schema)
+        # Serialises the writer thread and the queries on the shared connection
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def record(self, event: MeritEvent) -> None:
+        """
+        Queue a merit event to be written.
+        """
+        self._put(_insert_event, (event.timestamp, event.system_address, event.system, int(event.activity),
+                                  int(event.merits), event.commodity, int(event.tonnage)))
+
+    def start_session(self, timestamp: str) -> None:
+        """
+        Queue the start of a session, the point the next rebuild starts from.
+        """
+        self._put(_insert_session_start, (timestamp,))
+
+    def end_session(self, timestamp: str) -> None:
+        """
+        Queue the end of a session, e.g. the game shutting down, after which there is nothing to rebuild.
+        """
+        self._put(_insert_session_end, (timestamp,))
+
+    def save_checkpoint(self, checkpoint: Checkpoint) -> None:
+        """
+        Queue the checkpoint, replacing the previous one, after the merit events already queued.
+        """
+        x, y, z = checkpoint.star_pos
+        self._put(_replace_checkpoint, (checkpoint.journal, int(checkpoint.offset), checkpoint.system,
+                                        checkpoint.system_address, float(x), float(y), float(z)))
+
+    def flush(self) -> None:
+        """
+        Wait until everything queued has been written.
+        """
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Write everything queued and close the database.
+        """
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self.connection.close()
+
+    def session_start(self) -> Optional[str]:
+        """
+        The timestamp of the start of the session in progress, None if there has not been one or it has ended.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT start FROM (SELECT MAX(timestamp) AS start FROM session_starts) "
+                "WHERE start > COALESCE((SELECT MAX(timestamp) FROM session_ends), '')").fetchone()
+        return row[0] if row is not None else None
+
+    def latest_timestamp(self) -> Optional[str]:
+        """
+        The timestamp of the most recent merit event written, None if there are none.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT MAX(timestamp) FROM merit_events").fetchone()
+        return row[0]
+
+    def checkpoint(self) -> Optional[Checkpoint]:
+        """
+        The checkpoint last saved, None if there is not one.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT journal, offset, system, system_address, x, y, z FROM checkpoint WHERE id = 0").fetchone()
+        if row is None:
+            return None
+        return Checkpoint(row[0], row[1], row[2], row[3], (row[4], row[5], row[6]))
+
+    def activity_totals(self, since: str, until: Optional[str] = None) -> list[tuple[ActivityKind, str, int, int]]:
+        """
+        The merits and tonnage earned from since up to (not including) until, by activity and mined commodity.
+        """
+        where, params = self._between(since, until)
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT activity, commodity, SUM(merits), SUM(tonnage) FROM merit_events WHERE {where} "
+                "GROUP BY activity, commodity ORDER BY MIN(id)", params).fetchall()
+        return [(ActivityKind(activity), commodity, merits, tonnage) for activity, commodity, merits, tonnage in rows]
+
+    def system_totals(self, since: str, until: Optional[str] = None) -> list[tuple[Optional[int], str, int]]:
+        """
+        The merits earned from since up to (not including) until, by system, in the order the systems were first
+        earned in.
+        """
+        where, params = self._between(since, until)
+        with self._lock:
+            return self.connection.execute(
+                f"SELECT system_address, system, SUM(merits) FROM merit_events WHERE {where} AND system != '' "
+                "GROUP BY system_address, system ORDER BY MIN(id)", params).fetchall()
+
+    @staticmethod
+    def _between(since: str, until: Optional[str]) -> tuple[str, tuple]:
+        if until is None:
+            return "timestamp >= ?", (since,)
+        return "timestamp >= ? AND timestamp < ?", (since, until)
+
+    def _put(self, statement: str, params: Sequence) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_batches, name="MeritStore", daemon=True)
+            self._writer.start()
+        self._queue.put((statement, params))
+
+    def _write_batches(self) -> None:
+        """
+        Write whatever has been queued, one transaction per batch, until close() queues None.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(batch)} merit events: {e}")
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, batch: list) -> None:
+        """
+        Run the queued statements in order, each run of the same statement as a single executemany.
+        """
+        with self._lock, self.connection:
+            for statement, items in groupby((item for item in batch if item is not None), key=lambda item: item[0]):
+                self.connection.executemany(statement, [params for _, params in items])
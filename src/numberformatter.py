@@ -0,0 +1,86 @@
+"""
+Locale aware number formatting for the display and the clipboard exports.
+
+locale.setlocale is process wide, slow and not thread safe, so the user's conventions are read once
+(and again when the preferences change) and numbers are grouped from the cached rule.
+"""
+from __future__ import annotations
+
+import locale
+from typing import Iterator, Optional, Sequence
+from pluginlogger import logger
+
+
+class NumberFormatter:
+    """
+    Formats integers with the thousands separator and grouping of the user's locale.
+    """
+
+    def __init__(self, thousands_sep: Optional[str] = None, grouping: Optional[Sequence[int]] = None,
+                 decimal_point: str = '.') -> None:
+        """
+        :param thousands_sep: The separator to use, None to read the conventions from the user's locale
+        :param grouping: The locale.localeconv() style grouping, e.g. [3, 0] for every three digits
+        :param decimal_point: The decimal point
+        """
+        self.thousands_sep = ''
+        self.grouping: tuple[int, ...] = ()
+        self.decimal_point = decimal_point
+        if thousands_sep is None:
+            self.load_locale()
+        else:
+            self.thousands_sep = thousands_sep
+            self.grouping = tuple(grouping or ())
+
+    def load_locale(self) -> None:
+        """
+        Read the numeric conventions of the user's default locale, leaving the process locale as it was.
+        """
+        try:
+            previous = locale.setlocale(locale.LC_NUMERIC)
+            try:
+                locale.setlocale(locale.LC_NUMERIC, '')
+                conventions = locale.localeconv()
+            finally:
+                locale.setlocale(locale.LC_NUMERIC, previous)
+        except locale.Error as ex:
+            logger.warning(f"Unable to read the locale number format, numbers will not be grouped: {ex}")
+            conventions = {'thousands_sep': '', 'grouping': [], 'decimal_point': '.'}
+        self.thousands_sep = conventions['thousands_sep']
+        self.grouping = tuple(conventions['grouping'])
+        self.decimal_point = conventions['decimal_point']
+
+    def format_int(self, value: float) -> str:
+        """
+        Round the value to an integer and group its digits, e.g. 1176737 -> "1,176,737".
+        """
+        value = int(round(value, 0))
+        digits = str(abs(value))
+        sign = '-' if value < 0 else ''
+        if not self.thousands_sep or not self.grouping:
+            return sign + digits
+
+        groups: list[str] = []
+        for size in self._group_sizes():
+            if len(digits) <= size:
+                break
+            groups.append(digits[-size:])
+            digits = digits[:-size]
+        groups.append(digits)
+        return sign + self.thousands_sep.join(reversed(groups))
+
+    def _group_sizes(self) -> Iterator[int]:
+        """
+        The digit group sizes from the right, a trailing 0 repeats the last size and CHAR_MAX ends the grouping.
+        """
+        last = 0
+        for size in self.grouping:
+            if size == locale.CHAR_MAX:
+                return
+            if size == 0:
+                if last == 0:
+                    return
+                while True:
+                    yield last
+            yield size
+            last = size
@@ -0,0 +1,15 @@
+"""
+Plugin logger for the model modules.
+
+Inside EDMC this is the normal plugin logger. Outside of EDMC (e.g. a headless journal replay)
+the EDMC modules are not importable, so fall back to a standard library logger.
+"""
+import logging
+from consts import PLUGIN_NAME
+
+try:
+    from config import appname # type: ignore # noqa: N813
+    from EDMCLogging import get_plugin_logger # type: ignore # noqa: N813
+    logger = get_plugin_logger(f"{appname}.{PLUGIN_NAME}")
+except ImportError:
+    logger = logging.getLogger(PLUGIN_NAME)
@@ -6,23 +6,28 @@ It displays the progress in a progress bar and a label, and allows the user to c
 """
 from __future__ import annotations
 
-import math
-import locale
 import re
-import requests
+import sqlite3
 import platform
-import semantic_version  # type: ignore # noqa: N813
+from datetime import datetime, timezone
+from pathlib import Path
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-from consts import PLUGIN_NAME, mined_heading, plugin_version
-from recentjournal import RecentJournal
-from sessionprogress import SessionProgress
+from consts import PLUGIN_NAME, refresh_interval_ms
+from journalcatchup import end_checkpoint
+from meritstore import MeritStore
+from powerplaystate import PowerPlayState, Section
+from sessionprogress import ActivityKind, SessionProgress
 from socials import Socials
-from rares import Rares
+from rares import catalogue as rares_catalogue
 from systemprogress import SystemProgress
 from multiHyperlinkLabel import MultiHyperlinkLabel
+from numberformatter import NumberFormatter
+from refreshscheduler import RefreshScheduler
+from rowpool import RowPool
 from canvasprogressbar import CanvasProgressBar
+from versioncheck import VersionCheck
 from PIL import Image, ImageOps
 
 import myNotebook as nb  # type: ignore # noqa: N813
@@ -33,7 +38,7 @@ import plug # type: ignore # noqa: N813
 
 logger = get_plugin_logger(f"{appname}.{PLUGIN_NAME}")
 
-class PowerPlayProgress:
+class PowerPlayProgress(PowerPlayState):
     """
     ClickCounter implements the EDMC plugin interface.
 
@@ -44,6 +49,7 @@ class PowerPlayProgress:
     bar_colours = ['Green', 'Orange', 'Match theme']
     
     def __init__(self) -> None:
+        super().__init__()
         # Be sure to use names that wont collide in our config variables
         #Preferences declarations
         self.options_view_progress_bar = tk.BooleanVar(value=bool(config.get_bool('options_view_progress_bar', default=True)))
@@ -62,14 +68,9 @@ class PowerPlayProgress:
         self.pb: CanvasProgressBar = None
         self.powerplay_level_label: tk.Label = tk.Label()
         self.powerplay_level_value = 0
-        self.current_session: SessionProgress = SessionProgress()
-        self.previous_session: SessionProgress = SessionProgress()
-        self.starting_merits = 0
-        self.total_merits = 0
-        self.systems: list[SystemProgress] = []
-        self.power_play_list_labels: list[tk.Label] = []
-        self.power_play_hpl_labels: list[MultiHyperlinkLabel] = []
-        self.current_system: SystemProgress = SystemProgress()
+        self.system_rows = RowPool(theme.register)
+        self.commodity_rows = RowPool(theme.register)
+        self.activity_rows = RowPool(theme.register)
         self.frame: tk.Frame = tk.Frame()
         self.total_merits_label: tk.Label = tk.Label()    
         self.total_session_merits: tk.Label = tk.Label()
@@ -81,7 +82,6 @@ class PowerPlayProgress:
         self.reset_button_button: tk.Button = tk.Button()
         self.reset_session_button: tk.Button = tk.Button()
         self.rares_button: tk.Button = tk.Button()
-        self.recent_journal_log: RecentJournal = RecentJournal()
         self.socials_link_discord: MultiHyperlinkLabel = MultiHyperlinkLabel()
         self.socials_link_reddit: MultiHyperlinkLabel = MultiHyperlinkLabel()
         self.socials_frame: tk.Frame = tk.Frame()
@@ -93,9 +93,20 @@ class PowerPlayProgress:
         self.buttons_frame: tk.Frame = tk.Frame()
         self.socials_power_label: tk.Label = tk.Label()
 
-        self.flex_row = 7
-        self.last_merits_gained = 0
+        self.formatter = NumberFormatter()
+        self.refresh = RefreshScheduler(self.Update_Ppp_Display, config.get_int('options_refresh_interval_ms', default=refresh_interval_ms))
+
+        self.buttons_row = 0
         self.rares_window = None  # Track open rares window
+        self.rares_rows = RowPool()
+        self.rares_title_label: tk.Label = tk.Label()
+        self.rares_systems: list[str] = []
+        # The pending retry of update_nearest_rares_window while the catalogue loads, at most one
+        self.rares_update_after: str | None = None
+        self._copy_icon: tk.PhotoImage | None = None
+        self.version_check: VersionCheck | None = None
+        self.version_poll_ms = 250
+        self.update_link_row = 1
         logger.info("PowerPlayProgress instantiated")
 
     def on_load(self) -> str:
@@ -106,6 +117,11 @@ class PowerPlayProgress:
 
         :return: The name of the plugin, which will be used by EDMC for logging and for the settings window
         """
+        try:
+            self.merit_store = MeritStore(self.data_dir / "merits.sqlite")
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Merit history not available: {e}")
+            self.merit_store = None
         return PLUGIN_NAME
 
     def on_unload(self) -> None:
@@ -114,7 +130,34 @@ class PowerPlayProgress:
 
         It is the last thing called before EDMC shuts down. Note that blocking code here will hold the shutdown process.
         """
+        self.refresh.cancel()
         self.on_preferences_closed("", False)  # Save our prefs
+        if self.merit_store is not None:
+            # Where the catch up resumes from when the plugin is next started
+            try:
+                checkpoint = end_checkpoint(self, self.journal_dir)
+                if checkpoint is not None:
+                    self.merit_store.save_checkpoint(checkpoint)
+            except OSError as e:
+                logger.error(f"Journal checkpoint not saved: {e}")
+            self.merit_store.close()
+            self.merit_store = None
+
+    @property
+    def data_dir(self) -> Path:
+        """
+        The folder the plugin keeps its own files in, under the EDMC app folder so they survive upgrades.
+        """
+        path = Path(config.app_dir_path) / PLUGIN_NAME
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @property
+    def journal_dir(self) -> str:
+        """
+        The folder the game writes its journals to, as set in the EDMC settings.
+        """
+        return config.get_str('journaldir') or config.default_journal_dir
 
     def setup_preferences(self, parent: nb.Notebook, cmdr: str, is_beta: bool) -> nb.Frame | None:
         """
@@ -246,62 +289,18 @@ class PowerPlayProgress:
         config.set('options_view_bar_colour', str(self.options_view_bar_colour.get()))
         config.set('options_view_socials', bool(self.options_view_socials.get()))
         config.set('options_custom_format', str(self.options_custom_format.get()))
+        self.formatter.load_locale()
+        # The system links are created with the URL of the system provider at the time
+        self.system_rows.clear()
+        self.commodity_rows.clear()
         
         if self.options_view_bar_colour.get() == self.bar_colours[2]: # Match theme
             self.pb.set_bar_colour('green' if config.get_int('theme') == 0 else 'orange')
         else:
             self.pb.set_bar_colour(self.options_view_bar_colour.get().lower())
         
-        if self.total_merits > 0: self.Update_Ppp_Display()
-
-    def NextRankDifference(self, currentRank: int) -> int:
-        """
-        Reutrn the difference between the current rank and the next rank.
-        """
-        if currentRank == 1:
-            return 2000
-        elif currentRank == 2:
-            return 3000
-        elif currentRank == 3:
-            return 4000
-        elif currentRank == 4:
-            return 6000
-        else:
-            return 8000
-
-    def CurrentRank(self, currentMerits: int) -> int:
-        """
-        Return the current rank.
-        """
-        if currentMerits < 2000:
-            return 1
-        elif currentMerits < 5000:
-            return 2
-        elif currentMerits < 9000:
-            return 3
-        elif currentMerits < 15000:
-            return 4
-        elif currentMerits < 23000:
-            return 5
-        else:
-            return math.floor((currentMerits - 23000) // 8000) + 6
-        
-    def CurrentRankLowerBound(self, currentRank: int) -> int:
-        """
-        Return the lower bound of the current rank.
-        """
-        if currentRank <= 1:
-            return 0
-        elif currentRank == 2:
-            return 2000
-        elif currentRank == 3:
-            return 5000
-        elif currentRank == 4:
-            return 9000
-        elif currentRank == 5:
-            return 15000
-        else:
-            return 15000 + (8000 * (currentRank - 5))
+        self.changed_sections = Section.ALL
+        if self.total_merits > 0: self.refresh.flush()
 
     def frame_text_grid(self, frame: tk.Frame, discord: bool = False) -> str:
         """
@@ -355,6 +354,8 @@ class PowerPlayProgress:
         if not self.options_view_totals.get() and not self.options_view_merits_by_systems.get() and not self.options_view_powerplay_commodities.get() and not self.options_view_merits_by_activities.get():
             messagebox.showinfo("No data to copy", "No data to copy to clipboard. Try showing somthing first!")
             return
+        # The copy is taken from the labels so make sure they are up to date
+        if self.refresh.dirty: self.refresh.flush()
         # Clear the clipboard and append the label's text
         self.frame.clipboard_clear()
         if self.options_view_totals.get(): 
@@ -371,6 +372,8 @@ class PowerPlayProgress:
         if not self.options_view_totals.get() and not self.options_view_merits_by_systems.get() and not self.options_view_powerplay_commodities.get() and not self.options_view_merits_by_activities.get():
             messagebox.showinfo("No data to copy", "No data to copy to clipboard. Try showing somthing first!")
             return
+        # The copy is taken from the labels so make sure they are up to date
+        if self.refresh.dirty: self.refresh.flush()
         # Clear the clipboard and append the label's text
         self.frame.clipboard_clear()
         if self.options_view_totals.get(): 
@@ -394,6 +397,8 @@ class PowerPlayProgress:
                     'state': system.power_play_state,
                     'progress': f"{round(system.power_play_state_control_progress * 100, 2)}%",
                     'merits': system.earnings,
+                    # With the locale's thousands separators, {merits} stays a number for format specs like {merits:,}
+                    'merits_formatted': self.formatter.format_int(system.earnings),
                 }
                 try:
                     progress_text = progress_format.format(**fmt_args)
@@ -403,22 +408,40 @@ class PowerPlayProgress:
                         "Format Error",
                         f"Missing key in format: {ex}\nAvailable keys: {list(fmt_args.keys())}"
                     )
+                except (ValueError, IndexError) as ex:
+                    messagebox.showerror(
+                        "Format Error",
+                        f"Invalid format: {ex}"
+                    )
 
-    def version_check(self) -> str:
-        try:
-            req = requests.get(url='https://api.github.com/repos/alby666/EDMC-PowerPlayProgress/releases/latest')
-            data = req.json()
-            if req.status_code != requests.codes.ok:
-                raise requests.RequestException
-        except (requests.RequestException, requests.JSONDecodeError) as ex:
-            logger.error('Failed to parse GitHub release info', exc_info=ex)
-            return ''
-
-        plugin_ver = semantic_version.Version(plugin_version)
-        version = semantic_version.Version(data['tag_name'][1:])
-        if version > plugin_ver:
-            return str(version)
-        return ''
+    def show_update_link(self) -> None:
+        """
+        Add the "Version X available" link once the background version check has finished.
+        """
+        if self.version_check is None:
+            return
+        update_version = self.version_check.result
+        #update_version = '0.9.1'  # for testing
+        if update_version is None:
+            self.frame.after(self.version_poll_ms, self.show_update_link)
+            return
+        if update_version != '':
+            url = f"https://github.com/alby666/EDMC-PowerPlayProgress/releases/tag/v{update_version}"
+            update_link = MultiHyperlinkLabel(self.frame, text=f"Version {update_version} available", foreground="blue", cursor="hand2", url=url)
+            update_link.grid(row=self.update_link_row, columnspan=2, sticky="N")
+
+    def new_label(self, frame: tk.Frame):
+        """
+        Widget factory for a plain label row in the given frame.
+        """
+        return lambda **options: tk.Label(frame, **options)
+
+    def new_system_link(self, pool: RowPool, frame: tk.Frame, system: str):
+        """
+        Widget factory for a system link row. The URL is only looked up when the widget is created.
+        """
+        # The name must start with system for the context menu and be unique within the frame
+        return lambda **options: MultiHyperlinkLabel(frame, compound=tk.RIGHT, url=self.system_url(system), popup_copy=True, name=pool.unique_name("system"), **options)
 
     def system_url(self, system: str) -> str | None:
         """Dispatch a system URL to the configured handler."""
@@ -440,11 +463,17 @@ class PowerPlayProgress:
             self.previous_session = SessionProgress()
             for sys in self.systems:
                 sys.earnings = 0
-            self.current_session.commodities = []
-            self.current_session.commodities_delivered_systems = []
-            self.current_session.commodities_delivered_types = []
+            self.current_session.clear_commodities()
             self.current_session.activities = SessionProgress.Activities()
-            self.Update_Ppp_Display()
+            # None of the rows are shown again until merits are earned
+            self.system_rows.clear()
+            self.commodity_rows.clear()
+            self.activity_rows.clear()
+            if self.merit_store is not None:
+                # Nothing before the reset is restored on a restart
+                self.merit_store.start_session(datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+            self.changed_sections = Section.ALL
+            self.refresh.flush()
 
     def show_nearest_rares_window(self) -> None:
         """
@@ -457,13 +486,10 @@ class PowerPlayProgress:
             self.rares_window.focus()
             return
         
-        # Get sorted rares
-        rares = Rares()
-        sorted_rares = rares.get_nearest_to(self.current_system.position.x, self.current_system.position.y, self.current_system.position.z)[:10]  # Top 10
-
-        # Create window
+        # Create window, the rows are filled in by update_nearest_rares_window
         win = tk.Toplevel()
         self.rares_window = win  # Store reference
+        self.rares_rows = RowPool()
         win.title(f"Nearest Rare Commodities - {self.current_system.system}")
         win.resizable(False, False)
         win.overrideredirect(True)  # Hide the system title bar
@@ -556,6 +582,7 @@ class PowerPlayProgress:
         title_lbl = tk.Label(title_bar, text=f"Nearest Rare Commodities - {self.current_system.system}", bg=bg_color, fg=title_fg_color, font=("Arial", 8), cursor="fleur", anchor=tk.W)
         title_lbl.pack(side=tk.LEFT, padx=1, pady=1, fill=tk.BOTH, expand=True)
         theme.register(title_lbl)
+        self.rares_title_label = title_lbl
         
         # Bind drag events to title bar and title label
         title_bar.bind("<Button-1>", start_drag)
@@ -576,64 +603,136 @@ class PowerPlayProgress:
             lbl.grid(row=1, column=col if col <= 1 else col + 1, padx=5, pady=5, sticky="nsew")
             theme.register(lbl)
 
+        # Make columns expand equally
+        for col in range(len(headers)):
+            win.grid_columnconfigure(col, weight=1)
+
+        #theme.apply(win)
+
+        self.update_nearest_rares_window()
+
+    def update_nearest_rares_window(self) -> None:
+        """
+        Fill the open nearest rares window with the rares nearest the current system, e.g. after a jump.
+
+        The widgets of each row are kept and only the options that changed are updated, so the window stays where
+        it is and does not flicker.
+        """
+        if self.rares_update_after is not None:
+            # Replaced by this update, e.g. a jump while waiting for the catalogue
+            self.frame.after_cancel(self.rares_update_after)
+            self.rares_update_after = None
+        win = self.rares_window
+        if win is None or not win.winfo_exists():
+            # Closed with the X, which does not clear the reference
+            self.rares_window = None
+            return
+        # The catalogue is loaded in the background so wait for it rather than load it here
+        rares = rares_catalogue.current()
+        if rares is None:
+            error = rares_catalogue.error
+            if error is not None:
+                # Not tried again until the file changes, so there is nothing to wait for
+                self.show_rares_error(error)
+                return
+            self.rares_update_after = self.frame.after(50, self.update_nearest_rares_window)
+            return
+        nearest_rares = rares.nearest_k(self.current_system.x, self.current_system.y, self.current_system.z, 10)  # Top 10
+
+        title = f"Nearest Rare Commodities - {self.current_system.system}"
+        win.title(title)
+        self.rares_title_label.configure(text=title)
+
+        bg_color = self.frame.cget("bg")
+        try:
+            fg_color = self.powerplay_level_label.cget("fg")
+        except:
+            fg_color = "black"  # Default fallback
+        link_color = "blue" if config.get_int('theme') == 0 else "white"
         size_mapping = {
             1: "Small",
             2: "Medium",
             3: "Large"
         }
 
-        # Create copy icon from base64 PNG
-        import base64
-        import io
+        # The system on each row, for its copy button
+        self.rares_systems = [near.rare.system for near in nearest_rares]
 
-        png_b64 = "iVBORw0KGgoAAAANSUhEUgAAABAAAAAUCAYAAACEYr13AAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADsAAAA7AAWrWiQkAAAGHaVRYdFhNTDpjb20uYWRvYmUueG1wAAAAAAA8P3hwYWNrZXQgYmVnaW49J++7vycgaWQ9J1c1TTBNcENlaGlIenJlU3pOVGN6a2M5ZCc/Pg0KPHg6eG1wbWV0YSB4bWxuczp4PSJhZG9iZTpuczptZXRhLyI+PHJkZjpSREYgeG1sbnM6cmRmPSJodHRwOi8vd3d3LnczLm9yZy8xOTk5LzAyLzIyLXJkZi1zeW50YXgtbnMjIj48cmRmOkRlc2NyaXB0aW9uIHJkZjphYm91dD0idXVpZDpmYWY1YmRkNS1iYTNkLTExZGEtYWQzMS1kMzNkNzUxODJmMWIiIHhtbG5zOnRpZmY9Imh0dHA6Ly9ucy5hZG9iZS5jb20vdGlmZi8xLjAvIj48dGlmZjpPcmllbnRhdGlvbj4xPC90aWZmOk9yaWVudGF0aW9uPjwvcmRmOkRlc2NyaXB0aW9uPjwvcmRmOlJERj48L3g6eG1wbWV0YT4NCjw/eHBhY2tldCBlbmQ9J3cnPz4slJgLAAACOklEQVQ4T52Tv08TYRjHP+9xR3uFBRIwGJyIIw6VssiEKSAbMqkDLICDOqiLhAkTGTH4B1igLhJ/LhgGurQRBiILQWTBiQNqArZ31/tRzuEC3tU2Gj/Tvd/v83zf9543r0inF71Py8uosRh/w9B1RkZHSSb7zjVx5/Yt7+Gjx7S0tOB5HkKIUNMZQghyuRxra5+ZnX3+2xgfH/NOTk68f2Fz84s3OfkkpMkAtm0DkMlkeJVeRI2pQPgkAsj/yKNpGg/u38MwTW4MDCAHiz5+eE9XIkF3dzeeF3R8ZFmmvl7BMEzy+TwL86lwQFSNkkgkiMevBuWqFAoF3r19Ew4AOD09xTRNZmae4dg2Ul1dyNd1neHhYeLxLoDqAbIs03Oth3K5jJDCs7Btm/b2S7iuA9UCXNdFURT6+vsrrRAHBxpUC1AUBcuySKVe4joOkiSFfNMs0Xu9l46OywCE3f/gjxM4jkMkEmFi4m6lFaLmL8iyjOM4ZFZXaw6xs/MKzc3Nfn3IBSRJwnVdsrlszWtsamqitfUCnAWoquovZBnLslBVlenpp6HGSg4PDwCQCoWfZLNZNjY20DSNSCRCuVxmZ+cr29vbbG1tsb+/X9mPEP785aGhmywtvUaNRtn9tktjYyOlUokXc3NYloVZKpFMJhkZGa3M8Ak+zampSW99fS0o1eT4+NibGB/zn/MZxWKR73t7tLVdDMrgb3T+LYTg6OgIXS8ivICzsrLCwnyKWEPDeXEtDMNgcHCQX5wiS4oqTftoAAAAAElFTkSuQmCC"
+        def new_system_link(index: int):
+            # The name must start with system for the context menu and be unique within the window
+            return lambda **options: MultiHyperlinkLabel(win, compound=tk.RIGHT, popup_copy=True, name=f"system{index}", **options)
 
-        png_data = base64.b64decode(png_b64)
-        pil_image = Image.open(io.BytesIO(png_data))
-        
-        # Convert PIL Image to PhotoImage via PPM format
-        ppm_buffer = io.BytesIO()
-        pil_image.save(ppm_buffer, format='PPM')
-        copy_icon = tk.PhotoImage(data=ppm_buffer.getvalue())
+        def new_copy_button(index: int):
+            def create(**options):
+                copy_btn = tk.Label(win, image=self.copy_icon(), cursor="hand2", **options)
+                copy_btn.bind("<Button-1>", lambda e: self.copy_rare_system(index))
+                theme.register(copy_btn)
+                return copy_btn
+            return create
 
+        label = self.new_label(win)
+        pool = self.rares_rows
+        pool.begin()
         # Data rows (starting at row 2)
-        for row, rare in enumerate(sorted_rares, start=2):
-            # Calculate distance from current system position
-            dx = rare.coordinates.x - self.current_system.position.x
-            dy = rare.coordinates.y - self.current_system.position.y
-            dz = rare.coordinates.z - self.current_system.position.z
-            distance = math.sqrt(dx * dx + dy * dy + dz * dz)
-            
-            tk.Label(win, text=rare.name, bg=bg_color, fg=fg_color).grid(row=row, column=0, padx=5, pady=2)
-            MultiHyperlinkLabel(win, compound=tk.RIGHT, url=self.system_url(rare.system), 
-                    popup_copy=True, name=f"system{re.sub(r'[^a-zA-Z0-9]', '', rare.system)}", 
-                    text=f"{rare.system}", background=bg_color, foreground="blue" if config.get_int('theme') == 0 else "white").grid(row=row, column=1, padx=5, pady=2)
-            
+        for index, near in enumerate(nearest_rares):
+            rare = near.rare
+            row = index + 2
+            pool.place(("rare", index, 0), label, row, 0, sticky="", padx=5, pady=2, text=rare.name, bg=bg_color, fg=fg_color)
+            pool.place(("rare", index, 1), new_system_link(index), row, 1, sticky="", padx=5, pady=2,
+                       text=rare.system, url=self.system_url(rare.system), background=bg_color, foreground=link_color)
             # Copy button for system name (after System column)
-            def make_copy_handler(system_name):
-                def copy_system():
-                    win.clipboard_clear()
-                    win.clipboard_append(system_name)
-                    win.update()
-                return copy_system
-            
-            copy_btn = tk.Label(win, image=copy_icon, bg=bg_color, cursor="hand2")
-            copy_btn.image = copy_icon  # Keep a reference to prevent garbage collection
-            copy_btn.grid(row=row, column=2, padx=5, pady=2)
-            copy_btn.bind("<Button-1>", lambda e, handler=make_copy_handler(rare.system): handler())
-            theme.register(copy_btn)
-            
-            tk.Label(win, text=rare.stationName, bg=bg_color, fg=fg_color).grid(row=row, column=3, padx=5, pady=2)
-            tk.Label(win, text=size_mapping.get(rare.maxLandingPadSize), bg=bg_color, fg=fg_color).grid(row=row, column=4, padx=5, pady=2)
-            tk.Label(win, text=str(rare.count or "-"), bg=bg_color, fg=fg_color).grid(row=row, column=5, padx=5, pady=2)
-            tk.Label(win, text=f"{distance:.2f}", bg=bg_color, fg=fg_color).grid(row=row, column=6, padx=5, pady=2)
+            pool.place(("rare", index, 2), new_copy_button(index), row, 2, sticky="", padx=5, pady=2, bg=bg_color)
+            pool.place(("rare", index, 3), label, row, 3, sticky="", padx=5, pady=2, text=rare.stationName, bg=bg_color, fg=fg_color)
+            pool.place(("rare", index, 4), label, row, 4, sticky="", padx=5, pady=2, text=size_mapping.get(rare.maxLandingPadSize), bg=bg_color, fg=fg_color)
+            pool.place(("rare", index, 5), label, row, 5, sticky="", padx=5, pady=2, text=str(rare.count or "-"), bg=bg_color, fg=fg_color)
+            pool.place(("rare", index, 6), label, row, 6, sticky="", padx=5, pady=2, text=f"{near.distance:.2f}", bg=bg_color, fg=fg_color)
+        pool.end()
+
+    def show_rares_error(self, error: str) -> None:
+        """
+        Show why the rare commodities could not be loaded in place of the rows of the nearest rares window.
+        """
+        win = self.rares_window
+        try:
+            fg_color = self.powerplay_level_label.cget("fg")
+        except:
+            fg_color = "black"  # Default fallback
+        pool = self.rares_rows
+        pool.begin()
+        pool.place(("error",), self.new_label(win), 2, 0, columnspan=7, sticky="", padx=5, pady=2,
+                   text=f"Could not load the rare commodities: {error}", bg=self.frame.cget("bg"), fg=fg_color)
+        pool.end()
 
-        # Make columns expand equally
-        for col in range(len(headers)):
-            win.grid_columnconfigure(col, weight=1)
+    def copy_rare_system(self, index: int) -> None:
+        """
+        Copy the system of a row of the nearest rares window to the clipboard.
+        """
+        win = self.rares_window
+        if win is None or index >= len(self.rares_systems):
+            return
+        win.clipboard_clear()
+        win.clipboard_append(self.rares_systems[index])
+        win.update()
 
-        #theme.apply(win)
+    def copy_icon(self) -> tk.PhotoImage:
+        """
+        The copy button icon, decoded the first time it is needed.
+        """
+        if self._copy_icon is None:
+            # Create copy icon from base64 PNG
+            import base64
+            import io
+
+            png_b64 = "iVBORw0KGgoAAAANSUhEUgAAABAAAAAUCAYAAACEYr13AAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADsAAAA7AAWrWiQkAAAGHaVRYdFhNTDpjb20uYWRvYmUueG1wAAAAAAA8P3hwYWNrZXQgYmVnaW49J++7vycgaWQ9J1c1TTBNcENlaGlIenJlU3pOVGN6a2M5ZCc/Pg0KPHg6eG1wbWV0YSB4bWxuczp4PSJhZG9iZTpuczptZXRhLyI+PHJkZjpSREYgeG1sbnM6cmRmPSJodHRwOi8vd3d3LnczLm9yZy8xOTk5LzAyLzIyLXJkZi1zeW50YXgtbnMjIj48cmRmOkRlc2NyaXB0aW9uIHJkZjphYm91dD0idXVpZDpmYWY1YmRkNS1iYTNkLTExZGEtYWQzMS1kMzNkNzUxODJmMWIiIHhtbG5zOnRpZmY9Imh0dHA6Ly9ucy5hZG9iZS5jb20vdGlmZi8xLjAvIj48dGlmZjpPcmllbnRhdGlvbj4xPC90aWZmOk9yaWVudGF0aW9uPjwvcmRmOkRlc2NyaXB0aW9uPjwvcmRmOlJERj48L3g6eG1wbWV0YT4NCjw/eHBhY2tldCBlbmQ9J3cnPz4slJgLAAACOklEQVQ4T52Tv08TYRjHP+9xR3uFBRIwGJyIIw6VssiEKSAbMqkDLICDOqiLhAkTGTH4B1igLhJ/LhgGurQRBiILQWTBiQNqArZ31/tRzuEC3tU2Gj/Tvd/v83zf9543r0inF71Py8uosRh/w9B1RkZHSSb7zjVx5/Yt7+Gjx7S0tOB5HkKIUNMZQghyuRxra5+ZnX3+2xgfH/NOTk68f2Fz84s3OfkkpMkAtm0DkMlkeJVeRI2pQPgkAsj/yKNpGg/u38MwTW4MDCAHiz5+eE9XIkF3dzeeF3R8ZFmmvl7BMEzy+TwL86lwQFSNkkgkiMevBuWqFAoF3r19Ew4AOD09xTRNZmae4dg2Ul1dyNd1neHhYeLxLoDqAbIs03Oth3K5jJDCs7Btm/b2S7iuA9UCXNdFURT6+vsrrRAHBxpUC1AUBcuySKVe4joOkiSFfNMs0Xu9l46OywCE3f/gjxM4jkMkEmFi4m6lFaLmL8iyjOM4ZFZXaw6xs/MKzc3Nfn3IBSRJwnVdsrlszWtsamqitfUCnAWoquovZBnLslBVlenpp6HGSg4PDwCQCoWfZLNZNjY20DSNSCRCuVxmZ+cr29vbbG1tsb+/X9mPEP785aGhmywtvUaNRtn9tktjYyOlUokXc3NYloVZKpFMJhkZGa3M8Ak+zampSW99fS0o1eT4+NibGB/zn/MZxWKR73t7tLVdDMrgb3T+LYTg6OgIXS8ivICzsrLCwnyKWEPDeXEtDMNgcHCQX5wiS4oqTftoAAAAAElFTkSuQmCC"
 
+            png_data = base64.b64decode(png_b64)
+            pil_image = Image.open(io.BytesIO(png_data))
+        
+            # Convert PIL Image to PhotoImage via PPM format
+            ppm_buffer = io.BytesIO()
+            pil_image.save(ppm_buffer, format='PPM')
+            self._copy_icon = tk.PhotoImage(data=ppm_buffer.getvalue())
+        return self._copy_icon
 
     def reset_session_progress(self) -> None:
         """
@@ -648,7 +747,9 @@ class PowerPlayProgress:
             #self.previous_session = self.current_session
             #self.current_session = SessionProgress()
             self.starting_merits = self.total_merits
-            self.Update_Ppp_Display()
+            self.system_rows.clear()
+            self.changed_sections |= Section.TOTALS | Section.SYSTEMS
+            self.refresh.flush()
 
     def setup_main_ui(self, parent: tk.Frame) -> tk.Frame:
         """
@@ -660,18 +761,18 @@ class PowerPlayProgress:
         current_row = 0
         self.frame = tk.Frame(parent)
         self.frame.grid_columnconfigure(0, weight=1)
+        self.refresh.attach(self.frame)
         self.powerplay_level_label = tk.Label(self.frame, text="PowerPlay Progress: Awaiting data", justify=tk.CENTER)
         self.powerplay_level_label.grid(row=current_row, column=0, columnspan=2)
         current_row += 1
 
+        # The link goes in this row if the version check finds a newer release, an empty grid row takes no space
+        self.update_link_row = current_row
+        current_row += 1
         try:
-            update_version = self.version_check()
-            #update_version = '0.9.1'  # for testing
-            if update_version != '':
-                url = f"https://github.com/alby666/EDMC-PowerPlayProgress/releases/tag/v{update_version}"
-                update_link = MultiHyperlinkLabel(self.frame, text=f"Version {update_version} available", foreground="blue", cursor="hand2", url=url)
-                update_link.grid(row=current_row, columnspan=2, sticky="N")
-                current_row += 1
+            self.version_check = VersionCheck(self.data_dir / "version.json")
+            self.version_check.start()
+            self.frame.after(self.version_poll_ms, self.show_update_link)
         except Exception as ex:
             # Swallow any exceptions here, we don't want to crash the plugin if we can't check for updates
             logger.error('Failed to check for updates', exc_info=ex)
@@ -723,7 +824,6 @@ class PowerPlayProgress:
         self.mertits_by_system_frame.grid(row=current_row, column=0, columnspan=2, sticky="NSEW")
         self.merits_by_systems_label = tk.Label(self.mertits_by_system_frame, text="Merits by Systems:")
         current_row += 1
-        self.flex_row = current_row
 
         self.pp_commods_frame = tk.Frame(self.frame)
         self.pp_commods_frame.grid_columnconfigure(0, weight=0)
@@ -745,6 +845,7 @@ class PowerPlayProgress:
         self.buttons_frame.grid_columnconfigure(1, weight=0)
         self.buttons_frame.grid_columnconfigure(2, weight=0)
         self.buttons_frame.grid_columnconfigure(3, weight=1)
+        self.buttons_row = current_row
         self.buttons_frame.grid(row=current_row, column=0, columnspan=2, sticky="NSEW")
         self.copy_button = tk.Button(
             self.buttons_frame,
@@ -779,19 +880,42 @@ class PowerPlayProgress:
         self.socials_link_discord.grid_remove()
         self.socials_power_label.grid_remove()
         self.buttons_frame.grid_remove()
-        
+
+        # Show whatever the start up catch up found, rendered once the frame is in the event loop
+        if self.total_merits > 0: self.refresh.request()
         return self.frame
 
     def Update_Ppp_Display(self) -> None:
         """
-        Update the display with the current session and system data.
+        Update the sections of the display whose data has changed since the last update.
         """
-        # Get the system's default locale
-        default_locale = locale.getlocale()
-        # Set the locale to the system's default
-        locale.setlocale(locale.LC_ALL, '.'.join(default_locale))
+        sections = self.changed_sections
+        self.changed_sections = Section.NONE
+        if sections & Section.PROGRESS: self.update_progress_section()
+        if sections & Section.SOCIALS: self.update_socials_section()
+        if sections & Section.TOTALS: self.update_totals_section()
+        if sections & Section.SYSTEMS: self.update_systems_section()
+        if sections & Section.COMMODITIES: self.update_commodities_section()
+        if sections & Section.ACTIVITIES: self.update_activities_section()
+        if sections & Section.BUTTONS: self.update_buttons_section()
+
+        new_widgets = self.system_rows.take_created() + self.commodity_rows.take_created() + self.activity_rows.take_created()
+        if sections == Section.ALL:
+            theme.update(self.frame)
+            theme.update(self.mertits_by_system_frame)
+            theme.update(self.pp_commods_frame)
+            theme.update(self.merits_by_activty_frame)
+            theme.update(self.totals_frame)
+            theme.update(self.buttons_frame)
+        else:
+            # Only the new rows need theming, the others were themed when they were created
+            for widget in new_widgets:
+                theme.update(widget)
 
-        ## Update the progress bar and label with the current session data
+    def update_progress_section(self) -> None:
+        """
+        Update the progress bar and label with the current session data.
+        """
         if self.options_view_progress_bar.get():
             self.progressbar_frame.grid()
             self.pb.canvas.grid()
@@ -809,7 +933,10 @@ class PowerPlayProgress:
             self.pb.canvas.grid_remove()
             self.pb.canvas.grid_remove()
 
-        #Socials
+    def update_socials_section(self) -> None:
+        """
+        Show the links for the pledged power.
+        """
         if self.options_view_socials.get() and self.current_session.power_play != '':
             links = Socials.get_links(self.current_session.power_play)
             if links != "":
@@ -831,22 +958,26 @@ class PowerPlayProgress:
             self.socials_power_label.grid_remove()
             self.socials_frame.grid_remove()
 
+    def update_totals_section(self) -> None:
+        """
+        Update the merit totals.
+        """
         if self.options_view_totals.get():
             self.totals_frame.grid()
             self.total_merits_label.grid(column=0, sticky=tk.W)
             self.total_session_merits.grid(column=0, sticky=tk.W)
             self.total_since_merits.grid(column=0, sticky=tk.W)
             self.total_prev_merits.grid(column=0, sticky=tk.W)
-            total_str = locale.format_string("%d", round(self.total_merits, 0), grouping=True)
+            total_str = self.formatter.format_int(self.total_merits)
             self.total_merits_label.config(text=f"Total Merits:\t\t\t\t{total_str}")
 
-            total_str = locale.format_string("%d", round(self.total_merits - self.starting_merits, 0), grouping=True)
+            total_str = self.formatter.format_int(self.total_merits - self.starting_merits)
             self.total_session_merits.config(text=f"Total Merits this session:\t\t\t{total_str}")
             
-            total_str = locale.format_string("%d", round(self.current_session.earned_merits, 0), grouping=True)
+            total_str = self.formatter.format_int(self.current_session.earned_merits)
             self.total_since_merits.config(text=f"Total Merits since last dock/death:\t\t{total_str}")
             
-            total_str = locale.format_string("%d", round(self.previous_session.earned_merits, 0), grouping=True)
+            total_str = self.formatter.format_int(self.previous_session.earned_merits)
             self.total_prev_merits.config(text=f"Total Merits since previous dock/death:\t{total_str}")
         else:
             self.total_merits_label.grid_remove()
@@ -854,17 +985,13 @@ class PowerPlayProgress:
             self.total_since_merits.grid_remove()
             self.total_prev_merits.grid_remove()
             self.totals_frame.grid_remove()
-        
-        ## Remove the previous labels from the list and destroy them
-        for lbl in self.power_play_list_labels:
-            lbl.destroy()
-        self.power_play_list_labels.clear()
-
-        for hpl in self.power_play_hpl_labels:
-            hpl.destroy()
-        self.power_play_hpl_labels.clear()
 
-        cur_row = self.flex_row
+    def update_systems_section(self) -> None:
+        """
+        Update the merits by system rows.
+        """
+        self.system_rows.begin()
+        cur_row = 0
         if self.options_view_merits_by_systems.get() and len(self.systems) > 0:
             if (self.total_merits - self.starting_merits) > 0:
                 self.mertits_by_system_frame.grid()
@@ -899,112 +1026,95 @@ class PowerPlayProgress:
                         else:
                             undermining_state_change = ' U\u2194'
                         self.mertits_by_system_frame.grid()
-                        lbl = None
-                        total_str = locale.format_string("%d", round(sys.earnings, 0), grouping=True)
-                        hypl = MultiHyperlinkLabel(self.mertits_by_system_frame, compound=tk.RIGHT, url=self.system_url(sys.system), popup_copy=True, name=f"system{re.sub(r'[^a-zA-Z0-9]', '', sys.system)}", text=f"  - {sys.system}")
-                        hypl.grid(row=cur_row, column=0, sticky="w")
-                        theme.register(hypl)
-                        self.power_play_hpl_labels.append(hypl)
-                        hypl = None                        
+                        total_str = self.formatter.format_int(sys.earnings)
+                        system_key = sys.system_address or sys.system
+                        self.system_rows.place(("system", system_key, 0), self.new_system_link(self.system_rows, self.mertits_by_system_frame, sys.system),
+                                               cur_row, 0, text=f"  - {sys.system}")
                         if sys.controlling_power != '':
-                            lbl = tk.Label(self.mertits_by_system_frame, text=f"{total_str} : {sys.controlling_power} : {sys.power_play_state} : {round(sys.power_play_state_control_progress * 100, 2)}%{control_state_change}{reinforcement_state_change}{undermining_state_change}")
+                            text = f"{total_str} : {sys.controlling_power} : {sys.power_play_state} : {round(sys.power_play_state_control_progress * 100, 2)}%{control_state_change}{reinforcement_state_change}{undermining_state_change}"
                         else:
-                            lbl = tk.Label(self.mertits_by_system_frame, text=f"{total_str}")
-                        lbl.grid(row=cur_row, column=1, columnspan=2, sticky="w")
-                        theme.register(lbl)
-                        self.power_play_list_labels.append(lbl)
+                            text = f"{total_str}"
+                        self.system_rows.place(("system", system_key, 1), self.new_label(self.mertits_by_system_frame), cur_row, 1, columnspan=2, text=text)
                         cur_row += 1
         else:
             self.mertits_by_system_frame.grid_remove()
             self.merits_by_systems_label.grid_remove()
+        self.system_rows.end()
 
+    def update_commodities_section(self) -> None:
+        """
+        Update the powerplay commodities collected and delivered.
+        """
+        self.commodity_rows.begin()
+        cur_row = 0
         if self.options_view_powerplay_commodities.get() and (self.current_session.total_commodities_collected > 0 or self.current_session.total_commodities_delivered > 0):
             self.pp_commods_frame.grid()
             self.powerplay_commodities_label.grid(row=cur_row, column=0, columnspan=3, sticky="w")
-            self.powerplay_commodities_label.config(text=f"PowerPlay Commodities (collected/delivered): {self.current_session.total_commodities_collected} t / {self.current_session.total_commodities_delivered} t")
+            self.powerplay_commodities_label.config(text=f"PowerPlay Commodities (collected/delivered): {self.formatter.format_int(self.current_session.total_commodities_collected)} t / {self.formatter.format_int(self.current_session.total_commodities_delivered)} t")
             cur_row += 1
 
             if self.current_session.total_commodities_delivered > 0:
                 if self.options_view_powerplay_commodities_by_type.get():
-                    lbl = tk.Label(self.pp_commods_frame, text=f"Delivered By type:")
-                    lbl.grid(row=cur_row, column=0, sticky="w")
-                    self.power_play_list_labels.append(lbl)
+                    self.commodity_rows.place(("by type",), self.new_label(self.pp_commods_frame), cur_row, 0, text=f"Delivered By type:")
                     cur_row += 1
-                    for commod in self.current_session.commodities_delivered_types:
-                        count = self.current_session.total_commodities_delivered_by_type(commod)
+                    for commod, count in self.current_session.commodity_ledger.delivered_by_type.items():
                         if count > 0:
-                            lbl = tk.Label(self.pp_commods_frame, text=f"  - {commod}:\t{round(count, 0)} t")
-                            lbl.grid(row=cur_row, column=0, columnspan=3, sticky="w")
-                            self.power_play_list_labels.append(lbl)
-                            theme.register(lbl)
+                            self.commodity_rows.place(("type", commod), self.new_label(self.pp_commods_frame), cur_row, 0, columnspan=3,
+                                                      text=f"  - {commod}:\t{self.formatter.format_int(count)} t")
                             cur_row += 1
 
                 if self.options_view_powerplay_commodities_by_system.get():
-                    lbl = tk.Label(self.pp_commods_frame, text=f"Delivered By system:")
-                    lbl.grid(row=cur_row, column=0, sticky="w")
-                    self.power_play_list_labels.append(lbl) 
+                    self.commodity_rows.place(("by system",), self.new_label(self.pp_commods_frame), cur_row, 0, text=f"Delivered By system:")
                     cur_row += 1
-                    for commod in self.current_session.commodities_delivered_systems:
-                        count = self.current_session.total_commodities_delivered_by_system(commod)
+                    for commod, count in self.current_session.commodity_ledger.delivered_by_system.items():
                         if count > 0:
-                            hypl = MultiHyperlinkLabel(self.pp_commods_frame, compound=tk.RIGHT, url=self.system_url(commod), popup_copy=True, name='system', text=f"  - {commod}")
-                            hypl.grid(row=cur_row, column=0, sticky="w")
-                            total_str = locale.format_string("%d", round(count, 0), grouping=True)
-                            lbl = tk.Label(self.pp_commods_frame, text=f"{total_str} t")
-                            lbl.grid(row=cur_row, column=1, columnspan=2, sticky="w")
-                            self.power_play_list_labels.append(lbl)
-                            self.power_play_hpl_labels.append(hypl)
-                            theme.register(lbl)
-                            theme.register(hypl)
+                            self.commodity_rows.place(("delivered", commod, 0), self.new_system_link(self.commodity_rows, self.pp_commods_frame, commod),
+                                                      cur_row, 0, text=f"  - {commod}")
+                            total_str = self.formatter.format_int(count)
+                            self.commodity_rows.place(("delivered", commod, 1), self.new_label(self.pp_commods_frame), cur_row, 1, columnspan=2, text=f"{total_str} t")
                             cur_row += 1
         else:
             self.pp_commods_frame.grid_remove()
             self.powerplay_commodities_label.grid_remove()
+        self.commodity_rows.end()
 
+    def update_activities_section(self) -> None:
+        """
+        Update the merits by activity rows.
+        """
+        self.activity_rows.begin()
+        cur_row = 0
         if self.options_view_merits_by_activities.get() and self.current_session.activities.get_total_merits() > 0:
             self.merits_by_activty_frame.grid()
-            lbl = tk.Label(self.merits_by_activty_frame, text=f"Merits by Activity:")
-            lbl.grid(row=cur_row, column=0, sticky="w")
-            self.power_play_list_labels.append(lbl)
-            theme.register(lbl)
+            self.activity_rows.place(("activities",), self.new_label(self.merits_by_activty_frame), cur_row, 0, text=f"Merits by Activity:")
             cur_row += 1
-            for act in self.current_session.activities.activities:
-                if act.merits > 0: 
-                    lbl = tk.Label(self.merits_by_activty_frame, text=f"  - {act.activity_type}")
-                    lbl.grid(row=cur_row, column=0, sticky="w")
-                    self.power_play_list_labels.append(lbl)
-                    lblMerits = tk.Label(self.merits_by_activty_frame, text=f"{act.merits}")
-                    lblMerits.grid(row=cur_row, column=1, columnspan=2, sticky="w")
-                    self.power_play_list_labels.append(lblMerits)
-                    theme.register(lbl)
-                    theme.register(lblMerits)
+            for kind, merits in self.current_session.activities.items():
+                if merits > 0: 
+                    self.activity_rows.place(("activity", kind, 0), self.new_label(self.merits_by_activty_frame), cur_row, 0, text=f"  - {kind.heading}")
+                    self.activity_rows.place(("activity", kind, 1), self.new_label(self.merits_by_activty_frame), cur_row, 1, columnspan=2,
+                                             text=f"{self.formatter.format_int(merits)}")
                     cur_row += 1
-                    if act.activity_type == mined_heading:
-                        for commod in self.current_session.activities.mined_commodities:
-                            lbl = tk.Label(self.merits_by_activty_frame, text=f"      - {commod.commodity_type.title()} : {commod.merits} : {commod.tonnage} t")
-                            lbl.grid(row=cur_row, column=0, sticky="w")
-                            self.power_play_list_labels.append(lbl)
-                            theme.register(lbl)
+                    if kind == ActivityKind.MINED:
+                        for commod in self.current_session.activities.mined_commodities.values():
+                            self.activity_rows.place(("mined", commod.commodity_type), self.new_label(self.merits_by_activty_frame), cur_row, 0,
+                                                     text=f"      - {commod.commodity_type.title()} : {self.formatter.format_int(commod.merits)} : {self.formatter.format_int(commod.tonnage)} t")
                             cur_row += 1
         else:
             self.merits_by_activty_frame.grid_remove()
+        self.activity_rows.end()
 
-        self.buttons_frame.grid(row=cur_row, column=0, columnspan=2, sticky="NSEW")
+    def update_buttons_section(self) -> None:
+        """
+        Show the buttons, with the copy button set to the export format.
+        """
+        self.buttons_frame.grid(row=self.buttons_row, column=0, columnspan=2, sticky="NSEW")
         if self.options_view_export_format.get() == 'Text':
             self.copy_button.config(command=self.copy_to_clipboard_text)
         elif self.options_view_export_format.get() == 'Custom':
             self.copy_button.config(command=self.copy_to_clipboard_custom_format)
         else:
             self.copy_button.config(command=self.copy_to_clipboard_discord)
-        cur_row += 1
-        self.copy_button.grid(row=cur_row, column=0, sticky="W", padx=2)
-        self.reset_button.grid(row=cur_row, column=1, sticky="W", padx=2)
-        self.reset_session_button.grid(row=cur_row, column=2, sticky="W", padx=2)
-        self.rares_button.grid(row=cur_row, column=3, sticky="W", padx=2)
-
-        theme.update(self.frame)
-        theme.update(self.mertits_by_system_frame)
-        theme.update(self.pp_commods_frame)
-        theme.update(self.merits_by_activty_frame)
-        theme.update(self.totals_frame)
-        theme.update(self.buttons_frame)
+        self.copy_button.grid(row=0, column=0, sticky="W", padx=2)
+        self.reset_button.grid(row=0, column=1, sticky="W", padx=2)
+        self.reset_session_button.grid(row=0, column=2, sticky="W", padx=2)
+        self.rares_button.grid(row=0, column=3, sticky="W", padx=2)
@@ -0,0 +1,100 @@
+"""
+Power play state tracked across journal entries.
+
+This is the model half of PowerPlayProgress. It has no tkinter or EDMC dependencies so that the
+journal processing can also be run headless, e.g. replaying journals in tests and benchmarks.
+"""
+from __future__ import annotations
+
+import math
+from enum import IntFlag
+from typing import Optional
+from meritstore import MeritStore
+from recentjournal import RecentJournal
+from sessionprogress import SessionProgress
+from systemprogress import SystemProgress
+from systemregistry import SystemRegistry
+
+
+class Section(IntFlag):
+    """
+    The sections of the display, flagged when the data they show changes.
+    """
+    NONE = 0
+    PROGRESS = 1
+    SOCIALS = 2
+    TOTALS = 4
+    SYSTEMS = 8
+    COMMODITIES = 16
+    ACTIVITIES = 32
+    BUTTONS = 64
+    ALL = PROGRESS | SOCIALS | TOTALS | SYSTEMS | COMMODITIES | ACTIVITIES | BUTTONS
+
+
+class PowerPlayState:
+    """
+    The sessions, systems and merit totals built up from the journal.
+    """
+
+    def __init__(self) -> None:
+        self.current_session: SessionProgress = SessionProgress()
+        self.previous_session: SessionProgress = SessionProgress()
+        self.starting_merits = 0
+        self.total_merits = 0
+        self.systems: SystemRegistry = SystemRegistry()
+        self.current_system: SystemProgress = SystemProgress()
+        self.recent_journal_log: RecentJournal = RecentJournal()
+        self.last_merits_gained = 0
+        # Where the attributed merits are persisted, None when not persisting (e.g. headless replays)
+        self.merit_store: Optional[MeritStore] = None
+        # Sections changed since the display was last updated, everything needs drawing the first time
+        self.changed_sections: Section = Section.ALL
+
+    def NextRankDifference(self, currentRank: int) -> int:
+        """
+        Reutrn the difference between the current rank and the next rank.
+        """
+        if currentRank == 1:
+            return 2000
+        elif currentRank == 2:
+            return 3000
+        elif currentRank == 3:
+            return 4000
+        elif currentRank == 4:
+            return 6000
+        else:
+            return 8000
+
+    def CurrentRank(self, currentMerits: int) -> int:
+        """
+        Return the current rank.
+        """
+        if currentMerits < 2000:
+            return 1
+        elif currentMerits < 5000:
+            return 2
+        elif currentMerits < 9000:
+            return 3
+        elif currentMerits < 15000:
+            return 4
+        elif currentMerits < 23000:
+            return 5
+        else:
+            return math.floor((currentMerits - 23000) // 8000) + 6
+
+    def CurrentRankLowerBound(self, currentRank: int) -> int:
+        """
+        Return the lower bound of the current rank.
+        """
+        if currentRank <= 1:
+            return 0
+        elif currentRank == 2:
+            return 2000
+        elif currentRank == 3:
+            return 5000
+        elif currentRank == 4:
+            return 9000
+        elif currentRank == 5:
+            return 15000
+        else:
+            return 15000 + (8000 * (currentRank - 5))
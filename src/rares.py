@@ -1,10 +1,26 @@
 """Rare commodities data model and utilities."""
 
+from __future__ import annotations
+
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import Optional
+from heapq import heappush, heapreplace
+from typing import Any, Callable, Optional, Sequence
 import json
 import math
+import os
+import threading
 from pathlib import Path
+import rarescache
+from pluginlogger import logger
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    # Optional, the distance queries fall back to the pure Python k-d tree
+    np = None
+
+RARES_FILE = Path(__file__).parent / "rare-commodities.json"
 
 
 @dataclass
@@ -84,27 +100,258 @@ class RareExport:
         }
 
 
+@dataclass
+class NearbyRare:
+    """A rare commodity found by a distance query, with its distance from the query point."""
+
+    rare: RareExport
+    distance: float
+
+
+class _KDTree:
+    """A k-d tree over the coordinates of the rare commodities, by index into the commodity list."""
+
+    def __init__(self, points: list[tuple[float, float, float]]):
+        """Build the tree, splitting on x, y and z in turn at the median.
+
+        Args:
+            points: The coordinates of each commodity
+        """
+        self.points = points
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices: list[int], axis: int) -> Optional[tuple]:
+        """Build the subtree for the indices, each node is (index, axis, left, right)."""
+        if not indices:
+            return None
+        points = self.points
+        indices.sort(key=lambda index: points[index][axis])
+        median = len(indices) // 2
+        next_axis = (axis + 1) % 3
+        return (indices[median], axis,
+                self._build(indices[:median], next_axis),
+                self._build(indices[median + 1:], next_axis))
+
+    def nearest(self, point: tuple[float, float, float], k: int,
+                accept: Callable[[int], bool]) -> list[tuple[float, int]]:
+        """Find the k nearest accepted points.
+
+        Args:
+            point: The query point
+            k: The number of points to find
+            accept: Filter on the index of a point
+
+        Returns:
+            (squared distance, index) pairs, nearest first
+        """
+        points = self.points
+        px, py, pz = point
+        # Max heap of the best so far, by negated squared distance
+        best: list[tuple[float, int]] = []
+
+        def search(node: Optional[tuple]) -> None:
+            if node is None:
+                return
+            index, axis, left, right = node
+            x, y, z = points[index]
+            d2 = (x - px) * (x - px) + (y - py) * (y - py) + (z - pz) * (z - pz)
+            # Nearer than the furthest so far, or as near and earlier in the commodity list
+            if (len(best) < k or (-d2, -index) > best[0]) and accept(index):
+                if len(best) < k:
+                    heappush(best, (-d2, -index))
+                else:
+                    heapreplace(best, (-d2, -index))
+            diff = point[axis] - points[index][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            # The far side can only be nearer, or as near, if the splitting plane is
+            if len(best) < k or diff * diff <= -best[0][0]:
+                search(far)
+
+        if k > 0:
+            search(self.root)
+        return sorted((-d2, -index) for d2, index in best)
+
+    def within(self, point: tuple[float, float, float], radius: float,
+               accept: Callable[[int], bool]) -> list[tuple[float, int]]:
+        """Find the accepted points within a distance.
+
+        Args:
+            point: The query point
+            radius: The distance
+            accept: Filter on the index of a point
+
+        Returns:
+            (squared distance, index) pairs, nearest first
+        """
+        points = self.points
+        px, py, pz = point
+        r2 = radius * radius
+        found: list[tuple[float, int]] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            index, axis, left, right = node
+            x, y, z = points[index]
+            d2 = (x - px) * (x - px) + (y - py) * (y - py) + (z - pz) * (z - pz)
+            if d2 <= r2 and accept(index):
+                found.append((d2, index))
+            diff = point[axis] - points[index][axis]
+            stack.append(left if diff < 0 else right)
+            if diff * diff <= r2:
+                stack.append(right if diff < 0 else left)
+        return sorted(found)
+
+
+class _CoordinateArray:
+    """The rare commodity coordinates as one contiguous (N, 3) float64 array, for vectorised queries with NumPy."""
+
+    # Most query point to commodity differences held at once by a batch query, 24 MB of float64
+    chunk_elements = 1 << 20
+
+    def __init__(self, points: list[tuple[float, float, float]], pad_sizes: list[int], stock: list[int]):
+        """Pack the coordinates, pad sizes and stock of the commodities.
+
+        Args:
+            points: The (x, y, z) of each commodity, in index order
+            pad_sizes: The landing pad size of each commodity, 0 if it is not known
+            stock: The count in stock of each commodity, 0 if it is not known
+        """
+        self.coordinates = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.pad_sizes = np.asarray(pad_sizes, dtype=np.int64)
+        self.stock = np.asarray(stock, dtype=np.int64)
+
+    def candidates(self, min_pad_size: Optional[int], min_stock: Optional[int]) -> Any:
+        """Get the indices of the commodities that pass the filters, None for all of them."""
+        if min_pad_size is None and min_stock is None:
+            return None
+        mask = np.ones(len(self.coordinates), dtype=bool)
+        if min_pad_size is not None:
+            mask &= self.pad_sizes >= min_pad_size
+        if min_stock is not None:
+            mask &= self.stock >= min_stock
+        return np.flatnonzero(mask)
+
+    def nearest(self, points: Any, k: int, candidates: Any) -> tuple[Any, Any]:
+        """Find the k nearest candidates to each point.
+
+        Args:
+            points: (Q, 3) query points
+            k: The number of commodities for each point
+            candidates: The indices to search, None for all
+
+        Returns:
+            (Q, k) indices and (Q, k) squared distances, nearest first along each row
+        """
+        coordinates = self.coordinates if candidates is None else self.coordinates[candidates]
+        count = len(coordinates)
+        k = min(k, count)
+        rows = len(points)
+        if k <= 0:
+            return np.empty((rows, 0), dtype=np.int64), np.empty((rows, 0), dtype=np.float64)
+        indices = np.empty((rows, k), dtype=np.int64)
+        distances = np.empty((rows, k), dtype=np.float64)
+        step = max(1, self.chunk_elements // (count * 3))
+        for start in range(0, rows, step):
+            chunk = points[start:start + step]
+            diff = chunk[:, None, :] - coordinates[None, :, :]
+            d2 = np.einsum("qni,qni->qn", diff, diff)
+            if k < count:
+                nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+                # argpartition picks any of the commodities tied at the kth distance, e.g. two in one system, so
+                # those rows are fully sorted instead to keep the first in commodity order
+                kth = np.take_along_axis(d2, nearest, axis=1).max(axis=1)
+                tied = np.flatnonzero(np.count_nonzero(d2 <= kth[:, None], axis=1) > k)
+                if len(tied):
+                    nearest[tied] = np.argsort(d2[tied], axis=1, kind="stable")[:, :k]
+            else:
+                nearest = np.broadcast_to(np.arange(count), d2.shape)
+            nearest_d2 = np.take_along_axis(d2, nearest, axis=1)
+            # Nearest first, equal distances in commodity order as the sorted list would have them
+            order = np.lexsort((nearest, nearest_d2), axis=-1)
+            indices[start:start + step] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + step] = np.take_along_axis(nearest_d2, order, axis=1)
+        if candidates is not None:
+            indices = candidates[indices]
+        return indices, distances
+
+    def within(self, point: Any, radius: float, candidates: Any) -> tuple[Any, Any]:
+        """Find the candidates within a distance of a point.
+
+        Returns:
+            The indices and squared distances, nearest first
+        """
+        coordinates = self.coordinates if candidates is None else self.coordinates[candidates]
+        diff = coordinates - point
+        d2 = np.einsum("ni,ni->n", diff, diff)
+        inside = np.flatnonzero(d2 <= radius * radius)
+        order = np.lexsort((inside, d2[inside]))
+        inside = inside[order]
+        return (inside if candidates is None else candidates[inside]), d2[inside]
+
+
+class _CompiledCommodities(SequenceABC):
+    """The commodities of a compiled cache, each decoded to a RareExport the first time it is used."""
+
+    def __init__(self, compiled: rarescache.CompiledRares):
+        self.compiled = compiled
+        self._decoded: list[Optional[RareExport]] = [None] * compiled.count
+
+    def __len__(self) -> int:
+        return self.compiled.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        commodity = self._decoded[index]
+        if commodity is None:
+            commodity = self._decoded[index] = RareExport.from_dict(self.compiled.row(index % len(self)))
+        return commodity
+
+
 class Rares:
     """Manager for loading and accessing rare commodity data."""
 
-    def __init__(self):
-        """Initialize the manager and auto-load rare commodities."""
-        self.commodities: list[RareExport] = []
-        self._by_id: dict[str, RareExport] = {}
+    # Use the NumPy distance queries when NumPy is installed, the k-d tree when it is not
+    numpy_enabled: bool = np is not None
+
+    def __init__(self, filepath: str | Path | None = None, cache_path: str | Path | None = None):
+        """Initialize the manager and auto-load rare commodities.
+
+        Args:
+            filepath: The JSON file to load, the bundled rare-commodities.json if None
+            cache_path: The compiled cache of the JSON file to load instead, None to parse the JSON
+        """
+        self.commodities: Sequence[RareExport] = []
+        # The lookups by name, built the first time one is used
+        self._by_id: Optional[dict[str, RareExport]] = None
         self._by_symbol: dict[str, RareExport] = {}
         self._by_system: dict[str, list[RareExport]] = {}
+        self._pad_sizes: list[int] = []
+        self._stock: list[int] = []
+        self._tree: Optional[_KDTree] = _KDTree([])
+        self._array: Optional[_CoordinateArray] = None
 
         # Auto-load the rare-commodities.json file
-        json_file = Path(__file__).parent / "rare-commodities.json"
+        json_file = Path(filepath) if filepath is not None else RARES_FILE
         if json_file.exists():
-            self.load_from_file(json_file)
+            self.load_from_file(json_file, cache_path)
 
-    def load_from_file(self, filepath: str | Path) -> None:
+    def load_from_file(self, filepath: str | Path, cache_path: str | Path | None = None) -> None:
         """Load rare commodities from a JSON file.
 
         Args:
             filepath: Path to the rare-commodities.json file
+            cache_path: The compiled cache of the file, created or replaced if it is missing or out of date.
+                The commodities are then only decoded when they are used. None to parse the JSON.
         """
+        if cache_path is not None:
+            self.commodities = _CompiledCommodities(rarescache.load(cache_path, filepath))
+            self._build_indexes()
+            return
+
         with open(filepath, "r") as f:
             data = json.load(f)
 
@@ -122,17 +369,41 @@ class Rares:
 
     def _build_indexes(self) -> None:
         """Build internal indexes for quick lookups."""
-        self._by_id.clear()
-        self._by_symbol.clear()
-        self._by_system.clear()
-
+        self._by_id = None
+        if isinstance(self.commodities, _CompiledCommodities):
+            # Straight from the cache's arrays, without decoding the commodities
+            compiled = self.commodities.compiled
+            points, pad_sizes, stock = compiled.points(), compiled.pad_sizes(), compiled.stock()
+        else:
+            points = [(c.coordinates.x, c.coordinates.y, c.coordinates.z) for c in self.commodities]
+            # Unknown values are 0 so they never pass a filter
+            pad_sizes = [c.maxLandingPadSize or 0 for c in self.commodities]
+            stock = [c.count or 0 for c in self.commodities]
+        self._pad_sizes = pad_sizes
+        self._stock = stock
+
+        if self.numpy_enabled:
+            self._array = _CoordinateArray(points, pad_sizes, stock)
+            self._tree = None
+        else:
+            self._array = None
+            self._tree = _KDTree(points)
+
+    def _lookups(self) -> None:
+        """Build the lookups by id, symbol and system, which decodes every commodity, if not already built."""
+        if self._by_id is not None:
+            return
+        by_id: dict[str, RareExport] = {}
+        self._by_symbol = {}
+        self._by_system = {}
         for commodity in self.commodities:
-            self._by_id[commodity.id] = commodity
+            by_id[commodity.id] = commodity
             self._by_symbol[commodity.symbol] = commodity
 
             if commodity.system not in self._by_system:
                 self._by_system[commodity.system] = []
             self._by_system[commodity.system].append(commodity)
+        self._by_id = by_id
 
     def get_by_id(self, commodity_id: str) -> Optional[RareExport]:
         """Get a rare commodity by its ID.
@@ -143,6 +414,7 @@ class Rares:
         Returns:
             RareExport if found, None otherwise
         """
+        self._lookups()
         return self._by_id.get(commodity_id)
 
     def get_by_symbol(self, symbol: str) -> Optional[RareExport]:
@@ -154,6 +426,7 @@ class Rares:
         Returns:
             RareExport if found, None otherwise
         """
+        self._lookups()
         return self._by_symbol.get(symbol)
 
     def get_by_system(self, system: str) -> list[RareExport]:
@@ -165,6 +438,7 @@ class Rares:
         Returns:
             List of RareExport commodities in that system
         """
+        self._lookups()
         return self._by_system.get(system, [])
 
     def get_all(self) -> list[RareExport]:
@@ -173,7 +447,7 @@ class Rares:
         Returns:
             List of all RareExport commodities
         """
-        return self.commodities.copy()
+        return list(self.commodities)
 
     def get_nearest_to(self, x: float, y: float, z: float) -> list[RareExport]:
         """Get all rare commodities ordered by distance from a point.
@@ -186,14 +460,86 @@ class Rares:
         Returns:
             List of RareExport commodities sorted by distance (nearest first)
         """
-        def distance(commodity: RareExport) -> float:
-            """Calculate 3D Euclidean distance."""
-            dx = commodity.coordinates.x - x
-            dy = commodity.coordinates.y - y
-            dz = commodity.coordinates.z - z
-            return math.sqrt(dx * dx + dy * dy + dz * dz)
+        return [near.rare for near in self.nearest_k(x, y, z, len(self.commodities))]
 
-        return sorted(self.commodities, key=distance)
+    def nearest_k(self, x: float, y: float, z: float, k: int,
+                  min_pad_size: Optional[int] = None, min_stock: Optional[int] = None) -> list[NearbyRare]:
+        """Get the k rare commodities nearest to a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            z: Z coordinate
+            k: The number of commodities
+            min_pad_size: Only stations with at least this landing pad size (1 small, 2 medium, 3 large)
+            min_stock: Only commodities with at least this many in stock
+
+        Returns:
+            Up to k NearbyRare, nearest first
+        """
+        if self._array is not None:
+            return self.nearest_k_batch([(x, y, z)], k, min_pad_size, min_stock)[0]
+        found = self._tree.nearest((x, y, z), k, self._filter(min_pad_size, min_stock))
+        return [NearbyRare(self.commodities[index], math.sqrt(d2)) for d2, index in found]
+
+    def nearest_k_batch(self, points: Sequence[tuple[float, float, float]], k: int,
+                        min_pad_size: Optional[int] = None, min_stock: Optional[int] = None) -> list[list[NearbyRare]]:
+        """Get the k rare commodities nearest to each of a number of points, e.g. every system on a route.
+
+        With NumPy this is a single vectorised query for all the points.
+
+        Args:
+            points: The (x, y, z) query points
+            k: The number of commodities for each point
+            min_pad_size: Only stations with at least this landing pad size (1 small, 2 medium, 3 large)
+            min_stock: Only commodities with at least this many in stock
+
+        Returns:
+            For each point, up to k NearbyRare, nearest first
+        """
+        if self._array is None:
+            return [self.nearest_k(x, y, z, k, min_pad_size, min_stock) for x, y, z in points]
+        queries = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        indices, d2 = self._array.nearest(queries, k, self._array.candidates(min_pad_size, min_stock))
+        commodities = self.commodities
+        return [[NearbyRare(commodities[index], distance) for index, distance in zip(row, distances)]
+                for row, distances in zip(indices.tolist(), np.sqrt(d2).tolist())]
+
+    def within_radius(self, x: float, y: float, z: float, radius: float,
+                      min_pad_size: Optional[int] = None, min_stock: Optional[int] = None) -> list[NearbyRare]:
+        """Get the rare commodities within a distance of a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            z: Z coordinate
+            radius: The distance in light years
+            min_pad_size: Only stations with at least this landing pad size (1 small, 2 medium, 3 large)
+            min_stock: Only commodities with at least this many in stock
+
+        Returns:
+            NearbyRare commodities, nearest first
+        """
+        if self._array is not None:
+            indices, d2 = self._array.within(np.array((x, y, z), dtype=np.float64), radius,
+                                             self._array.candidates(min_pad_size, min_stock))
+            return [NearbyRare(self.commodities[index], distance) for index, distance in zip(indices.tolist(), np.sqrt(d2).tolist())]
+        found = self._tree.within((x, y, z), radius, self._filter(min_pad_size, min_stock))
+        return [NearbyRare(self.commodities[index], math.sqrt(d2)) for d2, index in found]
+
+    def _filter(self, min_pad_size: Optional[int], min_stock: Optional[int]) -> Callable[[int], bool]:
+        """Build the filter on commodity index for the optional query filters, unknown values never pass."""
+        if min_pad_size is None and min_stock is None:
+            return lambda index: True
+        pad_sizes, stock = self._pad_sizes, self._stock
+
+        def accept(index: int) -> bool:
+            if min_pad_size is not None and pad_sizes[index] < min_pad_size:
+                return False
+            if min_stock is not None and stock[index] < min_stock:
+                return False
+            return True
+        return accept
 
     def save_to_file(self, filepath: str | Path) -> None:
         """Save rare commodities to a JSON file.
@@ -216,3 +562,101 @@ class Rares:
     def __iter__(self):
         """Iterate over all commodities."""
         return iter(self.commodities)
+
+
+class RaresCatalogue:
+    """The Rares for a JSON file, shared by the whole plugin.
+
+    The file is loaded on a background thread the first time it is needed, so the Tk thread never parses
+    JSON, and loaded again only when its modification time changes. It is loaded from its compiled cache,
+    which is created the first time. A file that fails to load is not tried again until it changes.
+    """
+
+    def __init__(self, filepath: str | Path = RARES_FILE, cache_path: str | Path | None = None):
+        """Create the catalogue, nothing is loaded until it is used.
+
+        Args:
+            filepath: The rare-commodities.json file
+            cache_path: The compiled cache of the file, alongside it with a .cache suffix if None
+        """
+        self.filepath = Path(filepath)
+        self.cache_path = Path(cache_path) if cache_path is not None else self.filepath.with_suffix(".cache")
+        self._rares: Optional[Rares] = None
+        self._mtime: Optional[int] = None
+        # Why the file failed to load and its modification time then, None if the last load did not fail
+        self._error: Optional[str] = None
+        self._error_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self._loading: Optional[threading.Thread] = None
+
+    @property
+    def error(self) -> Optional[str]:
+        """Why the file as it is now failed to load, None if it has not failed."""
+        with self._lock:
+            error, error_mtime = self._error, self._error_mtime
+        return error if error is not None and error_mtime == self._file_mtime() else None
+
+    def preload(self) -> None:
+        """Start loading the file in the background, unless it is already loading or has failed to load."""
+        if self.error is not None:
+            return
+        with self._lock:
+            if self._loading is not None and self._loading.is_alive():
+                return
+            self._loading = threading.Thread(target=self._load, name="RaresCatalogue", daemon=True)
+            self._loading.start()
+
+    def current(self) -> Optional[Rares]:
+        """Get the loaded Rares without waiting.
+
+        Starts a load if nothing is loaded yet or the file has changed, in which case the previous Rares is
+        returned until the new one is ready.
+
+        Returns:
+            The Rares, None if the first load has not finished or failed, see error
+        """
+        with self._lock:
+            rares, mtime = self._rares, self._mtime
+        if rares is None or mtime != self._file_mtime():
+            self.preload()
+        return rares
+
+    def get(self) -> Optional[Rares]:
+        """Get the Rares for the file as it is now, waiting for it to be loaded if need be.
+
+        Returns:
+            The Rares, None if the file could not be loaded
+        """
+        self.current()
+        with self._lock:
+            loading = self._loading
+        if loading is not None:
+            loading.join()
+        with self._lock:
+            return self._rares
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.filepath).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        """Load the file, keeping the previous Rares if it cannot be."""
+        mtime = self._file_mtime()
+        try:
+            rares = Rares(self.filepath, self.cache_path)
+        except (OSError, ValueError, KeyError) as ex:
+            logger.error(f"Failed to load {self.filepath}: {ex}")
+            with self._lock:
+                self._error = str(ex) or type(ex).__name__
+                self._error_mtime = mtime
+            return
+        with self._lock:
+            self._rares = rares
+            self._mtime = mtime
+            self._error = None
+
+
+# The bundled rare commodities, for the lifetime of the plugin
+catalogue = RaresCatalogue()
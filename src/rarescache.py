@@ -0,0 +1,186 @@
+"""Compiled cache of the rare commodities JSON file.
+
+Parsing rare-commodities.json and building a RareExport per item is the slowest part of opening the rares
+window from cold. The cache holds the same data in a form that is loaded with a single read and no parsing:
+a header, the coordinates as fixed records of float64, the stock and landing pad sizes as int32, and the
+strings as one UTF-8 table with an offset array, so only the rows that are displayed are ever decoded.
+
+The cache is regenerated from the JSON whenever the JSON's size and modification time are not the ones it
+was compiled from and its SHA-256 is not either, e.g. after an update of the plugin. When only the size and
+modification time differ, just the header is rewritten with the new ones. The file is read rather
+than memory mapped so Windows never holds it locked while it is being replaced.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
+from pluginlogger import logger
+
+# The string fields of each commodity, in table order
+STRING_FIELDS = ("id", "symbol", "market_id", "category", "name", "system", "stationName")
+# The fields RareExport.from_dict requires
+_REQUIRED = frozenset({"id", "symbol", "market_id", "category", "name"})
+
+_MAGIC = b"PPPRARE1"
+# magic, byte order, commodity count, JSON mtime_ns, JSON size, JSON SHA-256, string table size
+_header = struct.Struct("<8s1s3xIqq32sI")
+# A missing count, landing pad size or station name
+_MISSING = -1
+
+
+class CompiledRares:
+    """The rare commodities of a cache file, with the strings decoded on demand."""
+
+    def __init__(self, buffer: bytes):
+        """Split the cache file into its arrays.
+
+        Args:
+            buffer: The whole cache file
+
+        Raises:
+            ValueError: If it is not a cache file for this machine, or is truncated
+        """
+        magic, byteorder, count, self.mtime_ns, self.size, self.digest, strings_size = _header.unpack_from(buffer)
+        if magic != _MAGIC or byteorder != sys.byteorder[:1].encode("ascii"):
+            raise ValueError("Not a rare commodities cache")
+        self.count = count
+        position = _header.size
+        self.coordinates = array("d")
+        position = self._read(self.coordinates, buffer, position, 3 * count)
+        # count, maxLandingPadSize and whether there is a station name, for each commodity
+        self.numbers = array("i")
+        position = self._read(self.numbers, buffer, position, 3 * count)
+        self.offsets = array("I")
+        position = self._read(self.offsets, buffer, position, len(STRING_FIELDS) * count + 1)
+        if len(buffer) != position + strings_size:
+            raise ValueError("Truncated rare commodities cache")
+        self.strings = memoryview(buffer)[position:]
+
+    @staticmethod
+    def _read(values: array, buffer: bytes, position: int, length: int) -> int:
+        """Fill an array from the buffer, returning the position after it."""
+        end = position + length * values.itemsize
+        if end > len(buffer):
+            raise ValueError("Truncated rare commodities cache")
+        values.frombytes(buffer[position:end])
+        return end
+
+    def points(self) -> list[tuple[float, float, float]]:
+        """Get the (x, y, z) of every commodity."""
+        values = iter(self.coordinates)
+        return list(zip(values, values, values))
+
+    def stock(self) -> list[int]:
+        """Get the count in stock of every commodity, 0 if it is not known."""
+        return [max(count, 0) for count in self.numbers[0::3]]
+
+    def pad_sizes(self) -> list[int]:
+        """Get the landing pad size of every commodity, 0 if it is not known."""
+        return [max(pad, 0) for pad in self.numbers[1::3]]
+
+    def row(self, index: int) -> dict:
+        """Decode one commodity, in the form of an item of the JSON file."""
+        fields = len(STRING_FIELDS)
+        offsets = self.offsets[index * fields:(index + 1) * fields + 1]
+        data = {field: str(self.strings[offsets[n]:offsets[n + 1]], "utf-8") for n, field in enumerate(STRING_FIELDS)}
+        count, pad, station = self.numbers[index * 3:index * 3 + 3]
+        data["count"] = None if count == _MISSING else count
+        data["maxLandingPadSize"] = None if pad == _MISSING else pad
+        if station == _MISSING:
+            data["stationName"] = None
+        x, y, z = self.coordinates[index * 3:index * 3 + 3]
+        data["coordinates"] = {"x": x, "y": y, "z": z}
+        return data
+
+
+def compile_rares(data: list[dict], mtime_ns: int, size: int, digest: bytes) -> bytes:
+    """Compile the items of the JSON file to a cache file.
+
+    Args:
+        data: The items of the JSON file
+        mtime_ns: The modification time of the JSON file
+        size: The size of the JSON file
+        digest: The SHA-256 of the JSON file
+
+    Returns:
+        The cache file
+    """
+    coordinates = array("d")
+    numbers = array("i")
+    offsets = array("I", [0])
+    strings = bytearray()
+    for item in data:
+        position = item.get("coordinates", {"x": 0, "y": 0, "z": 0})
+        coordinates.extend((position["x"], position["y"], position["z"]))
+        count, pad = item.get("count"), item.get("maxLandingPadSize")
+        numbers.extend((_MISSING if count is None else count,
+                        _MISSING if pad is None else pad,
+                        _MISSING if item.get("stationName") is None else 1))
+        for field in STRING_FIELDS:
+            value = item[field] if field in _REQUIRED else item.get(field)
+            strings += (value or "").encode("utf-8")
+            offsets.append(len(strings))
+    header = _header.pack(_MAGIC, sys.byteorder[:1].encode("ascii"), len(data), mtime_ns, size, digest, len(strings))
+    return b"".join((header, coordinates.tobytes(), numbers.tobytes(), offsets.tobytes(), strings))
+
+
+def _restamp(cache_path: str | Path, compiled: CompiledRares, stat: os.stat_result) -> None:
+    """Record the JSON file's new size and modification time in the cache header, so it is not hashed again."""
+    compiled.mtime_ns, compiled.size = stat.st_mtime_ns, stat.st_size
+    header = _header.pack(_MAGIC, sys.byteorder[:1].encode("ascii"), compiled.count, compiled.mtime_ns, compiled.size,
+                          compiled.digest, len(compiled.strings))
+    try:
+        with open(cache_path, "r+b") as f:
+            f.write(header)
+    except OSError as ex:
+        # Still current, it is only hashed again next time
+        logger.error(f"Failed to update {cache_path}: {ex}")
+
+
+def load(cache_path: str | Path, json_path: str | Path) -> CompiledRares:
+    """Load the compiled rare commodities, compiling the JSON file again if the cache is missing or stale.
+
+    Args:
+        cache_path: The cache file
+        json_path: The rare-commodities.json file it is compiled from
+
+    Returns:
+        The compiled rare commodities
+
+    Raises:
+        OSError: If the JSON file cannot be read
+        ValueError: If the JSON file cannot be parsed
+        KeyError: If the JSON file is missing a required field
+    """
+    stat = os.stat(json_path)
+    source: Optional[bytes] = None
+    try:
+        compiled = CompiledRares(Path(cache_path).read_bytes())
+        if (compiled.mtime_ns, compiled.size) == (stat.st_mtime_ns, stat.st_size):
+            return compiled
+        # e.g. the plugin reinstalled with the same data, only the header needs to be brought up to date
+        source = Path(json_path).read_bytes()
+        if compiled.digest == hashlib.sha256(source).digest():
+            _restamp(cache_path, compiled, stat)
+            return compiled
+    except (OSError, ValueError, struct.error):
+        pass
+
+    if source is None:
+        source = Path(json_path).read_bytes()
+    buffer = compile_rares(json.loads(source), stat.st_mtime_ns, stat.st_size, hashlib.sha256(source).digest())
+    temporary = Path(f"{cache_path}.tmp")
+    try:
+        temporary.write_bytes(buffer)
+        os.replace(temporary, cache_path)
+    except OSError as ex:
+        # e.g. a read only plugins folder, the compiled data can still be used this time
+        logger.error(f"Failed to write {cache_path}: {ex}")
+    return CompiledRares(buffer)
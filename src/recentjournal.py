@@ -33,6 +33,25 @@ Upload data	                    (Ody) Upload powerplay malware
 """
 
 import re
+from collections import deque
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Optional
+from activityrules import (ActivityRule, ActivityRules, Classification, event_code, field_at_least, field_at_most, field_equals,
+                           field_false, field_in, field_matches, sale_markup_at_least)
+
+class JournalRecord:
+    """
+    A journal entry in the RecentJournal, with its event name normalised once when it is added.
+    """
+    __slots__ = ("entry", "name", "event", "code", "seq")
+
+    def __init__(self, entry: dict, name: str, event: str, code: int, seq: int) -> None:
+        self.entry = entry  # The journal entry as written by the game
+        self.name = name    # The event name as written, e.g. "MarketSell"
+        self.event = event  # The lower case event name, e.g. "marketsell"
+        self.code = code    # Interned number for the event name, see RecentJournal.event_code
+        self.seq = seq      # Number of entries added before this one
 
 class RecentJournal:
 
@@ -66,15 +85,89 @@ class RecentJournal:
     wake_scan_materials_names = {"disruptedwakeechoes", "wakesolutions", "fsdtelemetry", "hyperspacetrajectories", "dataminedwake"}
 
     donation_missions = r"^Mission_Altruism.*$"
+    _donation_missions = re.compile(donation_missions)
+
+    #These are the only journal entries the classifiers look at, everything else is rejected before it reaches the log.
+    #The location/docking/mission events are kept so they still break up the patterns the classifiers match on.
+    classifier_events = frozenset({
+        # Merits and the activities that earn them
+        "PowerplayMerits", "ShipTargeted", "MaterialCollected", "Bounty", "PowerplayDeliver", "MissionCompleted", "DataScanned",
+        "HoloscreenHacked", "MarketSell", "SearchAndRescue", "SellExplorationData", "MultiSellExplorationData", "SellOrganicData",
+        "CommitCrime",
+        # On foot state
+        "SupercruiseEntry", "Disembark", "Embark",
+        # Boundaries between activities
+        "FSDJump", "Location", "CarrierJump", "Docked", "Undocked", "Died", "Resurrect", "SupercruiseExit", "Touchdown", "Liftoff",
+        "MissionAccepted", "MissionAbandoned", "MissionFailed", "MarketBuy"})
+
+    #The activities returned by classify, in the order they are tested
+    BOUNTY = "bounty"
+    RIVAL_POWER_KILLS = "rival_power_kills"
+    SCAN = "scan"
+    POWERPLAY_DELIVERY = "powerplay_delivery"
+    DONATION_MISSION = "donation_mission"
+    SCAN_DATA_LINKS = "scan_data_links"
+    HOLOSCREEN_HACK = "holoscreen_hack"
+    RARE_GOODS = "rare_goods"
+    SALVAGE = "salvage"
+    CARTOGRAPHY = "cartography"
+    HIGH_VALUE_COMMODITIES = "high_value_commodities"
+    LOW_VALUE_COMMODITIES = "low_value_commodities"
+    EXOBIOLOGY = "exobiology"
+    MINED = "mined"
+    ON_FOOT = "on_foot"
+    COMMIT_CRIMES = "commit_crimes"
+    UNKNOWN = "unknown"
 
     HISTORY_DEPTH: int = 20 #increased to 20 from 10 for the multiple cartography merits
+    EVIDENCE_WINDOW: int = 60 #seconds, entries older than this before the merits are not evidence for them
+
+    #How merits are attributed to activities, the first rule that matches wins.
+    #Position 0 is the PowerplayMerits entry, the activity is usually the entry before it or the one before that.
+    #Some rules have always accepted position 1 without checking position 0, they are kept that way (unchecked).
+    activity_rules = ActivityRules([
+        #Bounties then rival kills need to be before scan as they could be a scan related to the bounty
+        #Skip ship targeting and a single additional powerplaymerits event, a second might be a weekly mission completion
+        ActivityRule(BOUNTY, "Bounty", positions=tuple(range(1, HISTORY_DEPTH)), min_records=2,
+                     skip=frozenset({"ShipTargeted"}), skip_once=frozenset({"PowerplayMerits"})),
+        ActivityRule(RIVAL_POWER_KILLS, "ShipTargeted", (field_false("TargetLocked"),), min_records=2),
+        ActivityRule(SCAN, "ShipTargeted", (field_at_least("ScanStage", 2),), min_records=2, merits_where=(field_at_most("MeritsGained", 40),)),
+        ActivityRule(SCAN, "MaterialCollected", (field_in("Name", wake_scan_materials_names),), unchecked=(1,)),
+        ActivityRule(POWERPLAY_DELIVERY, "PowerplayDeliver"),
+        #Donations missions are a bit tricky as they can be completed after the merits are awarded, see isDonationMissionMeritsSecond
+        ActivityRule(DONATION_MISSION, "MissionCompleted", (field_matches("Name", _donation_missions),), positions=(1,), min_records=2),
+        ActivityRule(SCAN_DATA_LINKS, "DataScanned", (field_equals("Type", "$Datascan_ShipUplink;"),)),
+        ActivityRule(HOLOSCREEN_HACK, "HoloscreenHacked"),
+        ActivityRule(RARE_GOODS, "MarketSell", (field_in("Type", rare_goods),), unchecked=(1,)),
+        ActivityRule(SALVAGE, "SearchAndRescue", (field_in("Name", salvage_types),), unchecked=(1,)),
+        #MultiSellExplorationData handled separately, see get_multiple_cartography
+        ActivityRule(CARTOGRAPHY, "SellExplorationData", unchecked=(1,)),
+        ActivityRule(HIGH_VALUE_COMMODITIES, "MarketSell", (sale_markup_at_least(1.4),), unchecked=(1,)),
+        ActivityRule(LOW_VALUE_COMMODITIES, "MarketSell", (field_at_most("SellPrice", 500),), positions=(1,)),
+        ActivityRule(EXOBIOLOGY, "SellOrganicData"),
+        ActivityRule(MINED, "MarketSell", (field_equals("AvgPricePaid", 0, 0),), mined=True),
+        ActivityRule(ON_FOOT, None, state=attrgetter("isOnFoot")),
+        ActivityRule(COMMIT_CRIMES, "CommitCrime"),
+    ], UNKNOWN)
+
+    #The interned code for a lower case event name, see JournalRecord.code
+    event_code = staticmethod(event_code)
 
     def __init__(self) -> None:
-        self.__journal_entries_log: list = []
+        # Ring buffer of the last HISTORY_DEPTH records, written from the end backwards. Each record is written
+        # twice, HISTORY_DEPTH apart, so the records from most to least recent are always __ring[__pos:__pos + __count]
+        self.__ring: list = [None] * (2 * self.HISTORY_DEPTH)
+        self.__pos: int = self.HISTORY_DEPTH
+        self.__count: int = 0
+        self.__added: int = 0
+        self.__view: Optional[list] = None
+        # The records still in the ring for each event code, oldest first
+        self.__by_code: dict[int, deque] = {}
         self.__on_foot: bool = False
 
     def add_entry(self, entry: dict) -> bool:
-        event_type = entry.get("event", "").lower()
+        name = entry.get("event", "")
+        event_type = name.lower()
 
         # On foot state handling
         if event_type == "supercruiseentry":
@@ -84,300 +177,206 @@ class RecentJournal:
         if event_type == "embark":
             self.__on_foot = False
 
-        # Skip duplicate powerplaymerits with same TotalMerits as last one,
-        # and remove the matching entry from the log if found
-        if event_type == "powerplaymerits":
-            for i, prev_entry in enumerate(self.__journal_entries_log):
-                if prev_entry.get("event", "").lower() == "powerplaymerits":
-                    if entry.get("TotalMerits") == prev_entry.get("TotalMerits"):
-                        # Remove the matching entry from the log
-                        #del self.__journal_entries_log[i]
-                        return False # Skip this entry
-                    break  # Only compare with the most recent previous powerplaymerits
-
-        if event_type not in self.noise:
-            self.__journal_entries_log.insert(0, entry)
-        else:
+        code = event_code(event_type)
+        same_type = self.__by_code.get(code)
+
+        # Skip duplicate powerplaymerits with same TotalMerits as the most recent one still in the log
+        if event_type == "powerplaymerits" and same_type and entry.get("TotalMerits") == same_type[-1].entry.get("TotalMerits"):
+            return False # Skip this entry
+
+        if event_type in self.noise:
             return False
+
+        record = JournalRecord(entry, name, event_type, code, self.__added)
+        self.__added += 1
+        pos = self.__pos - 1 if self.__pos > 0 else self.HISTORY_DEPTH - 1
         # Keep only the last HISTORY_DEPTH entries
-        if len(self.__journal_entries_log) > self.HISTORY_DEPTH:
-            self.__journal_entries_log.pop()
+        if self.__count < self.HISTORY_DEPTH:
+            self.__count += 1
+        else:
+            evicted = self.__ring[pos]
+            self.__by_code[evicted.code].popleft()
+        self.__ring[pos] = self.__ring[pos + self.HISTORY_DEPTH] = record
+        self.__pos = pos
+        self.__view = None
+        if same_type is None:
+            same_type = self.__by_code[code] = deque()
+        same_type.append(record)
         return True
 
+    def __len__(self) -> int:
+        return self.__count
+
+    def __newest_first(self) -> list:
+        """
+        The records from most to least recent, shared by the classifiers until the next entry is added.
+        """
+        view = self.__view
+        if view is None:
+            view = self.__view = self.__ring[self.__pos:self.__pos + self.__count]
+        return view
+
+    def records(self, start: int = 0) -> list:
+        """
+        The records from most to least recent, skipping the first start records.
+        """
+        return self.__ring[self.__pos + start:self.__pos + self.__count]
+
+    def position(self, record: JournalRecord) -> int:
+        """
+        How far back a record is, 0 for the most recent.
+        """
+        return self.__added - 1 - record.seq
+
+    def last_position(self, event: str) -> Optional[int]:
+        """
+        How far back the most recent entry of an event type is, None if there is none in the log.
+        e.g. last_position("MultiSellExplorationData")
+        """
+        same_type = self.__by_code.get(event_code(event.lower()))
+        return self.position(same_type[-1]) if same_type else None
+
+    @staticmethod
+    def __cutoff(newest: JournalRecord, seconds: Optional[int]) -> Optional[str]:
+        """
+        The journal timestamp seconds before a record's, None for no limit. Journal timestamps are ISO 8601
+        UTC to the second, so they are compared as strings.
+        """
+        if seconds is None:
+            return None
+        timestamp = newest.entry.get("timestamp")
+        if not timestamp:
+            return None
+        try:
+            start = int(timestamp[11:13]) * 3600 + int(timestamp[14:16]) * 60 + int(timestamp[17:19]) - seconds
+            if start >= 0:
+                # Same day, the usual case, avoids building a datetime for every PowerplayMerits entry
+                return f"{timestamp[:11]}{start // 3600:02d}:{start // 60 % 60:02d}:{start % 60:02d}Z"
+            day = datetime(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10])) + timedelta(seconds=start)
+        except (TypeError, ValueError):
+            return None
+        return day.isoformat() + "Z"
+
+    @staticmethod
+    def __in_window(record: JournalRecord, cutoff: Optional[str]) -> bool:
+        # Entries without a timestamp (e.g. in tests) are always in the window
+        if cutoff is None:
+            return True
+        timestamp = record.entry.get("timestamp")
+        return not timestamp or timestamp >= cutoff
+
+    def __evidence(self) -> list:
+        """
+        The records from most to least recent, stopping at the first one more than EVIDENCE_WINDOW seconds
+        older than the most recent.
+        """
+        log = self.__newest_first()
+        if not log:
+            return log
+        cutoff = self.__cutoff(log[0], self.EVIDENCE_WINDOW)
+        if cutoff is None:
+            return log
+        for position in range(1, len(log)):
+            if not self.__in_window(log[position], cutoff):
+                return log[:position]
+        return log
+
+    def classify(self) -> Classification:
+        """
+        Work out the activity the most recent PowerplayMerits entry was earned by, see activity_rules.
+        Only the entries within EVIDENCE_WINDOW seconds of the merits are considered.
+        """
+        return self.activity_rules.classify(self.__evidence(), self)
+
     # On foot entries are not recorded in the journal currently so the best we can do is group them together
     @property
     def isOnFoot(self) -> bool:
         #logger.debug(f"IsOnFoot: {self.__on_foot}")
         return self.__on_foot
 
-    @property
-    def isScan(self) -> bool:
-        return self.isShipScan or self.isWakeScan
-    
-    @property
-    def isShipScan(self) -> bool:
-        #{ "timestamp":"2025-05-30T20:02:05Z", "event":"ShipTargeted", "TargetLocked":true, "Ship":"viper_mkiv", "Ship_Localised":"Viper Mk IV", "ScanStage":3, "PilotName":"$npc_name_decorate:#name=Lehikko;", "PilotName_Localised":"Lehikko", "PilotRank":"Competent", "ShieldHealth":100.000000, "HullHealth":100.000000, "Faction":"Li Yong-Rui", "LegalStatus":"Clean", "Power":"Li Yong-Rui" }
-        try:
-            #logger.debug(f"iscan recent journal entries: {self.__journal_entries_log}")
-            return (((self.__journal_entries_log[1].get("event", "").lower() == "shiptargeted" and self.__journal_entries_log[1].get("ScanStage", 0) >= 2)
-                or (self.__journal_entries_log[2].get("event", "").lower() == "shiptargeted" and self.__journal_entries_log[2].get("ScanStage", 0) >= 2))
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"
-                and int(self.__journal_entries_log[0].get("MeritsGained", 0)) <= 40)
-        except IndexError as e:
-            return False
-    
-    @property
-    def isWakeScan(self) -> bool:
-        #logger.debug(f"isWakeScan recent journal entries: {self.__journal_entries_log}")
-        #{"timestamp":"2025-05-17T10:06:26Z","event":"MaterialCollected","Category":"Encoded","Name":"disruptedwakeechoes","Name_Localised":"Atypical Disrupted Wake Echoes","Count":3}
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "MaterialCollected" and self.__journal_entries_log[1].get("Name", "") in self.wake_scan_materials_names)
-                        or (self.__journal_entries_log[2].get("event", "") == "MaterialCollected" and self.__journal_entries_log[2].get("Name", "") in self.wake_scan_materials_names)
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"))
-        except IndexError as e:
-            return False
-    
-    @property
-    def isRivalPowerKills(self) -> bool:
-        try:
-            #{ "timestamp":"2025-05-30T20:02:33Z", "event":"ShipTargeted", "TargetLocked":false }
-            return (((self.__journal_entries_log[1].get("event", "").lower() == "shiptargeted" and not bool(self.__journal_entries_log[1].get("TargetLocked","true")))
-                     or (self.__journal_entries_log[2].get("event", "").lower() == "shiptargeted" and not bool(self.__journal_entries_log[2].get("TargetLocked","true"))))
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
+    def _rule(activity: str, event: Optional[str] = None) -> property:
+        """
+        A property that is true when a rule of activity_rules for the activity matches the recent journal,
+        within EVIDENCE_WINDOW seconds of the most recent entry as for classify.
+        """
+        return property(lambda self: self.activity_rules.matches(self.__evidence(), self, activity, event))
 
-    @property
-    def isBounty(self) -> bool:
-        #logger.debug(f"isbounty recent journal entries: {self.__journal_entries_log}")
-        try:
-            if len(self.__journal_entries_log) < 2:
-                return False
-            # First entry must be powerplaymerits
-            if self.__journal_entries_log[0].get("event", "").lower() != "powerplaymerits":
-                return False
-            # Allow skipping a single additional powerplaymerits event after the first, a second might be a weekly mission completion
-            # also skip shiptargeted events
-            skipped_merits = False
-            for entry in self.__journal_entries_log[1:]:
-                event = entry.get("event", "").lower()
-                if event == "shiptargeted":
-                    continue
-                if event == "powerplaymerits" and not skipped_merits:
-                    skipped_merits = True
-                    continue
-                if event == "bounty":
-                    return True
-                # If we hit any other event before bounty, stop searching
-                break
-            return False
-        except IndexError:
-            return False
+    isScan = _rule(SCAN)
+    isWakeScan = _rule(SCAN, "MaterialCollected")
+    isRivalPowerKills = _rule(RIVAL_POWER_KILLS)
+    isBounty = _rule(BOUNTY)
+    isPowerPlayDelivery = _rule(POWERPLAY_DELIVERY)
+    isDonationMissionMeritsFirst = _rule(DONATION_MISSION)
+    isMined = _rule(MINED)
+    isCommitCrimes = _rule(COMMIT_CRIMES)
+    del _rule
 
-    @property
-    def isPowerPlayDelivery(self) -> bool:
-        #logger.debug(f"isPowerPlayDelivery recent journal entries: {self.__journal_entries_log}")
-        try:
-            if len(self.__journal_entries_log) < 3:
-                return False
-            else:
-                return ((self.__journal_entries_log[1].get("event", "").lower() == "powerplaydeliver" 
-                        or self.__journal_entries_log[2].get("event", "").lower() == "powerplaydeliver")
-                        and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-    
     #Donation missions are usually retrospective and are not recorded in the journal until the mission is completed.
+    #Not an activity rule, the merits are attributed when the mission completed entry arrives after them.
     @property
     def isDonationMissionMeritsSecond(self) -> bool:
-
+        log = self.__newest_first()
         try:
-            if len(self.__journal_entries_log) < 2:
+            if self.__count < 2:
                 return False
             else:
                 #Depending on server load powerplay merits events can come before mission completed or vice versa
-                return (self.__journal_entries_log[0].get("event", "").lower() == "missioncompleted" 
-                        and re.match(self.donation_missions, self.__journal_entries_log[0].get("Name", ""))
-                        and self.__journal_entries_log[1].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-                   
-    @property
-    def isDonationMissionMeritsFirst(self) -> bool:
-        try:
-            if len(self.__journal_entries_log) < 2:
-                return False
-            else:
-                return (self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"
-                            and self.__journal_entries_log[1].get("event", "").lower() == "missioncompleted"
-                            and re.match(self.donation_missions, self.__journal_entries_log[1].get("Name", "")))
-        except IndexError as e:
-            return False
-
-    @property
-    def isScanDataLinks(self) -> bool:
-        #logger.debug(f"isScanDataLinks recent journal entries: {self.__journal_entries_log}")
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "DataScanned" and self.__journal_entries_log[1].get("Type", "") == "$Datascan_ShipUplink;")
-                        or (self.__journal_entries_log[2].get("event", "") == "DataScanned" and self.__journal_entries_log[2].get("Type", "") == "$Datascan_ShipUplink;"))
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-        
-    @property
-    def isHoloscreenHack(self) -> bool:
-        #logger.debug(f"isHoloscreenHack recent journal entries: {self.__journal_entries_log}")
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "HoloscreenHacked"
-                        or self.__journal_entries_log[2].get("event", "") == "HoloscreenHacked")
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"))
+                return (log[0].event == "missioncompleted" 
+                        and self._donation_missions.match(log[0].entry.get("Name", "")) is not None
+                        and log[1].event == "powerplaymerits")
         except IndexError as e:
             return False
 
-    @property
-    def isRareGoods(self) -> bool:
-        #logger.debug(f"isRareGoods recent journal entries: {self.__journal_entries_log}")
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("Type", "") in self.rare_goods)
-                        or (self.__journal_entries_log[2].get("event", "") == "MarketSell" and self.__journal_entries_log[2].get("Type", "") in self.rare_goods)
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"))
-        except IndexError as e:
-            return False
-        
-    @property
-    def isSalvage(self) -> bool:
-        #logger.debug(f"isSalvage recent journal entries: {self.__journal_entries_log}")
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "SearchAndRescue" and self.__journal_entries_log[1].get("Name", "") in self.salvage_types)
-                        or (self.__journal_entries_log[2].get("event", "") == "SearchAndRescue" and self.__journal_entries_log[2].get("Name", "") in self.salvage_types)
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"))
-        except IndexError as e:
-            return False
-        
-    @property
-    def isSingleCartography(self) -> bool:
-        #logger.debug(f"isCartography recent journal entries: {self.__journal_entries_log}")
-        #or self.__journal_entries_log[1].get("event", "") == "MultiSellExplorationData"
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                    ((self.__journal_entries_log[1].get("event", "") == "SellExplorationData")
-                    or (self.__journal_entries_log[2].get("event", "") == "SellExplorationData")
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits"))
-        except IndexError as e:
-            return False
-        
-    @property
-    def isHighValueCommditySale(self) -> bool:
-        #logger.debug(f"isHighValueCommditySale recent journal entries: {self.__journal_entries_log}")
-        try:
-            return (len(self.__journal_entries_log) > 2 and 
-                (self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("AvgPricePaid", 0) > 0 and ((self.__journal_entries_log[1].get("SellPrice", 1) / self.__journal_entries_log[1].get("AvgPricePaid", 1)) >= 1.4)
-                 or (self.__journal_entries_log[2].get("event", "") == "MarketSell" and self.__journal_entries_log[2].get("AvgPricePaid", 0) > 0 and ((self.__journal_entries_log[2].get("SellPrice", 1) / self.__journal_entries_log[2].get("AvgPricePaid", 1)) >= 1.4)
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")))
-        except IndexError as e:
-            return False
-        
-    @property
-    def isLowValueCommditySale(self) -> bool:
-        #logger.debug(f"isLowValueCommditySale recent journal entries: {self.__journal_entries_log}")
-        try: 
-            return (len(self.__journal_entries_log) > 2 and 
-                self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("SellPrice", 0) <= 500
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-        
-    @property
-    def isExobiology(self) -> bool:
-        #logger.debug(f"isExobiology recent journal entries: {self.__journal_entries_log}")
-        try: 
-            return (len(self.__journal_entries_log) > 2 and 
-                (self.__journal_entries_log[1].get("event", "") == "SellOrganicData"
-                 or self.__journal_entries_log[2].get("event", "") == "SellOrganicData")
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-        
-    @property
-    def isMined(self) -> bool:
-        #logger.debug(f"isMined recent journal entries: {self.__journal_entries_log}")
-        try: 
-            return (len(self.__journal_entries_log) > 2 and
-                ((self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("AvgPricePaid", 0) == 0)
-                 or (self.__journal_entries_log[2].get("event", "") == "MarketSell" and self.__journal_entries_log[2].get("AvgPricePaid", 0) == 0))
-                and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-        
-    @property
-    def isCommitCrimes(self) -> bool:
-        #logger.debug(f"isCommitCrimes recent journal entries: {self.__journal_entries_log}")
-        #{"timestamp":"2025-05-18T10:02:47Z","event":"PowerplayMerits","Power":"Jerome Archer","MeritsGained":268,"TotalMerits":1205795}
-        #{"timestamp":"2025-05-18T10:02:47Z","event":"CommitCrime","CrimeType":"murder","Faction":"Inara Nexus","Victim":"Mike McClay","Bounty":5000}       
-        try: 
-            return (len(self.__journal_entries_log) > 2 
-                    and (self.__journal_entries_log[1].get("event", "") == "CommitCrime" or self.__journal_entries_log[2].get("event", "") == "CommitCrime")
-                    and self.__journal_entries_log[0].get("event", "").lower() == "powerplaymerits")
-        except IndexError as e:
-            return False
-        
     @property
     def entries(self) -> list:
-        #logger.debug(f"entries: {self.__journal_entries_log}")
-        return self.__journal_entries_log
+        """
+        The journal entries, most recent first.
+        """
+        return [record.entry for record in self.records()]
     
     def get_mined_commodity(self) -> str:
-        #logger.debug(f"get_mind_commodity recent journal entries: {self.__journal_entries_log}")
-        if len(self.__journal_entries_log) > 2:
-            if self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("AvgPricePaid", 0) == 0:
-                return self.__journal_entries_log[1].get("Type", "")
-            elif self.__journal_entries_log[2].get("event", "") == "MarketSell" and self.__journal_entries_log[2].get("AvgPricePaid", 0) == 0:
-                return self.__journal_entries_log[2].get("Type", "")
+        log = self.__newest_first()
+        #logger.debug(f"get_mind_commodity recent journal entries: {self.entries}")
+        if self.__count > 2:
+            if log[1].name == "MarketSell" and log[1].entry.get("AvgPricePaid", 0) == 0:
+                return log[1].entry.get("Type", "")
+            elif log[2].name == "MarketSell" and log[2].entry.get("AvgPricePaid", 0) == 0:
+                return log[2].entry.get("Type", "")
         return ""
 
     def get_mined_tonnage(self) -> int:
-        #logger.debug(f"get_mind_commodity recent journal entries: {self.__journal_entries_log}")
-        if len(self.__journal_entries_log) > 2:
-            if self.__journal_entries_log[1].get("event", "") == "MarketSell" and self.__journal_entries_log[1].get("AvgPricePaid", 0) == 0:
-                return self.__journal_entries_log[1].get("Count", 0)
-            elif self.__journal_entries_log[2].get("event", "") == "MarketSell" and self.__journal_entries_log[2].get("AvgPricePaid", 0) == 0:
-                return self.__journal_entries_log[2].get("Count", 0)
+        log = self.__newest_first()
+        #logger.debug(f"get_mind_commodity recent journal entries: {self.entries}")
+        if self.__count > 2:
+            if log[1].name == "MarketSell" and log[1].entry.get("AvgPricePaid", 0) == 0:
+                return log[1].entry.get("Count", 0)
+            elif log[2].name == "MarketSell" and log[2].entry.get("AvgPricePaid", 0) == 0:
+                return log[2].entry.get("Count", 0)
         return 0
 
     def get_multiple_cartography(self) -> int:
-        #logger.debug(f"get_multiple_cartography recent journal entries: {self.__journal_entries_log}")
+        #logger.debug(f"get_multiple_cartography recent journal entries: {self.entries}")
         return self._get_multi_entries_merits("MultiSellExplorationData")
     
     def _get_multi_entries_merits(self, target_event: str) -> int:
-        multiple_target_event = False
-        for entry in self.__journal_entries_log:
-            if entry.get("event", "").lower() == target_event.lower():
-                multiple_target_event = True
-                break
-
-        if multiple_target_event:
+        target_event = target_event.lower()
+        if self.last_position(target_event) is not None:
             """
-            Loops through the __journal_entries_log and totals the MeritsGained for consecutive
+            Loops through the journal records and totals the MeritsGained for consecutive
             'powerplaymerits' events. Skips initial non-'powerplaymerits' events and stops when
             encountering any other event except 'target_event'.
             """
             total_merits = 0
             counting = False  # Flag to start counting once a 'powerplaymerits' event is found
             target_event_found = False  # Flag to check if target_event is found
-            log_entry = None
 
-            for log_entry in self.__journal_entries_log:
-                event = log_entry.get("event", "").lower()
+            for record in self.records():
+                event = record.event
 
                 if event == "powerplaymerits":
                     counting = True  # Start counting once a 'powerplaymerits' event is found
-                    total_merits += log_entry.get("MeritsGained", 0)
-                elif event == target_event.lower():
+                    total_merits += record.entry.get("MeritsGained", 0)
+                elif event == target_event:
                     #if counting:
                     target_event_found = True
                     continue  # Allow 'target_event' while counting
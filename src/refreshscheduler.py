@@ -0,0 +1,82 @@
+"""
+Coalesced display refresh.
+
+A turn in can write dozens of journal entries within a few milliseconds. Rather than re-rendering the
+panel for each one, entries mark the display dirty and the render is run from the Tk event loop at most
+once per interval.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+from consts import refresh_interval_ms
+
+
+class RefreshScheduler:
+    """
+    Debounces calls to a render function using the after/after_idle timers of a Tk widget.
+    """
+
+    def __init__(self, render: Callable[[], None], interval_ms: int = refresh_interval_ms,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        :param render: The function that updates the display
+        :param interval_ms: The minimum time between renders
+        :param clock: Time source in seconds, for testing
+        """
+        self.render = render
+        self.interval_ms = interval_ms
+        self.clock = clock
+        self.widget: Any = None
+        self.dirty = False
+        self._pending: Optional[str] = None
+        self._last_render: Optional[float] = None
+
+    def attach(self, widget: Any) -> None:
+        """
+        Set the widget whose event loop runs the renders, normally the plugin frame.
+        """
+        self.cancel()
+        self.widget = widget
+
+    def request(self) -> None:
+        """
+        Mark the display as needing a refresh and schedule a render if one is not already pending.
+        """
+        self.dirty = True
+        if self._pending is not None:
+            return
+        if self.widget is None:
+            # No event loop to defer to
+            self._run()
+            return
+        wait_ms = self._wait_ms()
+        if wait_ms <= 0:
+            # Let the rest of the current burst of entries arrive first
+            self._pending = self.widget.after_idle(self._run)
+        else:
+            self._pending = self.widget.after(wait_ms, self._run)
+
+    def flush(self) -> None:
+        """
+        Render immediately, e.g. before a copy or after a reset, cancelling any pending render.
+        """
+        self.cancel()
+        self._run()
+
+    def cancel(self) -> None:
+        if self._pending is not None and self.widget is not None:
+            self.widget.after_cancel(self._pending)
+        self._pending = None
+
+    def _wait_ms(self) -> int:
+        if self._last_render is None:
+            return 0
+        elapsed_ms = (self.clock() - self._last_render) * 1000
+        return int(self.interval_ms - elapsed_ms)
+
+    def _run(self) -> None:
+        self._pending = None
+        self.dirty = False
+        self._last_render = self.clock()
+        self.render()
@@ -0,0 +1,132 @@
+"""
+Pool of the label widgets used for the variable rows of the main panel and the nearest rares window.
+
+Rows are keyed by a stable identity (the system, the commodity type, the activity...). A refresh reuses
+the widgets of rows that are still shown, only reconfiguring the options whose values changed, and only
+creates widgets for genuinely new rows. Rows that are no longer shown are hidden and kept for reuse, until
+they have not been shown for max_idle refreshes when their widgets are destroyed.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Optional
+
+
+class RowPool:
+    """
+    The widgets of one frame, keyed by row identity.
+    """
+
+    def __init__(self, register: Optional[Callable[[Any], None]] = None, max_idle: int = 10) -> None:
+        """
+        :param register: Called with each new widget, e.g. theme.register
+        :param max_idle: The refreshes a hidden row is kept for reuse before its widgets are destroyed
+        """
+        self.register = register
+        self.max_idle = max_idle
+        self._widgets: dict[Hashable, Any] = {}
+        self._options: dict[Hashable, dict] = {}
+        self._grid: dict[Hashable, tuple] = {}
+        self._used: set[Hashable] = set()
+        # The refreshes each hidden row has not been placed in
+        self._idle: dict[Hashable, int] = {}
+        # Only ever goes up, the pool shrinks as idle rows are destroyed while others are still shown
+        self._names = 0
+        self.created: list[Any] = []
+
+    def begin(self) -> None:
+        """
+        Start a refresh, every row that is not placed before end() is hidden.
+        """
+        self._used = set()
+
+    def place(self, key: Hashable, create: Callable[..., Any], row: int, column: int, columnspan: int = 1,
+              sticky: str = "w", padx: int = 0, pady: int = 0, **options: Any) -> Any:
+        """
+        Show the widget for a row, creating it if this is a new row.
+
+        :param key: The identity of the row and column, e.g. ("system", "Sol", 0)
+        :param create: Creates the widget, called with the options
+        :param row: The grid row
+        :param column: The grid column
+        :param columnspan: The grid columnspan
+        :param sticky: The grid sticky
+        :param padx: The grid padx
+        :param pady: The grid pady
+        :param options: The widget options that can change between refreshes, e.g. text
+        :return: The widget
+        """
+        widget = self._widgets.get(key)
+        if widget is None:
+            widget = create(**options)
+            self._widgets[key] = widget
+            self._options[key] = dict(options)
+            self.created.append(widget)
+            if self.register is not None:
+                self.register(widget)
+        else:
+            self._idle.pop(key, None)
+            previous = self._options[key]
+            changed = {name: value for name, value in options.items() if previous.get(name) != value}
+            if changed:
+                widget.configure(**changed)
+                previous.update(changed)
+
+        grid = (row, column, columnspan, sticky, padx, pady)
+        if self._grid.get(key) != grid:
+            widget.grid(row=row, column=column, columnspan=columnspan, sticky=sticky, padx=padx, pady=pady)
+            self._grid[key] = grid
+        self._used.add(key)
+        return widget
+
+    def end(self) -> None:
+        """
+        Finish a refresh, hiding the rows that were not placed and destroying the ones hidden for too long.
+        """
+        for key in self._grid.keys() - self._used:
+            self._widgets[key].grid_remove()
+            del self._grid[key]
+
+        destroyed = []
+        for key in self._widgets.keys() - self._used:
+            idle = self._idle.get(key, 0) + 1
+            if idle > self.max_idle:
+                widget = self._widgets.pop(key)
+                widget.destroy()
+                destroyed.append(widget)
+                del self._options[key]
+                self._idle.pop(key, None)
+            else:
+                self._idle[key] = idle
+        if destroyed:
+            self.created = [widget for widget in self.created if all(widget is not gone for gone in destroyed)]
+
+    def unique_name(self, prefix: str) -> str:
+        """
+        A widget name never handed out before by this pool, e.g. system12.
+        Tk destroys the existing widget when another is created with the same name in the same parent.
+        """
+        self._names += 1
+        return f"{prefix}{self._names}"
+
+    def take_created(self) -> list[Any]:
+        """
+        The widgets created since the last call, e.g. to apply the theme to them.
+        """
+        created, self.created = self.created, []
+        return created
+
+    def clear(self) -> None:
+        """
+        Destroy all the widgets, e.g. when a setting used at creation (like the system URL provider) changes.
+        """
+        for widget in self._widgets.values():
+            widget.destroy()
+        self._widgets.clear()
+        self._options.clear()
+        self._grid.clear()
+        self._used.clear()
+        self._idle.clear()
+        self.created = []
+
+    def __len__(self) -> int:
+        return len(self._widgets)
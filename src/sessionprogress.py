@@ -1,137 +1,206 @@
-from config import appname, config # type: ignore # noqa: N813
-from EDMCLogging import get_plugin_logger # type: ignore # noqa: N813
-from consts import PLUGIN_NAME, mined_heading
+from array import array
+from enum import IntEnum
+from typing import Iterator
+from consts import mined_heading
+from pluginlogger import logger
 
-logger = get_plugin_logger(f"{appname}.{PLUGIN_NAME}")
+class ActivityKind(IntEnum):
+    """
+    The activities merits are earned by, in display order. The values index SessionProgress.Activities.merits.
+    """
+    UNKNOWN = 0
+    SHIP_SCANS = 1
+    BOUNTIES = 2
+    POWERPLAY_DELIVERIES = 3
+    DONATION_MISSIONS = 4
+    SCAN_DATA_LINKS = 5
+    HOLOSCREEN_HACKS = 6
+    RARE_GOODS = 7
+    SALVAGE = 8
+    CARTOGRAPHY = 9
+    HIGH_VALUE_COMMODITIES = 10
+    LOW_VALUE_COMMODITIES = 11
+    EXOBIOLOGY = 12
+    MINED = 13
+    ON_FOOT = 14
+    COMMIT_CRIMES = 15
+    RIVAL_POWER_KILLS = 16
+    #Wake scans not separate as they do not have enough detail to acuurately track
+
+    @property
+    def heading(self) -> str:
+        return activity_headings[self]
+
+activity_headings: tuple[str, ...] = ("Unknown:", "Ship\\Wake Scans:", "Bounties:", "Powerplay Deliveries:", "Donation Missions:", "Scan Data Links:",
+                                      "Holoscreen Hacks:", "Rare Goods:", "Salvage:", "Cartography:", "High Value Commodities:", "Low Value Commodities:",
+                                      "Exobiology:", f"{mined_heading}", "OnFoot:", "Commit Crimes:", "Rival Power Kills:")
 
 class SessionProgress(object):
     
     class Activities(object):
-        
-        class Activity(object):
-            def __init__(self, activity_type = '', merits = 0) -> None:
-                self.activity_type = activity_type
-                self.merits = merits
+        """
+        The merits earned by each activity, held in a fixed width vector indexed by ActivityKind.
+        """
 
         class MinedCommodity(object):
+            __slots__ = ("commodity_type", "merits", "tonnage")
+
             def __init__(self, commodity_type = '', merits = 0, tonnage = 0) -> None:
                 self.commodity_type = commodity_type
                 self.merits = merits
                 self.tonnage = tonnage
 
         def __init__(self) -> None:
-            self.activities_type_list = {0: "Unknown:", 1: "Ship\\Wake Scans:", 2: "Bounties:", 3: "Powerplay Deliveries:", 4: "Donation Missions:", 5: "Scan Data Links:", 6: "Holoscreen Hacks:"
-                                         , 7: "Rare Goods:", 8: "Salvage:", 9 : "Cartography:", 10: "High Value Commodities:", 11: "Low Value Commodities:", 12: "Exobiology:"
-                                         , 13: f"{mined_heading}", 14:"OnFoot:", 15: "Commit Crimes:", 16: "Rival Power Kills:"}
-            self.activities: list[SessionProgress.Activities.Activity] = []
-            self.mined_commodities: list[SessionProgress.Activities.MinedCommodity] = []
-            for item in self.activities_type_list:
-                self.activities.append(SessionProgress.Activities.Activity(self.activities_type_list[item], 0))
-
-        def add_unknown_merits(self, merits: int) -> int:
-            self.activities[0].merits += merits
-            return self.activities[0].merits
-        
-        def get_unknown_merits(self) -> int:
-            return self.activities[0].merits
-
-        def add_ship_scan_merits(self, merits) -> int:
-            self.activities[1].merits += merits
-            return self.activities[1].merits
-        
-        def add_bounty_merits(self, merits) -> int:
-            self.activities[2].merits += merits
-            return self.activities[2].merits
-        
-        def add_powerplay_delivery_merits(self, merits) -> int:
-            self.activities[3].merits += merits
-            return self.activities[3].merits
-        
-        def add_donation_mission_merits(self, merits) -> int:
-            self.activities[4].merits += merits
-            return self.activities[4].merits
-        
-        def add_scan_data_links_merits(self, merits) -> int:
-            self.activities[5].merits += merits
-            return self.activities[5].merits
-
-        def add_holoscreen_hacks_merits(self, merits) -> int:
-            self.activities[6].merits += merits
-            return self.activities[6].merits
-        
-        def add_rare_goods_merits(self, merits) -> int:
-            self.activities[7].merits += merits
-            return self.activities[7].merits
-
-        def add_salvage_merits(self, merits) -> int:
-            self.activities[8].merits += merits
-            return self.activities[8].merits
-        
-        def add_cartography_merits(self, merits) -> int:
-            self.activities[9].merits += merits
-            return self.activities[9].merits
-        
-        def add_high_value_commodities_merits(self, merits) -> int:
-            self.activities[10].merits += merits
-            return self.activities[10].merits
-        
-        def add_low_value_commodities_merits(self, merits) -> int:
-            self.activities[11].merits += merits
-            return self.activities[11].merits
-        
-        def add_exobiology_merits(self, merits) -> int:
-            self.activities[12].merits += merits
-            return self.activities[12].merits
-
-        def add_mined_merits(self, merits, commodity_type, tonnage) -> int:
-            found = False
-            for item in self.mined_commodities:
-                if item.commodity_type == commodity_type:
-                    item.merits += merits
-                    item.tonnage += tonnage
-                    found = True
-                    break
-            if not found:
-                # If the commodity is not found, append it to the list
-                self.mined_commodities.append(SessionProgress.Activities.MinedCommodity(commodity_type, merits, tonnage))
+            self.merits: array = array('q', bytes(8 * len(ActivityKind)))
+            # Running total of self.merits
+            self.total_merits = 0
+            # Keyed by commodity type, in the order first mined
+            self.mined_commodities: dict[str, SessionProgress.Activities.MinedCommodity] = {}
+
+        def add(self, kind: ActivityKind, merits) -> int:
+            """
+            Attribute merits to an activity, negative merits move them away (e.g. from UNKNOWN once identified).
+
+            :return: The activity's merits
+            """
+            merits = int(merits)
+            self.merits[kind] += merits
+            self.total_merits += merits
+            return self.merits[kind]
+
+        def add_mined(self, merits, commodity_type: str, tonnage) -> int:
+            """
+            Attribute merits to mining, by the commodity sold.
+            """
+            commodity = self.mined_commodities.get(commodity_type)
+            if commodity is None:
+                # If the commodity is not found, add it
+                self.mined_commodities[commodity_type] = SessionProgress.Activities.MinedCommodity(commodity_type, merits, tonnage)
                 logger.debug(f"Commodity mined: {commodity_type}")
-            self.activities[13].merits += merits
-            return self.activities[13].merits
-
-        def add_on_foot_merits(self, merits) -> int:
-            self.activities[14].merits += merits
-            return self.activities[14].merits
-
-        def add_commit_crimes_merits(self, merits) -> int:
-            self.activities[15].merits += merits
-            return self.activities[15].merits
-        
-        def add_rival_power_kills_merits(self, merits) -> int:
-            self.activities[16].merits += merits
-            return self.activities[16].merits
-
-        #Wake scans not separate as they do not have enough detail to acuurately track
-        #def add_wake_scans_merits(self, merits) -> int:
-        #    self.activities[15].merits += merits
-        #    return self.activities[15].merits
-                
+            else:
+                commodity.merits += merits
+                commodity.tonnage += tonnage
+            return self.add(ActivityKind.MINED, merits)
+
+        def __getitem__(self, kind: ActivityKind) -> int:
+            return self.merits[kind]
+
+        def items(self) -> Iterator[tuple[ActivityKind, int]]:
+            """
+            Each activity and its merits, in display order.
+            """
+            return zip(ActivityKind, self.merits)
+
         def get_total_merits(self) -> int:
-            total = 0
-            for activity in self.activities:
-                total += activity.merits
-            return total
+            return self.total_merits
+
+        def snapshot(self) -> tuple[int, ...]:
+            """
+            The merits of every activity, indexed by ActivityKind.
+            """
+            return tuple(self.merits)
+
+        def merge(self, other: 'SessionProgress.Activities') -> None:
+            """
+            Add the merits of other activities to these.
+            """
+            for kind, merits in other.items():
+                self.merits[kind] += merits
+            self.total_merits += other.total_merits
+            for commodity in other.mined_commodities.values():
+                mined = self.mined_commodities.get(commodity.commodity_type)
+                if mined is None:
+                    self.mined_commodities[commodity.commodity_type] = SessionProgress.Activities.MinedCommodity(
+                        commodity.commodity_type, commodity.merits, commodity.tonnage)
+                else:
+                    mined.merits += commodity.merits
+                    mined.tonnage += commodity.tonnage
 
     class Commodities(object):
         """
         Represents the commodities collected and delivered in a single session.
         By type and delivered system.
         """
+        __slots__ = ("type", "type_localised", "delivered_system", "collected", "delivered")
+
         def __init__(self, type='', type_localised='', delivered_system='', collected=0, delivered=0) -> None:
             self.type = type
             self.type_localised = type_localised
             self.delivered_system = delivered_system
             self.collected = int(collected)
             self.delivered = int(delivered)
+
+    class CommodityLedger(object):
+        """
+        The powerplay commodities collected and delivered, one row per type and delivered system, with the
+        delivered totals by system and by type kept alongside so nothing is rescanned.
+        """
+        def __init__(self) -> None:
+            self.rows: dict[tuple[str, str], SessionProgress.Commodities] = {}
+            self.collected = 0
+            self.delivered = 0
+            # In the order they were first delivered to, only systems and types with deliveries
+            self.delivered_by_system: dict[str, int] = {}
+            self.delivered_by_type: dict[str, int] = {}
+
+        def add(self, commodity: 'SessionProgress.Commodities') -> 'SessionProgress.Commodities':
+            """
+            Add a collection or delivery, merging it into the row for its type and delivered system.
+            """
+            key = (commodity.type, commodity.delivered_system)
+            row = self.rows.get(key)
+            if row is None:
+                row = self.rows[key] = commodity
+            else:
+                row.collected += commodity.collected
+                row.delivered += commodity.delivered
+
+            self.collected += commodity.collected
+            if commodity.delivered > 0:
+                self.delivered += commodity.delivered
+                if row.delivered_system not in self.delivered_by_system:
+                    logger.debug(f"Commodity delivered system: {row.delivered_system}")
+                self.delivered_by_system[row.delivered_system] = self.delivered_by_system.get(row.delivered_system, 0) + commodity.delivered
+                if row.type_localised not in self.delivered_by_type:
+                    logger.debug(f"Commodity delivered type: {row.type_localised}")
+                self.delivered_by_type[row.type_localised] = self.delivered_by_type.get(row.type_localised, 0) + commodity.delivered
+            return row
+
+        def add_journal_entry(self, system: str, entry: dict) -> bool:
+            """
+            Record a PowerplayCollect, PowerplayDeliver or DeliverPowerMicroResources (on foot) journal entry.
+
+            :return: True if the ledger changed
+            """
+            event = entry.get("event", "")
+            changed = False
+            for type, type_localised, count in self.journal_items(entry):
+                if event == "PowerplayCollect":
+                    self.add(SessionProgress.Commodities(type, type_localised, system, count, 0))
+                else:
+                    self.add(SessionProgress.Commodities(type, type_localised, system, 0, count))
+                changed = True
+            return changed
+
+        @staticmethod
+        def journal_items(entry: dict) -> list[tuple[str, str, int]]:
+            """
+            The (type, localised type, count) of the powerplay commodities in a journal entry.
+            """
+            event = entry.get("event", "")
+            #{"timestamp":"2025-04-05T11:29:18Z","event":"PowerplayCollect","Power":"Jerome Archer","Type":"republicanfieldsupplies","Type_Localised":"Archer's Field Supplies","Count":52}
+            #{"timestamp":"2025-04-05T11:34:05Z","event":"PowerplayDeliver","Power":"Jerome Archer","Type":"republicanfieldsupplies","Type_Localised":"Archer's Field Supplies","Count":52}
+            if event == "PowerplayCollect" or event == "PowerplayDeliver":
+                # Spyware is collected to be uploaded, not delivered
+                if event == "PowerplayCollect" and entry["Type"] == "powerspyware":
+                    return []
+                return [(entry["Type"], entry.get("Type_Localised", entry["Type"]), entry["Count"])]
+            #{"timestamp":"2025-05-04T09:48:23Z","event":"DeliverPowerMicroResources","TotalCount":1,
+            # "MicroResources":[{"Name":"powerpropagandadata","Name_Localised":"Power Political Data","Category":"Data","Count":1}],"MarketID":3930408705}
+            if event == "DeliverPowerMicroResources":
+                return [(resource["Name"], resource.get("Name_Localised", resource["Name"]), resource["Count"])
+                        for resource in entry.get("MicroResources", []) if str(resource["Name"]).startswith("power")]
+            return []
     
     """
     Represents the progress in a single session i.e. from the last dock to the current dock or death.
@@ -145,73 +214,56 @@ class SessionProgress(object):
         self.is_docking_event = int(is_docking_event)
         self.power_play_rank = int(power_play_rank)
         self.power_play = power_play
-        self.commodities: list[SessionProgress.Commodities] = []
-        self.commodities_delivered_systems: list[str] = []
-        self.commodities_delivered_types: list[str] = []
+        self.commodity_ledger: SessionProgress.CommodityLedger = SessionProgress.CommodityLedger()
         self.activities: SessionProgress.Activities = SessionProgress.Activities()
 
+    @property
+    def commodities(self) -> list[Commodities]:
+        return list(self.commodity_ledger.rows.values())
+
+    @property
+    def commodities_delivered_systems(self) -> list[str]:
+        return list(self.commodity_ledger.delivered_by_system)
+
+    @property
+    def commodities_delivered_types(self) -> list[str]:
+        return list(self.commodity_ledger.delivered_by_type)
+
     @property
     def total_commodities_collected(self):
-        total = 0
-        for c in self.commodities:
-            total += c.collected
-        return total
+        return self.commodity_ledger.collected
 
     @property
     def total_commodities_delivered(self):
-        total = 0
-        for c in self.commodities:
-            total += c.delivered
-        return total
+        return self.commodity_ledger.delivered
 
     def total_commodities_delivered_by_system(self, delivered_system: str):
-        total = 0
-        for c in self.commodities:
-            if c.delivered_system == delivered_system:
-                total += c.delivered
-        return total
+        return self.commodity_ledger.delivered_by_system.get(delivered_system, 0)
 
     def total_commodities_delivered_by_type(self, type_localised: str):
-        total = 0
-        for c in self.commodities:
-            if c.type_localised == type_localised:
-                total += c.delivered
-        return total
+        return self.commodity_ledger.delivered_by_type.get(type_localised, 0)
+
+    def clear_commodities(self) -> None:
+        """
+        Forget the commodities collected and delivered.
+        """
+        self.commodity_ledger = SessionProgress.CommodityLedger()
+
+    def carry_over(self, previous: 'SessionProgress') -> None:
+        """
+        Continue the commodities and activities of the previous session, they are not per session (see above).
+        """
+        self.commodity_ledger = previous.commodity_ledger
+        self.activities = previous.activities
 
     def add_commodity(self, commodity: Commodities) -> None:
         """
         Add a commodity to the session.
         """
-        found = False
-        for c in self.commodities:
-            if c.type == commodity.type and c.delivered_system == commodity.delivered_system:
-                # If the commodity is found, update the collected and delivered values
-                c.collected += commodity.collected
-                c.delivered += commodity.delivered
-                found = True
-                break
-        if not found:
-            # If the commodity is not found, append it to the list
-            self.commodities.append(commodity)
-
-        if commodity.delivered > 0:
-            # If the commodity is collected, append it to the list
-            found = False
-            for sys in self.commodities_delivered_systems:
-                if sys == commodity.delivered_system:
-                    found = True
-                    break
-            if not found:
-                # If the commodity is not found, append it to the list
-                self.commodities_delivered_systems.append(commodity.delivered_system)
-                logger.debug(f"Commodity delivered system: {commodity.delivered_system}")
-
-            found = False
-            for typ in self.commodities_delivered_types:
-                if typ == commodity.type_localised:
-                    found = True
-                    break
-            if not found:
-                # If the commodity is not found, append it to the list
-                self.commodities_delivered_types.append(commodity.type_localised)
-                logger.debug(f"Commodity delivered type: {commodity.type_localised}")
\ No newline at end of file
+        self.commodity_ledger.add(commodity)
+
+    def add_commodity_entry(self, system: str, entry: dict) -> bool:
+        """
+        Add the commodities of a PowerplayCollect, PowerplayDeliver or DeliverPowerMicroResources journal entry.
+        """
+        return self.commodity_ledger.add_journal_entry(system, entry)
@@ -1,23 +1,48 @@
+from typing import NamedTuple, Optional, Sequence
 
 class SystemProgress(object):
-
-    class SystemPosition(object):
-        def __init__(self, x = 0, y = 0, z = 0) -> None:
-            self.x = float(x)
-            self.y = float(y)   
-            self.z = float(z)
-
     """
     Represents the progress in a single system
     """
-    system = ''
-    earnings = 0.0
-    controlling_power = ''
-    power_play_state = ''
-    power_play_state_control_progress = 0.0
-    power_play_state_reinforcement = 0.0
-    power_play_state_undermining = 0.0
-    orig_power_play_state_control_progress = 0.0
-    orig_power_play_state_reinforcement = 0.0
-    orig_power_play_state_undermining = 0.0
-    position = SystemPosition()
\ No newline at end of file
+
+    class SystemPosition(NamedTuple):
+        """
+        The galactic coordinates of a system, in light years from Sol.
+        """
+        x: float = 0.0
+        y: float = 0.0
+        z: float = 0.0
+
+    __slots__ = ("system", "system_address", "earnings", "controlling_power", "power_play_state",
+                 "power_play_state_control_progress", "power_play_state_reinforcement", "power_play_state_undermining",
+                 "orig_power_play_state_control_progress", "orig_power_play_state_reinforcement",
+                 "orig_power_play_state_undermining", "x", "y", "z")
+
+    def __init__(self, system: str = '', system_address: Optional[int] = None, earnings: float = 0.0) -> None:
+        self.system = system
+        self.system_address = system_address
+        self.earnings = earnings
+        self.controlling_power = ''
+        self.power_play_state = ''
+        self.power_play_state_control_progress = 0.0
+        self.power_play_state_reinforcement = 0.0
+        self.power_play_state_undermining = 0.0
+        self.orig_power_play_state_control_progress = 0.0
+        self.orig_power_play_state_reinforcement = 0.0
+        self.orig_power_play_state_undermining = 0.0
+        # The coordinates, stored inline rather than in a SystemPosition per system
+        self.x = 0.0
+        self.y = 0.0
+        self.z = 0.0
+
+    @property
+    def position(self) -> 'SystemProgress.SystemPosition':
+        return SystemProgress.SystemPosition(self.x, self.y, self.z)
+
+    def set_position(self, star_pos: Sequence[float]) -> None:
+        """
+        Set the coordinates from a journal StarPos, e.g. [-12.59375, -19.03125, 39.71875].
+        """
+        self.x = float(star_pos[0])
+        self.y = float(star_pos[1])
+        self.z = float(star_pos[2])
@@ -0,0 +1,73 @@
+"""
+Registry of the systems visited in a session.
+
+Replaces the plain list of SystemProgress so that looking up a system on every jump/merit event does not
+get slower as the session goes on.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Optional
+from systemprogress import SystemProgress
+
+
+class SystemRegistry:
+    """
+    SystemProgress records keyed by SystemAddress, with the system name as a secondary key.
+
+    Iterates in the order systems were first added, which is the order they are displayed in.
+    The address is not always known (e.g. EDMC started mid session), so records added by name
+    pick up their address the first time they are looked up with one.
+    """
+
+    def __init__(self) -> None:
+        self._systems: list[SystemProgress] = []
+        self._by_address: dict[int, SystemProgress] = {}
+        self._by_name: dict[str, SystemProgress] = {}
+
+    def get(self, name: str, address: Optional[int] = None) -> Optional[SystemProgress]:
+        """
+        Find a system by address, falling back to its name.
+
+        :param name: The system name
+        :param address: The SystemAddress if known
+        :return: The SystemProgress if the system has been added, None otherwise
+        """
+        if address:
+            system = self._by_address.get(address)
+            if system is not None:
+                return system
+        system = self._by_name.get(name)
+        if system is not None and address:
+            if system.system_address:
+                # Same name, different system
+                return None
+            system.system_address = address
+            self._by_address[address] = system
+        return system
+
+    def add(self, system: SystemProgress) -> SystemProgress:
+        """
+        Add a system if it is not already registered.
+
+        :param system: The system to add
+        :return: The registered SystemProgress, which is the existing one if there was one
+        """
+        existing = self.get(system.system, system.system_address)
+        if existing is not None:
+            return existing
+        self._systems.append(system)
+        if system.system_address:
+            self._by_address[system.system_address] = system
+        self._by_name.setdefault(system.system, system)
+        return system
+
+    def clear(self) -> None:
+        self._systems.clear()
+        self._by_address.clear()
+        self._by_name.clear()
+
+    def __len__(self) -> int:
+        return len(self._systems)
+
+    def __iter__(self) -> Iterator[SystemProgress]:
+        return iter(self._systems)
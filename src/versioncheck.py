@@ -0,0 +1,123 @@
+"""
+Check for a newer release of the plugin.
+
+The latest GitHub release is looked up on a background thread, with a timeout, so EDMC never waits on the
+network to start. The result is cached on disk for a few hours, and when it has expired the request is
+conditional on the ETag/Last-Modified of the cached one, so most start ups make no request at all and most
+of the rest get an empty 304.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import requests
+import semantic_version  # type: ignore # noqa: N813
+from consts import plugin_version
+from pluginlogger import logger
+
+RELEASES_URL = 'https://api.github.com/repos/alby666/EDMC-PowerPlayProgress/releases/latest'
+
+
+class VersionCheck:
+    """
+    The latest release, from the cache file or GitHub.
+    """
+
+    def __init__(self, cache_path: Union[str, Path], url: str = RELEASES_URL, ttl: float = 6 * 60 * 60,
+                 timeout: float = 5.0, clock: Callable[[], float] = time.time) -> None:
+        """
+        :param cache_path: The file the last response is kept in
+        :param url: The GitHub latest release API
+        :param ttl: Seconds the cached release is used for before asking GitHub again
+        :param timeout: Seconds to wait for GitHub to connect, and then to respond
+        :param clock: Time source in seconds, for testing
+        """
+        self.cache_path = Path(cache_path)
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.clock = clock
+        # The newer version, '' if there is not one, None until the check has finished
+        self.result: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Run the check on a background thread, the result is in self.result when it has finished.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="VersionCheck", daemon=True)
+            self._thread.start()
+
+    def newer_version(self, current: str = plugin_version) -> str:
+        """
+        The latest release if it is newer than the current version, '' if not or it is not known.
+        """
+        tag = self.latest_tag()
+        try:
+            version = semantic_version.Version(tag.lstrip('v'))
+        except ValueError:
+            return ''
+        if version > semantic_version.Version(current):
+            return str(version)
+        return ''
+
+    def latest_tag(self) -> str:
+        """
+        The tag of the latest release, e.g. v0.9.25, from the cache if it is fresh and GitHub if not.
+        """
+        cache = self._read_cache()
+        if cache and self.clock() - cache.get('checked', 0) < self.ttl:
+            return cache.get('tag_name', '')
+
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+        try:
+            response = requests.get(self.url, headers=headers, timeout=(self.timeout, self.timeout))
+            if response.status_code == requests.codes.not_modified:
+                cache['checked'] = self.clock()
+            elif response.status_code == requests.codes.ok:
+                cache = {
+                    'checked': self.clock(),
+                    'tag_name': response.json()['tag_name'],
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', ''),
+                }
+            else:
+                raise requests.RequestException(f"HTTP {response.status_code}")
+        except (requests.RequestException, ValueError, KeyError) as ex:
+            # Use what is cached, if anything, and try again next time
+            logger.error('Failed to get GitHub release info', exc_info=ex)
+            return cache.get('tag_name', '')
+        self._write_cache(cache)
+        return cache.get('tag_name', '')
+
+    def _run(self) -> None:
+        try:
+            self.result = self.newer_version()
+        except Exception as ex:
+            # Never let the check take anything else down
+            logger.error('Failed to check for updates', exc_info=ex)
+            self.result = ''
+
+    def _read_cache(self) -> dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, cache: dict) -> None:
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError as ex:
+            logger.error('Failed to cache GitHub release info', exc_info=ex)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The plugin modules import each other by name, as EDMC loads them from the plugin folder
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
@@ -0,0 +1,195 @@
+"""
+Latency benchmark for the journal hot path.
+
+Times every JournalProcessor.process call (the non-display part of load.journal_entry) and reports the
+p50/p95/p99 latency by event type, for the sample journal and for generated worst cases:
+
+    fixture         the journals in tests/src_journalplayer_data, replayed --repeat times
+    systems_5000    location/fsdjump/docked/powerplaymerits with 5,000 systems already visited
+    journal_full    merit events arriving with a full HISTORY_DEPTH RecentJournal of non-matching entries
+
+Results are written as JSON so runs can be compared, e.g.
+
+    python tests/benchmark_journal.py --output before.json
+    python tests/benchmark_journal.py --output after.json --baseline before.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from journalplayer import DATA_DIR, JournalPlayer, journal_files
+
+from systemprogress import SystemProgress  # noqa: E402 (src is on the path once journalplayer is imported)
+
+
+def percentile(ordered: list[int], pct: float) -> int:
+    """
+    Nearest rank percentile of an already sorted list.
+    """
+    if not ordered:
+        return 0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+class LatencyRecorder:
+    """
+    Collects per call latencies (in nanoseconds) grouped by event type.
+    """
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[int]] = {}
+
+    def timed(self, player: JournalPlayer, entry: dict) -> None:
+        start = time.perf_counter_ns()
+        player.play_entry(entry)
+        self.samples.setdefault(entry["event"].lower(), []).append(time.perf_counter_ns() - start)
+
+    def summary(self) -> dict[str, dict]:
+        result = {}
+        for event_type, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            result[event_type] = {
+                "count": len(ordered),
+                "mean_us": sum(ordered) / len(ordered) / 1000,
+                "p50_us": percentile(ordered, 50) / 1000,
+                "p95_us": percentile(ordered, 95) / 1000,
+                "p99_us": percentile(ordered, 99) / 1000,
+                "max_us": ordered[-1] / 1000,
+            }
+        return result
+
+
+def power_system(name: str, event: str = "FSDJump", address: int | None = None) -> dict:
+    return {
+        "timestamp": "2025-05-13T21:00:00Z", "event": event, "StarSystem": name, "SystemAddress": address, "StarPos": [1.0, 2.0, 3.0],
+        "ControllingPower": "Jerome Archer", "PowerplayState": "Fortified", "PowerplayStateControlProgress": 0.5,
+        "PowerplayStateReinforcement": 1000, "PowerplayStateUndermining": 100,
+    }
+
+
+def merits(total: int, gained: int = 10) -> dict:
+    return {"timestamp": "2025-05-13T21:00:01Z", "event": "PowerplayMerits", "Power": "Jerome Archer", "MeritsGained": gained, "TotalMerits": total}
+
+
+def bench_fixture(repeat: int) -> dict:
+    recorder = LatencyRecorder()
+    entries = []
+    for journal in journal_files(DATA_DIR):
+        with open(journal, "r", encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    for _ in range(repeat):
+        player = JournalPlayer()
+        for entry in entries:
+            recorder.timed(player, entry)
+    return recorder.summary()
+
+
+def bench_systems(samples: int, system_count: int = 5000) -> dict:
+    """
+    The last visited system is the one we keep returning to, the worst case for a linear search of the systems.
+    """
+    recorder = LatencyRecorder()
+    player = JournalPlayer()
+    player.play_entry({"event": "Powerplay", "Power": "Jerome Archer", "Rank": 100, "Merits": 1000000})
+    for i in range(system_count):
+        system = SystemProgress()
+        system.system = f"Visited {i}"
+        system.system_address = i + 1
+        player.ppp.systems.add(system)
+    last = f"Visited {system_count - 1}"
+    total = 1000000
+    for i in range(samples):
+        total += 10
+        recorder.timed(player, power_system(last, "Location", system_count))
+        recorder.timed(player, power_system(last, "FSDJump", system_count))
+        # A new system without a controlling power is not added, so the list stays the same size
+        recorder.timed(player, {"event": "FSDJump", "StarSystem": f"Unvisited {i}", "SystemAddress": system_count + i + 1, "StarPos": [0.0, 0.0, 0.0]})
+        recorder.timed(player, power_system(last, "FSDJump", system_count))
+        recorder.timed(player, merits(total))
+        recorder.timed(player, {"event": "PowerplayDeliver", "Power": "Jerome Archer", "Type": "republicanfieldsupplies", "Type_Localised": "Archer's Field Supplies", "Count": 5})
+        recorder.timed(player, {"event": "Docked", "StarSystem": last, "StationName": "Benchmark Port"})
+    return recorder.summary()
+
+
+def bench_journal_full(samples: int) -> dict:
+    """
+    Merits arrive after a full history of entries that match none of the activities, so every
+    classifier runs and the bounty/duplicate scans walk the whole RecentJournal.
+    """
+    recorder = LatencyRecorder()
+    player = JournalPlayer()
+    player.play_entry({"event": "Powerplay", "Power": "Jerome Archer", "Rank": 100, "Merits": 1000000})
+    filler = {"event": "ShipTargeted", "TargetLocked": True, "Ship": "python", "ScanStage": 0}
+    depth = player.ppp.recent_journal_log.HISTORY_DEPTH
+    total = 1000000
+    for i in range(samples):
+        for _ in range(depth - 1):
+            recorder.timed(player, filler)
+        total += 10
+        recorder.timed(player, merits(total))
+        # A large cartography turn in, merits are counted after the MultiSellExplorationData settles
+        recorder.timed(player, {"event": "MultiSellExplorationData", "Discovered": [], "BaseValue": 1000000, "Bonus": 0, "TotalEarnings": 1000000})
+        for _ in range(5):
+            total += 2
+            recorder.timed(player, merits(total, 2))
+    return recorder.summary()
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """
+    Print the p95 change against a previous run for every scenario/event type in both.
+    """
+    print(f"{'scenario':<14} {'event':<28} {'p95 before':>12} {'p95 after':>12} {'change':>8}")
+    for scenario, events in results["scenarios"].items():
+        for event_type, stats in events.items():
+            before = baseline.get("scenarios", {}).get(scenario, {}).get(event_type)
+            if before is None or before["p95_us"] == 0:
+                continue
+            change = (stats["p95_us"] - before["p95_us"]) / before["p95_us"] * 100
+            print(f"{scenario:<14} {event_type:<28} {before['p95_us']:>10.2f}us {stats['p95_us']:>10.2f}us {change:>7.1f}%")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write the results to")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of times to replay the sample journal")
+    parser.add_argument("--samples", type=int, default=500, help="Number of iterations of each generated case")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "samples": args.samples,
+        "scenarios": {
+            "fixture": bench_fixture(args.repeat),
+            "systems_5000": bench_systems(args.samples),
+            "journal_full": bench_journal_full(args.samples),
+        },
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for scenario, events in results["scenarios"].items():
+        print(f"{scenario}:")
+        for event_type, stats in events.items():
+            print(f"  {event_type:<28} n={stats['count']:<6} p50={stats['p50_us']:8.2f}us p95={stats['p95_us']:8.2f}us p99={stats['p99_us']:8.2f}us")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+"""
+Headless journal replay.
+
+Streams Journal.*.log files through the same JournalProcessor that load.journal_entry uses, without EDMC,
+a Tk root or any display updates. Reports the throughput and the resulting merit totals, e.g.
+
+    python tests/journalplayer.py tests/src_journalplayer_data
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from journalprocessor import JournalProcessor  # noqa: E402
+from powerplaystate import PowerPlayState  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / "src_journalplayer_data"
+
+
+def journal_files(path: str | Path) -> list[Path]:
+    """
+    Return the journal files to play for a file or a folder, in the order the game wrote them.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob("Journal.*.log"))
+    return [path]
+
+
+class JournalPlayer:
+    """
+    Replays journal files into a PowerPlayState and times the processing.
+    """
+
+    def __init__(self) -> None:
+        self.ppp = PowerPlayState()
+        self.processor = JournalProcessor(self.ppp)
+        # Mimic the bits of EDMC's monitor state the plugin relies on
+        self.system = ""
+        self.state: dict = {}
+        self.events = 0
+        self.elapsed = 0.0
+
+    def play_entry(self, entry: dict) -> bool:
+        """
+        Play a single journal entry, tracking the current system as EDMC would.
+        """
+        if "StarSystem" in entry:
+            self.system = entry["StarSystem"]
+        if "StarPos" in entry:
+            self.state["StarPos"] = entry["StarPos"]
+        if "SystemAddress" in entry:
+            self.state["SystemAddress"] = entry["SystemAddress"]
+
+        start = time.perf_counter()
+        new_event = self.processor.process(self.system, entry, self.state)
+        self.elapsed += time.perf_counter() - start
+        self.events += 1
+        return new_event
+
+    def play_file(self, path: str | Path) -> None:
+        """
+        Stream a journal file line by line, skipping anything that is not valid JSON.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.play_entry(entry)
+
+    def play(self, paths: list[str | Path]) -> None:
+        for path in paths:
+            for journal in journal_files(path):
+                self.play_file(journal)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merits_by_activity(self) -> dict[str, int]:
+        return {kind.heading: merits for kind, merits in self.ppp.current_session.activities.items() if merits != 0}
+
+    def merits_by_system(self) -> dict[str, int]:
+        return {sys.system: sys.earnings for sys in self.ppp.systems if sys.earnings != 0}
+
+    def results(self) -> dict:
+        return {
+            "events": self.events,
+            "seconds": self.elapsed,
+            "events_per_second": self.events_per_second,
+            "total_merits": self.ppp.total_merits,
+            "session_merits": self.ppp.total_merits - self.ppp.starting_merits,
+            "merits_by_activity": self.merits_by_activity(),
+            "merits_by_system": self.merits_by_system(),
+        }
+
+
+def main(argv: list[str]) -> int:
+    player = JournalPlayer()
+    player.play(argv or [DATA_DIR])
+    results = player.results()
+    print(f"{results['events']} events in {results['seconds']:.4f}s ({results['events_per_second']:,.0f} events/s)")
+    print(f"Total merits: {results['total_merits']}, this session: {results['session_merits']}")
+    print("Merits by activity:")
+    for activity, merits in results["merits_by_activity"].items():
+        print(f"  - {activity} {merits}")
+    print("Merits by system:")
+    for system, merits in results["merits_by_system"].items():
+        print(f"  - {system}: {merits}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
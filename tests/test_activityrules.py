@@ -0,0 +1,57 @@
+import unittest
+from activityrules import ActivityRule, ActivityRules, field_equals
+from recentjournal import RecentJournal
+
+class TestActivityRules(unittest.TestCase):
+    def setUp(self):
+        self.recent_journal = RecentJournal()
+
+    def add(self, *entries: dict) -> None:
+        for entry in entries:
+            self.recent_journal.add_entry(entry)
+
+    def test_candidates_only_for_events_in_window(self):
+        """
+        Only the rules triggered by the events just before the merits (plus the state rules) are evaluated.
+        """
+        rules = RecentJournal.activity_rules
+        self.add({"event": "Docked"}, {"event": "SellOrganicData"}, {"event": "PowerplayMerits", "MeritsGained": 10, "TotalMerits": 10})
+        mask = rules.candidates(self.recent_journal.records())
+        activities = {rules.rules[index].activity for index in range(len(rules.rules)) if mask >> index & 1}
+        self.assertEqual(activities, {RecentJournal.EXOBIOLOGY, RecentJournal.ON_FOOT})
+
+    def test_candidates_follow_skipped_events(self):
+        """
+        A bounty further back is still found when only ship targeting is in between.
+        """
+        self.add({"event": "Bounty"})
+        for _ in range(4):
+            self.add({"event": "ShipTargeted", "TargetLocked": True, "ScanStage": 1})
+        self.add({"event": "PowerplayMerits", "MeritsGained": 10, "TotalMerits": 10})
+        found = self.recent_journal.classify()
+        self.assertEqual(found.activity, RecentJournal.BOUNTY)
+        self.assertEqual(found.evidence, (0, 5))
+
+    def test_precedence(self):
+        """
+        A rare goods sale is also a high value sale, the earlier rule wins.
+        """
+        self.add({"event": "Docked"}, {"event": "MarketSell", "Type": "saxonwine", "SellPrice": 20000, "AvgPricePaid": 1000},
+                 {"event": "PowerplayMerits", "MeritsGained": 10, "TotalMerits": 10})
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.RARE_GOODS)
+
+    def test_new_rule(self):
+        """
+        A new activity is a rule in the list, e.g. an Odyssey data download.
+        """
+        rules = ActivityRules([
+            ActivityRule("download_data", "DownloadData", (field_equals("Type", "powerclassifieddata"),)),
+            ActivityRule(RecentJournal.UNKNOWN, "Docked"),
+        ], "none")
+        self.add({"event": "Docked"}, {"event": "DownloadData", "Type": "powerclassifieddata"}, {"event": "PowerplayMerits", "MeritsGained": 10, "TotalMerits": 10})
+        self.assertEqual(rules.classify(self.recent_journal.records(), self.recent_journal), ("download_data", (0, 1), "", 0))
+        self.add({"event": "ShipTargeted"})
+        self.assertEqual(rules.classify(self.recent_journal.records(), self.recent_journal).activity, "none")
+
+if __name__ == "__main__":
+    unittest.main()
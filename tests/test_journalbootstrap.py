@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from journalbootstrap import bootstrap, reverse_powerplay_entries
+from powerplaystate import PowerPlayState
+from tests.journalplayer import DATA_DIR, JournalPlayer, journal_files
+
+class TestJournalBootstrap(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_dir = self.directory.name
+        self.ppp = PowerPlayState()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, lines: list, mtime: int) -> str:
+        path = os.path.join(self.journal_dir, name)
+        with open(path, "wb") as f:
+            f.writelines(lines)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_matches_replay(self):
+        """
+        Seeding from the end of the journal gives the same progress as replaying all of it.
+        """
+        with open(journal_files(DATA_DIR)[0], "rb") as f:
+            self.write("Journal.2025-05-13T210941.01.log", f.readlines(), 1747167000)
+        expected = JournalPlayer()
+        expected.play([DATA_DIR])
+        self.assertTrue(bootstrap(self.ppp, self.journal_dir))
+        self.assertEqual(self.ppp.total_merits, expected.ppp.total_merits)
+        self.assertEqual(self.ppp.starting_merits, expected.ppp.starting_merits)
+        self.assertEqual(self.ppp.current_session.power_play, "Jerome Archer")
+        self.assertEqual(self.ppp.current_session.power_play_rank, expected.ppp.current_session.power_play_rank)
+
+    def test_powerplay_in_older_journal(self):
+        self.write("Journal.2025-05-13T200000.01.log", [
+            b'{ "timestamp":"2025-05-13T20:00:00Z", "event":"Powerplay", "Power":"Jerome Archer", "Rank":150, "Merits":1175957, "TimePledged":16767031 }\n',
+            b'{ "timestamp":"2025-05-13T20:10:00Z", "event":"PowerplayMerits", "Power":"Jerome Archer", "MeritsGained":20, "TotalMerits":1175977 }\n',
+        ], 1747166400)
+        self.write("Journal.2025-05-13T210000.01.log", [
+            b'{ "timestamp":"2025-05-13T21:00:00Z", "event":"PowerplayRank", "Power":"Jerome Archer", "Rank":151 }\n',
+            b'{ "timestamp":"2025-05-13T21:01:00Z", "event":"PowerplayMerits", "Power":"Jerome Archer", "MeritsGained":40, "TotalMerits":1176017 }\n',
+            b'{ "timestamp":"2025-05-13T21:02:00Z", "event":"PowerplayCollect", "Power":"Jerome Archer", "Type":"powerpropagandadata", "Count":2 }\n',
+            b'{ "timestamp":"2025-05-13T21:03:00Z", "event":"PowerplayMer',
+        ], 1747170000)
+        self.assertTrue(bootstrap(self.ppp, self.journal_dir))
+        self.assertEqual((self.ppp.starting_merits, self.ppp.total_merits), (1175957, 1176017))
+        self.assertEqual(self.ppp.current_session.power_play_rank, 151)
+
+    def test_merits_only(self):
+        self.write("Journal.2025-05-13T210000.01.log", [
+            b'{ "timestamp":"2025-05-13T21:01:00Z", "event":"PowerplayMerits", "Power":"Jerome Archer", "MeritsGained":40, "TotalMerits":1176017 }\n',
+        ], 1747170000)
+        self.assertTrue(bootstrap(self.ppp, self.journal_dir))
+        self.assertEqual((self.ppp.starting_merits, self.ppp.total_merits), (1175977, 1176017))
+        self.assertEqual(self.ppp.current_session.power_play_rank, self.ppp.CurrentRank(1176017))
+
+    def test_nothing_found(self):
+        self.assertFalse(bootstrap(self.ppp, self.journal_dir))
+        path = self.write("Journal.2025-05-13T210000.01.log", [], 1747170000)
+        self.assertEqual(list(reverse_powerplay_entries(path)), [])
+        self.assertFalse(bootstrap(self.ppp, self.journal_dir))
+        self.assertEqual(self.ppp.total_merits, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from journalcatchup import JournalCatchUp, _timestamp, active_journal, has_shut_down
+from meritstore import MeritStore
+from tests.journalplayer import DATA_DIR, JournalPlayer, journal_files
+
+class TestJournalCatchUp(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_dir = self.directory.name
+        with open(journal_files(DATA_DIR)[0], "rb") as f:
+            self.lines = f.readlines()
+        self.journal = os.path.join(self.journal_dir, "Journal.2025-05-13T210941.01.log")
+        self.expected = JournalPlayer()
+        self.expected.play([DATA_DIR])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, lines: list, mode: str = "wb") -> None:
+        with open(self.journal, mode) as f:
+            f.writelines(lines)
+
+    def start(self, store: MeritStore) -> tuple[JournalPlayer, JournalCatchUp]:
+        """
+        A plugin start: a new state, caught up from the store and the journal.
+        """
+        player = JournalPlayer()
+        player.ppp.merit_store = store
+        catch_up = JournalCatchUp(player.processor)
+        catch_up.run(self.journal_dir)
+        store.flush()
+        return player, catch_up
+
+    def test_catch_up_from_start(self):
+        self.write(self.lines[:-1])
+        player = JournalPlayer()
+        catch_up = JournalCatchUp(player.processor)
+        self.assertGreater(catch_up.run(self.journal_dir), 0)
+        self.assertEqual(player.merits_by_activity(), self.expected.merits_by_activity())
+        self.assertEqual(player.merits_by_system(), self.expected.merits_by_system())
+        self.assertEqual(player.ppp.total_merits, self.expected.ppp.total_merits)
+
+    def test_shut_down_not_caught_up(self):
+        """
+        Starting after the game has exited, e.g. EDMC before the game, there is no session to catch up.
+        """
+        self.write(self.lines)
+        store = MeritStore(os.path.join(self.journal_dir, "merits.sqlite"))
+        player, catch_up = self.start(store)
+        self.assertEqual(catch_up.entries, 0)
+        self.assertEqual(player.merits_by_system(), {})
+        self.assertEqual(player.ppp.current_session.earned_merits, 0)
+        store.close()
+
+    def test_shut_down_detected(self):
+        self.write(self.lines)
+        self.assertTrue(has_shut_down(self.journal))
+        self.write(self.lines[:-1])
+        self.assertFalse(has_shut_down(self.journal))
+        self.write([])
+        self.assertFalse(has_shut_down(self.journal))
+
+    def test_resume_from_checkpoint(self):
+        """
+        Restarting part way through a journal restores the merits before the checkpoint and feeds the rest.
+        """
+        split = self.split()
+        self.write(self.lines[:split])
+        store = MeritStore(os.path.join(self.journal_dir, "merits.sqlite"))
+        _, catch_up = self.start(store)
+        self.assertEqual(store.checkpoint().offset, sum(len(line) for line in self.lines[:split]))
+        self.assertEqual(store.checkpoint().system, catch_up.system)
+
+        self.write(self.lines[split:], "ab")
+        second, _ = self.start(store)
+        self.assertEqual(second.merits_by_activity(), self.expected.merits_by_activity())
+        self.assertEqual(second.merits_by_system(), self.expected.merits_by_system())
+        self.assertEqual(second.processor.restore(), sum(self.expected.merits_by_system().values()))
+        store.close()
+
+    def split(self) -> int:
+        return next(index for index, line in enumerate(self.lines) if b'"event":"Docked"' in line and index > len(self.lines) // 2)
+
+    def test_new_game_not_restored(self):
+        """
+        A journal from a new game since the plugin stopped is caught up on its own, the previous session is over.
+        """
+        self.write(self.lines[:self.split()])
+        store = MeritStore(os.path.join(self.journal_dir, "merits.sqlite"))
+        self.start(store)
+        # The game loaded again the next day, without the last one having shut down
+        self.journal = os.path.join(self.journal_dir, "Journal.2025-05-14T210941.01.log")
+        self.write([line.replace(b'"timestamp":"2025-05-13', b'"timestamp":"2025-05-14') for line in self.lines[:-1]])
+        os.utime(self.journal, (os.path.getmtime(self.journal) + 60,) * 2)
+        second, _ = self.start(store)
+        self.assertEqual(second.merits_by_activity(), self.expected.merits_by_activity())
+        self.assertEqual(second.merits_by_system(), self.expected.merits_by_system())
+        store.close()
+
+    def test_continued_journal_restored(self):
+        """
+        A journal continuing the one the plugin stopped in (part 2 on) is caught up on top of the restored merits.
+        """
+        split = self.split()
+        self.write(self.lines[:split])
+        store = MeritStore(os.path.join(self.journal_dir, "merits.sqlite"))
+        self.start(store)
+        timestamp = _timestamp.search(self.lines[split]).group(1)
+        header = self.lines[0].replace(b'"part":1', b'"part":2').replace(_timestamp.search(self.lines[0]).group(1), timestamp)
+        self.journal = os.path.join(self.journal_dir, "Journal.2025-05-13T210941.02.log")
+        self.write([header] + self.lines[split:-1])
+        os.utime(self.journal, (os.path.getmtime(self.journal) + 60,) * 2)
+        second, _ = self.start(store)
+        self.assertEqual(second.merits_by_activity(), self.expected.merits_by_activity())
+        self.assertEqual(second.merits_by_system(), self.expected.merits_by_system())
+        store.close()
+
+    def test_no_checkpoint_not_stored_twice(self):
+        """
+        Without a checkpoint the whole journal is fed again, but the merits already stored are not stored again.
+        """
+        self.write(self.lines[:-1])
+        store = MeritStore(os.path.join(self.journal_dir, "merits.sqlite"))
+        self.start(store)
+        rows = store.connection.execute("SELECT COUNT(*) FROM merit_events").fetchone()[0]
+        store.connection.execute("DELETE FROM checkpoint")
+        self.start(store)
+        self.assertEqual(store.connection.execute("SELECT COUNT(*) FROM merit_events").fetchone()[0], rows)
+        store.close()
+
+    def test_partial_line_left(self):
+        self.write(self.lines[:10] + [self.lines[10].rstrip(b"\r\n")])
+        player = JournalPlayer()
+        catch_up = JournalCatchUp(player.processor)
+        self.assertEqual(catch_up.play(self.journal), sum(len(line) for line in self.lines[:10]))
+
+    def test_active_journal(self):
+        self.assertIsNone(active_journal(self.journal_dir))
+        self.write(self.lines[:1])
+        self.assertEqual(os.path.basename(active_journal(self.journal_dir)), "Journal.2025-05-13T210941.01.log")
+
+if __name__ == "__main__":
+    unittest.main()
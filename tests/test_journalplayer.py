@@ -0,0 +1,45 @@
+import unittest
+from tests.journalplayer import JournalPlayer, DATA_DIR, journal_files
+
+class TestJournalPlayer(unittest.TestCase):
+    def setUp(self):
+        """
+        Replay the sample journal before each test.
+        """
+        self.player = JournalPlayer()
+        self.player.play([DATA_DIR])
+
+    def test_all_events_played(self):
+        lines = sum(1 for journal in journal_files(DATA_DIR) for _ in open(journal, encoding="utf-8"))
+        self.assertEqual(self.player.events, lines)
+        self.assertGreater(self.player.events_per_second, 0)
+
+    def test_total_merits(self):
+        self.assertEqual(self.player.ppp.total_merits, 1176737)
+        self.assertEqual(self.player.ppp.current_session.power_play, "Jerome Archer")
+
+    def test_merits_by_activity(self):
+        """
+        Every merit gained in the journal is attributed to an activity (unknowns included).
+        """
+        merits = self.player.merits_by_activity()
+        self.assertEqual(merits, {
+            "Unknown:": -33,
+            "Ship\\Wake Scans:": 143,
+            "Powerplay Deliveries:": 171,
+            "Donation Missions:": 598,
+            "Cartography:": 57,
+        })
+        self.assertEqual(sum(merits.values()), 936)
+
+    def test_merits_by_system(self):
+        self.assertEqual(self.player.merits_by_system(), {"Parutis": 26, "LHS 3197": 171, "Uzumoku": 739})
+
+    def test_no_display_updates(self):
+        """
+        The headless state has no display to update.
+        """
+        self.assertFalse(hasattr(self.player.ppp, "Update_Ppp_Display"))
+
+if __name__ == "__main__":
+    unittest.main()
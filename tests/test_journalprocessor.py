@@ -0,0 +1,60 @@
+import unittest
+from tests.journalplayer import JournalPlayer
+from powerplaystate import Section
+
+class TestJournalProcessor(unittest.TestCase):
+    def setUp(self):
+        self.player = JournalPlayer()
+        self.log = self.player.ppp.recent_journal_log
+
+    def test_irrelevant_events_rejected(self):
+        """
+        High frequency events never reach the classifier buffer.
+        """
+        for event in ("Music", "ReceiveText", "Scan", "FSSSignalDiscovered", "FSSBodySignals"):
+            self.assertFalse(self.player.play_entry({"event": event}))
+        self.assertEqual(self.log.entries, [])
+
+    def test_classifier_events_recorded(self):
+        self.assertFalse(self.player.play_entry({"event": "ShipTargeted", "TargetLocked": True, "ScanStage": 3}))
+        self.assertEqual(len(self.log.entries), 1)
+
+    def test_handler_dispatch(self):
+        self.assertTrue(self.player.play_entry({"event": "PowerplayRank", "Power": "Jerome Archer", "Rank": 139}))
+        self.assertEqual(self.player.ppp.current_session.power_play_rank, 139)
+
+    def test_event_names_are_exact(self):
+        """
+        Journal event names are case sensitive, a differently cased name is not dispatched.
+        """
+        self.assertFalse(self.player.play_entry({"event": "powerplayrank", "Power": "Jerome Archer", "Rank": 139}))
+        self.assertNotEqual(self.player.ppp.current_session.power_play_rank, 139)
+
+    def test_multi_sell_wait_counts_every_entry(self):
+        self.player.play_entry({"event": "PowerplayMerits", "Power": "Jerome Archer", "MeritsGained": 5, "TotalMerits": 1005})
+        self.player.play_entry({"event": "MultiSellExplorationData", "TotalEarnings": 1000000})
+        for _ in range(5):
+            self.player.play_entry({"event": "Music", "MusicTrack": "Exploration"})
+        self.assertEqual(self.player.processor.wait_for_multi_sell_carto_data, -1)
+        self.assertEqual(self.player.merits_by_activity().get("Cartography:"), 5)
+
+    def test_changed_sections(self):
+        """
+        Each entry flags only the display sections it changes.
+        """
+        self.player.ppp.changed_sections = Section.NONE
+        self.assertEqual(self.player.play_entry({"event": "PowerplayRank", "Power": "Jerome Archer", "Rank": 139}), Section.PROGRESS)
+        self.assertEqual(self.player.play_entry({"event": "PowerplayDeliver", "Power": "Jerome Archer", "Type": "powerpropagandadata",
+                                                 "Type_Localised": "Power Political Data", "Count": 2}), Section.COMMODITIES)
+        self.assertEqual(self.player.play_entry({"event": "Music", "MusicTrack": "Exploration"}), Section.NONE)
+        self.assertEqual(self.player.ppp.changed_sections, Section.PROGRESS | Section.COMMODITIES)
+
+    def test_first_merits_flag_socials(self):
+        changes = self.player.play_entry({"event": "PowerplayMerits", "Power": "Jerome Archer", "MeritsGained": 5, "TotalMerits": 1005})
+        self.assertTrue(changes & Section.SOCIALS)
+        changes = self.player.play_entry({"event": "PowerplayMerits", "Power": "Jerome Archer", "MeritsGained": 5, "TotalMerits": 1010})
+        self.assertFalse(changes & Section.SOCIALS)
+        self.assertTrue(changes & Section.ACTIVITIES)
+
+if __name__ == "__main__":
+    unittest.main()
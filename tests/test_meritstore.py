@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+from meritstore import MeritEvent, MeritStore
+from sessionprogress import ActivityKind
+from tests.journalplayer import DATA_DIR, JournalPlayer, journal_files
+
+class TestMeritStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "merits.sqlite")
+        self.store = MeritStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def reopen(self) -> MeritStore:
+        self.store.close()
+        self.store = MeritStore(self.path)
+        return self.store
+
+    def test_totals_since(self):
+        self.store.record(MeritEvent("2025-05-13T20:00:00Z", 1, "Sol", ActivityKind.BOUNTIES, 20))
+        self.store.record(MeritEvent("2025-05-13T21:00:00Z", 2, "Lave", ActivityKind.MINED, 300, "platinum", 12))
+        self.store.record(MeritEvent("2025-05-13T21:05:00Z", 2, "Lave", ActivityKind.MINED, 100, "platinum", 4))
+        self.store.record(MeritEvent("2025-05-13T21:10:00Z", 1, "Sol", ActivityKind.BOUNTIES, 10))
+        store = self.reopen()
+        self.assertEqual(store.activity_totals("2025-05-13T21:00:00Z"),
+                         [(ActivityKind.MINED, "platinum", 400, 16), (ActivityKind.BOUNTIES, "", 10, 0)])
+        self.assertEqual(store.system_totals(""), [(1, "Sol", 30), (2, "Lave", 400)])
+
+    def test_session_start(self):
+        self.assertIsNone(self.store.session_start())
+        self.store.start_session("2025-05-13T20:11:26Z")
+        self.store.start_session("2025-05-13T22:00:00Z")
+        self.store.flush()
+        self.assertEqual(self.store.session_start(), "2025-05-13T22:00:00Z")
+
+    def test_session_ended(self):
+        self.store.start_session("2025-05-13T20:11:26Z")
+        self.store.end_session("2025-05-13T21:23:42Z")
+        self.store.flush()
+        self.assertIsNone(self.store.session_start())
+        self.store.start_session("2025-05-14T19:00:00Z")
+        self.store.flush()
+        self.assertEqual(self.store.session_start(), "2025-05-14T19:00:00Z")
+
+    def play(self, shutdown: bool) -> JournalPlayer:
+        """
+        Replay the journal into the store, up to the game shutting down or not.
+        """
+        player = JournalPlayer()
+        player.ppp.merit_store = self.store
+        with open(journal_files(DATA_DIR)[0], encoding="utf-8") as f:
+            for entry in map(json.loads, f):
+                if shutdown or entry["event"] != "Shutdown":
+                    player.play_entry(entry)
+        return player
+
+    def test_restore_after_restart(self):
+        """
+        A restarted plugin rebuilds the merits by activity and by system the replay ended with.
+        """
+        player = self.play(shutdown=False)
+        store = self.reopen()
+        self.assertEqual(store.session_start(), "2025-05-13T20:11:26Z")
+
+        restarted = JournalPlayer()
+        restarted.ppp.merit_store = store
+        restarted.processor.restore()
+        self.assertEqual(restarted.merits_by_activity(), player.merits_by_activity())
+        self.assertEqual(restarted.merits_by_system(), player.merits_by_system())
+
+    def test_nothing_restored_after_shutdown(self):
+        """
+        Once the game has shut down its merits are not brought back into the next session.
+        """
+        self.play(shutdown=True)
+        restarted = JournalPlayer()
+        restarted.ppp.merit_store = self.reopen()
+        self.assertEqual(restarted.processor.restore(), 0)
+        self.assertEqual(restarted.merits_by_activity(), {})
+        self.assertEqual(restarted.merits_by_system(), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import locale
+import unittest
+from numberformatter import NumberFormatter
+
+class TestNumberFormatter(unittest.TestCase):
+    def test_thousands(self):
+        formatter = NumberFormatter(',', [3, 0])
+        self.assertEqual(formatter.format_int(1176737), "1,176,737")
+        self.assertEqual(formatter.format_int(999), "999")
+        self.assertEqual(formatter.format_int(1000), "1,000")
+        self.assertEqual(formatter.format_int(0), "0")
+
+    def test_negative_and_rounding(self):
+        formatter = NumberFormatter('.', [3, 0])
+        self.assertEqual(formatter.format_int(-1234567), "-1.234.567")
+        self.assertEqual(formatter.format_int(1234.6), "1.235")
+
+    def test_indian_grouping(self):
+        self.assertEqual(NumberFormatter(',', [3, 2, 0]).format_int(123456789), "12,34,56,789")
+
+    def test_grouping_stops(self):
+        """
+        CHAR_MAX, or a rule without a trailing 0, stops the grouping.
+        """
+        self.assertEqual(NumberFormatter(' ', [3, locale.CHAR_MAX]).format_int(123456789), "123456 789")
+        self.assertEqual(NumberFormatter(',', [3]).format_int(1234567), "1234,567")
+
+    def test_no_grouping(self):
+        self.assertEqual(NumberFormatter('', [3, 0]).format_int(1234567), "1234567")
+        self.assertEqual(NumberFormatter(',', []).format_int(1234567), "1234567")
+
+    def test_matches_locale_module(self):
+        """
+        The cached rule gives the same result as locale.format_string for the user's locale.
+        """
+        formatter = NumberFormatter()
+        previous = locale.setlocale(locale.LC_NUMERIC)
+        try:
+            locale.setlocale(locale.LC_NUMERIC, '')
+            for value in (0, 7, 1234, -98765, 1176737, 123456789012):
+                self.assertEqual(formatter.format_int(value), locale.format_string("%d", value, grouping=True))
+        finally:
+            locale.setlocale(locale.LC_NUMERIC, previous)
+
+    def test_load_locale_leaves_process_locale(self):
+        previous = locale.setlocale(locale.LC_NUMERIC)
+        NumberFormatter().load_locale()
+        self.assertEqual(locale.setlocale(locale.LC_NUMERIC), previous)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import unittest
+from rares import RARES_FILE, Rares, RaresCatalogue, np
+
+def brute_force(rares: Rares, x: float, y: float, z: float) -> list[tuple[float, str]]:
+    return sorted((math.dist((c.coordinates.x, c.coordinates.y, c.coordinates.z), (x, y, z)), c.id) for c in rares)
+
+class TestRaresSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.rares = Rares()
+        self.random = random.Random(21)
+
+    def points(self, count: int = 200):
+        for _ in range(count):
+            yield (self.random.uniform(-500, 500), self.random.uniform(-500, 500), self.random.uniform(-500, 500))
+
+    def test_nearest_k_matches_brute_force(self):
+        for x, y, z in self.points():
+            expected = brute_force(self.rares, x, y, z)[:10]
+            found = self.rares.nearest_k(x, y, z, 10)
+            self.assertEqual([near.rare.id for near in found], [id for _, id in expected])
+            for near, (distance, _) in zip(found, expected):
+                self.assertAlmostEqual(near.distance, distance)
+
+    def test_within_radius_matches_brute_force(self):
+        for x, y, z in self.points():
+            expected = [id for distance, id in brute_force(self.rares, x, y, z) if distance <= 150]
+            self.assertEqual([near.rare.id for near in self.rares.within_radius(x, y, z, 150)], expected)
+
+    def test_filters(self):
+        found = self.rares.nearest_k(0, 0, 0, 20, min_pad_size=3, min_stock=20)
+        self.assertEqual(len(found), 20)
+        self.assertTrue(all(near.rare.maxLandingPadSize == 3 and near.rare.count >= 20 for near in found))
+        eligible = Rares()
+        eligible.load_from_data([c.to_dict() for c in self.rares if c.maxLandingPadSize == 3 and (c.count or 0) >= 20])
+        self.assertEqual([near.rare.id for near in found], [id for _, id in brute_force(eligible, 0, 0, 0)[:20]])
+        self.assertTrue(all(near.rare.maxLandingPadSize >= 2 for near in self.rares.within_radius(0, 0, 0, 200, min_pad_size=2)))
+
+    def test_get_nearest_to(self):
+        self.assertEqual([c.id for c in self.rares.get_nearest_to(75.75, 48.75, 70.75)], [id for _, id in brute_force(self.rares, 75.75, 48.75, 70.75)])
+        self.assertEqual(self.rares.get_nearest_to(75.75, 48.75, 70.75)[0].system, "Lave")
+
+    def test_index_rebuilt_on_load(self):
+        data = [{"id": str(n), "symbol": f"Rare{n}", "market_id": str(n), "category": "Test", "name": f"Rare {n}", "system": f"System {n}",
+                 "coordinates": {"x": x, "y": y, "z": z}, "count": n % 50, "maxLandingPadSize": 1 + n % 3}
+                for n, (x, y, z) in enumerate(self.points(5000))]
+        self.rares.load_from_data(data)
+        self.assertEqual(len(self.rares), 5000)
+        for x, y, z in self.points(50):
+            expected = brute_force(self.rares, x, y, z)
+            self.assertEqual([near.rare.id for near in self.rares.nearest_k(x, y, z, 10)], [id for _, id in expected[:10]])
+            self.assertEqual([near.rare.id for near in self.rares.within_radius(x, y, z, 60)], [id for distance, id in expected if distance <= 60])
+
+    def test_ties_at_k(self):
+        """
+        Of the commodities tied at the kth distance, e.g. two in one system, the earliest in the list is kept.
+        """
+        systems = [(self.random.randint(-3, 3), self.random.randint(-3, 3), self.random.randint(-3, 3)) for _ in range(15)]
+        data = [{"id": f"{n:03}", "symbol": f"Rare{n}", "market_id": str(n), "category": "Test", "name": f"Rare {n}", "system": f"System {n % 15}",
+                 "coordinates": dict(zip("xyz", systems[n % 15]))} for n in range(60)]
+        self.rares.load_from_data(data)
+        for x, y, z in systems:
+            order = [c.id for c in self.rares.get_nearest_to(x, y, z)]
+            for k in range(1, 20):
+                self.assertEqual([near.rare.id for near in self.rares.nearest_k(x, y, z, k)], order[:k])
+
+    def test_empty(self):
+        self.rares.load_from_data([])
+        self.assertEqual(self.rares.nearest_k(0, 0, 0, 10), [])
+        self.assertEqual(self.rares.within_radius(0, 0, 0, 100), [])
+
+class TestRaresBatch(unittest.TestCase):
+    def setUp(self):
+        self.random = random.Random(23)
+        self.route = [(self.random.uniform(-300, 300), self.random.uniform(-300, 300), self.random.uniform(-300, 300)) for _ in range(100)]
+
+    def rares(self, numpy_enabled: bool) -> Rares:
+        rares = Rares()
+        rares.numpy_enabled = numpy_enabled
+        rares._build_indexes()
+        return rares
+
+    def check_batch(self, rares: Rares) -> None:
+        batch = rares.nearest_k_batch(self.route, 5, min_pad_size=2)
+        self.assertEqual(len(batch), len(self.route))
+        for (x, y, z), found in zip(self.route, batch):
+            single = rares.nearest_k(x, y, z, 5, min_pad_size=2)
+            self.assertEqual([near.rare.id for near in found], [near.rare.id for near in single])
+            for near, expected in zip(found, single):
+                self.assertAlmostEqual(near.distance, expected.distance)
+
+    def test_batch_without_numpy(self):
+        self.check_batch(self.rares(False))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_with_numpy(self):
+        rares = self.rares(True)
+        self.check_batch(rares)
+        # Small chunks give the same as one
+        rares._array.chunk_elements = 1000
+        self.check_batch(rares)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_matches_tree(self):
+        tree, array = self.rares(False), self.rares(True)
+        for x, y, z in self.route:
+            for k in (1, 10, len(tree) + 5):
+                self.assertEqual([(near.rare.id, round(near.distance, 6)) for near in array.nearest_k(x, y, z, k, min_stock=10)],
+                                 [(near.rare.id, round(near.distance, 6)) for near in tree.nearest_k(x, y, z, k, min_stock=10)])
+            self.assertEqual([near.rare.id for near in array.within_radius(x, y, z, 120, min_pad_size=3)],
+                             [near.rare.id for near in tree.within_radius(x, y, z, 120, min_pad_size=3)])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_empty(self):
+        rares = self.rares(True)
+        rares.load_from_data([])
+        self.assertEqual(rares.nearest_k_batch(self.route[:3], 10), [[], [], []])
+        self.assertEqual(rares.within_radius(0, 0, 0, 100), [])
+
+class TestRaresCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rare-commodities.json")
+        with open(RARES_FILE, "r") as f:
+            self.data = json.load(f)
+        self.write(self.data, 1700000000)
+        self.catalogue = RaresCatalogue(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data: list, mtime: int) -> None:
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def wait_for(self, condition) -> None:
+        start = time.monotonic()
+        while not condition() and time.monotonic() - start < 5:
+            time.sleep(0.01)
+
+    def test_loaded_once(self):
+        rares = self.catalogue.get()
+        self.assertEqual(len(rares), len(self.data))
+        self.assertIs(self.catalogue.get(), rares)
+        self.assertIs(self.catalogue.current(), rares)
+
+    def test_loaded_in_background(self):
+        """
+        current() never parses the file itself, it returns None until the background load has finished.
+        """
+        rares = self.catalogue.current()
+        self.wait_for(lambda: self.catalogue.current() is not None)
+        self.assertEqual(len(self.catalogue.current()), len(self.data))
+        self.assertTrue(rares is None or len(rares) == len(self.data))
+
+    def test_reloaded_when_changed(self):
+        rares = self.catalogue.get()
+        self.write(self.data[:10], 1700000100)
+        # The previous Rares until the new one is ready
+        self.assertIn(len(self.catalogue.current()), (len(self.data), 10))
+        self.wait_for(lambda: self.catalogue.current() is not rares)
+        self.assertEqual(len(self.catalogue.current()), 10)
+        self.assertEqual(len(self.catalogue.get()), 10)
+
+    def test_bad_file_keeps_previous(self):
+        rares = self.catalogue.get()
+        with open(self.path, "w") as f:
+            f.write("[{")
+        os.utime(self.path, (1700000200, 1700000200))
+        with self.assertLogs("PowerPlayProgress", level="ERROR"):
+            self.assertIs(self.catalogue.get(), rares)
+
+    def test_failed_load_not_retried(self):
+        """
+        A file that cannot be loaded is tried once, and again only when it changes.
+        """
+        with open(self.path, "w") as f:
+            f.write("[{")
+        os.utime(self.path, (1700000200, 1700000200))
+        with self.assertLogs("PowerPlayProgress", level="ERROR") as logs:
+            self.assertIsNone(self.catalogue.get())
+            for _ in range(20):
+                self.assertIsNone(self.catalogue.current())
+                self.assertIsNone(self.catalogue.get())
+        self.assertEqual(len(logs.records), 1)
+        self.assertIsNotNone(self.catalogue.error)
+        self.write(self.data, 1700000300)
+        self.assertIsNone(self.catalogue.error)
+        self.assertEqual(len(self.catalogue.get()), len(self.data))
+
+if __name__ == "__main__":
+    unittest.main()
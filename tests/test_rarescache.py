@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from rares import RARES_FILE, Rares
+import rarescache
+
+class TestRaresCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.directory.name, "rare-commodities.json")
+        self.cache_path = os.path.join(self.directory.name, "rare-commodities.cache")
+        with open(RARES_FILE, "rb") as source, open(self.json_path, "wb") as f:
+            f.write(source.read())
+        self.expected = Rares(self.json_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self) -> Rares:
+        return Rares(self.json_path, self.cache_path)
+
+    def test_same_as_json(self):
+        for rares in (self.load(), self.load()):
+            self.assertEqual([c.to_dict() for c in rares], [c.to_dict() for c in self.expected])
+            self.assertEqual([near.rare.id for near in rares.nearest_k(10, -20, 30, 10, min_pad_size=2)],
+                             [near.rare.id for near in self.expected.nearest_k(10, -20, 30, 10, min_pad_size=2)])
+            self.assertEqual(rares.get_by_symbol("LavianBrandy").system, "Lave")
+
+    def test_decoded_lazily(self):
+        rares = self.load()
+        self.assertEqual(rares.commodities._decoded.count(None), len(rares))
+        found = rares.nearest_k(0, 0, 0, 10)
+        self.assertEqual(len(rares) - rares.commodities._decoded.count(None), 10)
+        self.assertIs(rares.nearest_k(0, 0, 0, 1)[0].rare, found[0].rare)
+
+    def test_compiled_once(self):
+        self.load()
+        stat = os.stat(self.cache_path)
+        self.load()
+        self.assertEqual(os.stat(self.cache_path).st_mtime_ns, stat.st_mtime_ns)
+        # Touched but not changed, e.g. reinstalled, is still current, only the header is updated
+        os.utime(self.json_path, ns=(stat.st_mtime_ns + 10 ** 9, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(len(self.load()), len(self.expected))
+        self.assertEqual(os.stat(self.cache_path).st_ino, stat.st_ino)
+
+    def test_touched_json_hashed_once(self):
+        """
+        After the JSON is touched but not changed, the cache header is updated so the next load does not read it.
+        """
+        self.load()
+        stat = os.stat(self.json_path)
+        os.utime(self.json_path, ns=(stat.st_mtime_ns + 10 ** 9, stat.st_mtime_ns + 10 ** 9))
+        self.load()
+        read = []
+        read_bytes = Path.read_bytes
+        with mock.patch.object(Path, "read_bytes", autospec=True, side_effect=lambda path: read.append(path) or read_bytes(path)):
+            rares = self.load()
+        self.assertEqual(read, [Path(self.cache_path)])
+        self.assertEqual([c.to_dict() for c in rares], [c.to_dict() for c in self.expected])
+
+    def test_recompiled_when_changed(self):
+        self.load()
+        data = [c.to_dict() for c in self.expected][:5]
+        data[0]["name"] = "Ünïcödé Whisky"
+        data[1]["stationName"] = None
+        data[2]["count"] = None
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        rares = self.load()
+        self.assertEqual([c.to_dict() for c in rares], data)
+
+    def test_bad_cache_recompiled(self):
+        self.load()
+        with open(self.cache_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.cache_path) // 2)
+        self.assertEqual([c.to_dict() for c in self.load()], [c.to_dict() for c in self.expected])
+        with open(self.cache_path, "wb") as f:
+            f.write(b"not a cache")
+        self.assertEqual(len(self.load()), len(self.expected))
+        with open(self.cache_path, "rb") as f:
+            self.assertEqual(rarescache.CompiledRares(f.read()).count, len(self.expected))
+
+    def test_unwritable_cache(self):
+        self.cache_path = os.path.join(self.directory.name, "missing", "rare-commodities.cache")
+        with self.assertLogs("PowerPlayProgress", level="ERROR"):
+            rares = self.load()
+        self.assertEqual(len(rares), len(self.expected))
+
+if __name__ == "__main__":
+    unittest.main()
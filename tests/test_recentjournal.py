@@ -1,3 +1,4 @@
+import random
 import unittest
 from src.recentjournal import RecentJournal
 
@@ -19,8 +20,8 @@ class TestRecentJournal(unittest.TestCase):
         """
         entry = {"event": "PowerplayMerits", "MeritsGained": 10}
         self.recent_journal.add_entry(entry)
-        self.assertEqual(len(self.recent_journal._RecentJournal__journal_entries_log), 5)
-        self.assertEqual(self.recent_journal._RecentJournal__journal_entries_log[0], entry)
+        self.assertEqual(len(self.recent_journal.entries), 5)
+        self.assertEqual(self.recent_journal.entries[0], entry)
 
     def test_is_on_foot(self):
         """
@@ -284,5 +285,165 @@ class TestRecentJournal(unittest.TestCase):
         self.assertFalse(self.recent_journal.isDonationMissionMeritsSecond) 
         """
 
+class TestRecentJournalHistory(unittest.TestCase):
+    def setUp(self):
+        self.recent_journal = RecentJournal()
+
+    def test_history_depth(self):
+        """
+        Only the last HISTORY_DEPTH entries are kept, most recent first.
+        """
+        for i in range(RecentJournal.HISTORY_DEPTH + 5):
+            self.recent_journal.add_entry({"event": "ShipTargeted", "Index": i})
+        entries = self.recent_journal.entries
+        self.assertEqual(len(entries), RecentJournal.HISTORY_DEPTH)
+        self.assertEqual(entries[0]["Index"], RecentJournal.HISTORY_DEPTH + 4)
+        self.assertEqual(entries[-1]["Index"], 5)
+
+    def test_records_normalised(self):
+        self.recent_journal.add_entry({"event": "MarketSell", "Type": "gold"})
+        record = self.recent_journal.records()[0]
+        self.assertEqual(record.name, "MarketSell")
+        self.assertEqual(record.event, "marketsell")
+        self.assertEqual(record.code, RecentJournal.event_code("marketsell"))
+
+    def test_duplicate_merits_skipped(self):
+        self.assertTrue(self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100}))
+        self.recent_journal.add_entry({"event": "ShipTargeted"})
+        self.assertFalse(self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100}))
+        self.assertTrue(self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 105}))
+
+    def test_duplicate_merits_after_eviction(self):
+        """
+        A repeat of merits that have dropped out of the history is not a duplicate.
+        """
+        self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        for _ in range(RecentJournal.HISTORY_DEPTH):
+            self.recent_journal.add_entry({"event": "ShipTargeted"})
+        self.assertTrue(self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100}))
+
+class TestRecentJournalClassify(unittest.TestCase):
+    # The activities in the order the PowerplayMerits handler tested them before classify
+    precedence = [RecentJournal.BOUNTY, RecentJournal.RIVAL_POWER_KILLS, RecentJournal.SCAN, RecentJournal.POWERPLAY_DELIVERY,
+                  RecentJournal.DONATION_MISSION, RecentJournal.SCAN_DATA_LINKS, RecentJournal.HOLOSCREEN_HACK, RecentJournal.RARE_GOODS,
+                  RecentJournal.SALVAGE, RecentJournal.CARTOGRAPHY, RecentJournal.HIGH_VALUE_COMMODITIES, RecentJournal.LOW_VALUE_COMMODITIES,
+                  RecentJournal.EXOBIOLOGY, RecentJournal.MINED, RecentJournal.ON_FOOT, RecentJournal.COMMIT_CRIMES]
+
+    def setUp(self):
+        self.recent_journal = RecentJournal()
+
+    def random_entry(self, rnd: random.Random) -> dict:
+        event = rnd.choice(["PowerplayMerits", "ShipTargeted", "MaterialCollected", "Bounty", "PowerplayDeliver", "MissionCompleted", "DataScanned",
+                            "HoloscreenHacked", "MarketSell", "SearchAndRescue", "SellExplorationData", "SellOrganicData", "CommitCrime",
+                            "Docked", "Disembark", "Embark"])
+        entry: dict = {"event": event}
+        if event == "PowerplayMerits":
+            entry.update(MeritsGained=rnd.choice([5, 40, 41, 100]), TotalMerits=rnd.randint(0, 6))
+        elif event == "ShipTargeted":
+            entry.update(ScanStage=rnd.randint(0, 3), TargetLocked=rnd.choice([True, False]))
+        elif event == "MaterialCollected":
+            entry["Name"] = rnd.choice(["wakesolutions", "iron"])
+        elif event == "MissionCompleted":
+            entry["Name"] = rnd.choice(["Mission_AltruismCredits_name", "Mission_Courier_name"])
+        elif event == "DataScanned":
+            entry["Type"] = rnd.choice(["$Datascan_ShipUplink;", "$Datascan_DataPoint;"])
+        elif event == "MarketSell":
+            entry.update(Type=rnd.choice(["gold", "saxonwine"]), AvgPricePaid=rnd.choice([0, 100, 1000]), SellPrice=rnd.choice([100, 400, 2000]),
+                         Count=rnd.randint(1, 9))
+        elif event == "SearchAndRescue":
+            entry["Name"] = rnd.choice(["occupiedcryopod", "gold"])
+        elif event == "Disembark":
+            entry["OnPlanet"] = rnd.choice([True, False])
+        return entry
+
+    def test_matches_properties(self):
+        """
+        classify picks the first activity, in the handler's old order, with a rule that matches.
+        """
+        for seed in range(500):
+            rnd = random.Random(seed)
+            recent_journal = RecentJournal()
+            for _ in range(30):
+                recent_journal.add_entry(self.random_entry(rnd))
+                expected = next((activity for activity in self.precedence
+                                 if recent_journal.activity_rules.matches(recent_journal.records(), recent_journal, activity)),
+                                RecentJournal.UNKNOWN)
+                found = recent_journal.classify()
+                self.assertEqual(found.activity, expected, (seed, recent_journal.entries[:3]))
+                if expected == RecentJournal.MINED:
+                    self.assertEqual(found.mined_commodity, recent_journal.get_mined_commodity())
+                    self.assertEqual(found.mined_tonnage, recent_journal.get_mined_tonnage())
+
+    def test_empty(self):
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.UNKNOWN)
+
+    def test_bounty_evidence(self):
+        self.recent_journal.add_entry({"event": "Bounty"})
+        self.recent_journal.add_entry({"event": "ShipTargeted", "TargetLocked": True, "ScanStage": 3})
+        self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 20, "TotalMerits": 100})
+        found = self.recent_journal.classify()
+        self.assertEqual(found.activity, RecentJournal.BOUNTY)
+        self.assertEqual(found.evidence, (0, 2))
+
+    def test_mined(self):
+        self.recent_journal.add_entry({"event": "Docked"})
+        self.recent_journal.add_entry({"event": "MarketSell", "Type": "platinum", "Count": 12, "SellPrice": 200000, "AvgPricePaid": 0})
+        self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 300, "TotalMerits": 100})
+        self.assertEqual(self.recent_journal.classify(), ("mined", (0, 1), "platinum", 12))
+
+    def test_result_immutable(self):
+        found = self.recent_journal.classify()
+        with self.assertRaises(AttributeError):
+            found.activity = RecentJournal.BOUNTY
+
+class TestRecentJournalEvidence(unittest.TestCase):
+    def setUp(self):
+        self.recent_journal = RecentJournal()
+
+    def test_last_position(self):
+        self.assertIsNone(self.recent_journal.last_position("MultiSellExplorationData"))
+        self.recent_journal.add_entry({"event": "MultiSellExplorationData"})
+        self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        self.recent_journal.add_entry({"event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 105})
+        self.assertEqual(self.recent_journal.last_position("MultiSellExplorationData"), 2)
+        self.assertEqual(self.recent_journal.last_position("PowerplayMerits"), 0)
+
+    def test_evicted_entries_leave_index(self):
+        self.recent_journal.add_entry({"event": "Bounty"})
+        for _ in range(RecentJournal.HISTORY_DEPTH - 1):
+            self.recent_journal.add_entry({"event": "ShipTargeted"})
+        self.assertEqual(self.recent_journal.last_position("Bounty"), RecentJournal.HISTORY_DEPTH - 1)
+        self.recent_journal.add_entry({"event": "ShipTargeted"})
+        self.assertIsNone(self.recent_journal.last_position("Bounty"))
+
+    def test_stale_bounty_not_matched(self):
+        """
+        A bounty ten minutes before the merits is not evidence for them.
+        """
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:00:00Z", "event": "Bounty"})
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:10:00Z", "event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        self.assertFalse(self.recent_journal.isBounty)
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.UNKNOWN)
+
+    def test_window_not_counted_as_history(self):
+        """
+        A rule needing three records in the journal still applies when only two are within the window.
+        """
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:00:00Z", "event": "Docked"})
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:10:00Z", "event": "CommitCrime"})
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:10:00Z", "event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        self.assertTrue(self.recent_journal.isCommitCrimes)
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.COMMIT_CRIMES)
+
+    def test_recent_bounty_matched(self):
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T23:59:30Z", "event": "Bounty"})
+        self.recent_journal.add_entry({"timestamp": "2025-05-31T00:00:10Z", "event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.BOUNTY)
+
+    def test_missing_timestamps_in_window(self):
+        self.recent_journal.add_entry({"event": "Bounty"})
+        self.recent_journal.add_entry({"timestamp": "2025-05-30T20:10:00Z", "event": "PowerplayMerits", "MeritsGained": 5, "TotalMerits": 100})
+        self.assertEqual(self.recent_journal.classify().activity, RecentJournal.BOUNTY)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
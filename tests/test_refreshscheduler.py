@@ -0,0 +1,75 @@
+import unittest
+from refreshscheduler import RefreshScheduler
+
+class FakeWidget:
+    """
+    Records the after/after_idle calls instead of running a Tk event loop.
+    """
+    def __init__(self):
+        self.scheduled = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.scheduled[f"after#{self.next_id}"] = (ms, func)
+        return f"after#{self.next_id}"
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, timer_id):
+        del self.scheduled[timer_id]
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, {}
+        for _, func in pending.values():
+            func()
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.renders = 0
+        self.now = 100.0
+        self.widget = FakeWidget()
+        self.scheduler = RefreshScheduler(self.render, 250, clock=lambda: self.now)
+        self.scheduler.attach(self.widget)
+
+    def render(self):
+        self.renders += 1
+
+    def test_burst_renders_once(self):
+        for _ in range(50):
+            self.scheduler.request()
+        self.assertEqual(self.renders, 0)
+        self.assertEqual(len(self.widget.scheduled), 1)
+        self.widget.run_pending()
+        self.assertEqual(self.renders, 1)
+        self.assertFalse(self.scheduler.dirty)
+
+    def test_first_request_waits_for_idle(self):
+        self.scheduler.request()
+        self.assertEqual([ms for ms, _ in self.widget.scheduled.values()], [0])
+
+    def test_interval_between_renders(self):
+        self.scheduler.request()
+        self.widget.run_pending()
+        self.now += 0.1
+        self.scheduler.request()
+        self.assertEqual([ms for ms, _ in self.widget.scheduled.values()], [150])
+        self.now += 0.5
+        self.widget.run_pending()
+        self.assertEqual(self.renders, 2)
+
+    def test_flush_renders_now_and_cancels_pending(self):
+        self.scheduler.request()
+        self.scheduler.flush()
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(self.widget.scheduled, {})
+        self.assertFalse(self.scheduler.dirty)
+
+    def test_without_widget_renders_immediately(self):
+        scheduler = RefreshScheduler(self.render, 250, clock=lambda: self.now)
+        scheduler.request()
+        self.assertEqual(self.renders, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+from rowpool import RowPool
+
+class FakeWidget:
+    """
+    Records the calls the pool makes on a widget.
+    """
+    def __init__(self, **options):
+        self.options = dict(options)
+        self.configure_calls = 0
+        self.grid_calls = 0
+        self.visible = False
+        self.destroyed = False
+
+    def configure(self, **options):
+        self.options.update(options)
+        self.configure_calls += 1
+
+    def grid(self, **kwargs):
+        self.grid_info = kwargs
+        self.grid_calls += 1
+        self.visible = True
+
+    def grid_remove(self):
+        self.visible = False
+
+    def destroy(self):
+        self.destroyed = True
+
+class TestRowPool(unittest.TestCase):
+    def setUp(self):
+        self.registered = []
+        self.pool = RowPool(self.registered.append)
+
+    def refresh(self, rows):
+        self.pool.begin()
+        widgets = [self.pool.place(key, FakeWidget, row, 0, text=text) for row, (key, text) in enumerate(rows)]
+        self.pool.end()
+        return widgets
+
+    def test_new_rows_created_once(self):
+        first = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.assertEqual(self.pool.take_created(), first)
+        second = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.assertEqual(len(self.pool), 2)
+        self.assertEqual(self.registered, first)
+        self.assertEqual([id(w) for w in first], [id(w) for w in second])
+        self.assertEqual(self.pool.take_created(), [])
+
+    def test_unchanged_rows_not_reconfigured(self):
+        sol, _ = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.refresh([("Sol", "10"), ("Achenar", "25")])
+        self.assertEqual(sol.configure_calls, 0)
+        self.assertEqual(sol.grid_calls, 1)
+
+    def test_changed_text_updated(self):
+        _, achenar = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.refresh([("Sol", "10"), ("Achenar", "25")])
+        self.assertEqual(achenar.options["text"], "25")
+        self.assertEqual(achenar.configure_calls, 1)
+
+    def test_moved_row_regridded(self):
+        _, achenar = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.pool.take_created()
+        lave, _, _ = self.refresh([("Lave", "5"), ("Sol", "10"), ("Achenar", "20")])
+        self.assertEqual(achenar.grid_info["row"], 2)
+        self.assertEqual(self.pool.take_created(), [lave])
+
+    def test_missing_rows_hidden_and_reused(self):
+        sol, achenar = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.refresh([("Sol", "10")])
+        self.assertFalse(achenar.visible)
+        self.assertFalse(achenar.destroyed)
+        again = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.assertIs(again[1], achenar)
+        self.assertTrue(achenar.visible)
+
+    def test_padding_regridded(self):
+        self.pool.begin()
+        widget = self.pool.place("Sol", FakeWidget, 0, 0, sticky="", padx=5, pady=2, text="10")
+        self.pool.end()
+        self.assertEqual((widget.grid_info["sticky"], widget.grid_info["padx"], widget.grid_info["pady"]), ("", 5, 2))
+        self.pool.begin()
+        self.pool.place("Sol", FakeWidget, 0, 0, sticky="", padx=5, pady=2, text="10")
+        self.pool.end()
+        self.assertEqual(widget.grid_calls, 1)
+
+    def test_idle_rows_destroyed(self):
+        self.pool = RowPool(max_idle=2)
+        sol, achenar = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        for _ in range(2):
+            self.refresh([("Sol", "10")])
+        self.assertFalse(achenar.destroyed)
+        self.refresh([("Sol", "10")])
+        self.assertTrue(achenar.destroyed)
+        self.assertFalse(sol.destroyed)
+        self.assertEqual(len(self.pool), 1)
+        self.assertNotIn(achenar, self.pool.take_created())
+        again = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.assertIsNot(again[1], achenar)
+        self.assertTrue(again[1].visible)
+
+    def test_shown_row_idle_reset(self):
+        self.pool = RowPool(max_idle=2)
+        _, achenar = self.refresh([("Sol", "10"), ("Achenar", "20")])
+        for _ in range(4):
+            self.refresh([("Sol", "10")])
+            self.refresh([("Sol", "10")])
+            self.refresh([("Sol", "10"), ("Achenar", "20")])
+        self.assertFalse(achenar.destroyed)
+
+    def test_names_unique_after_idle_rows_destroyed(self):
+        """
+        A row re-keyed, e.g. a system whose address became known, idles out without its name being reused.
+        """
+        self.pool = RowPool(max_idle=1)
+        live: dict[str, FakeWidget] = {}
+
+        def create(**options):
+            name = self.pool.unique_name("system")
+            self.assertNotIn(name, live)
+            widget = live[name] = FakeWidget(**options)
+            return widget
+
+        def place(keys):
+            self.pool.begin()
+            for row, key in enumerate(keys):
+                self.pool.place(key, create, row, 0, text=key)
+            self.pool.end()
+            for name, widget in list(live.items()):
+                if widget.destroyed:
+                    del live[name]
+
+        place(["Sol", "Achenar", "Lave"])
+        place(["Sol", 10477373803, "Lave"])
+        place(["Sol", 10477373803, "Lave"])
+        self.assertEqual(len(self.pool), 3)
+        place(["Sol", 10477373803, "Lave", "Diso"])
+        self.assertEqual(len(live), 4)
+        self.assertFalse(any(widget.destroyed for widget in live.values()))
+
+    def test_clear_destroys(self):
+        widgets = self.refresh([("Sol", "10")])
+        self.pool.clear()
+        self.assertTrue(widgets[0].destroyed)
+        self.assertEqual(len(self.pool), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from sessionprogress import ActivityKind, SessionProgress
+
+class TestSessionProgressTotals(unittest.TestCase):
+    def setUp(self):
+        self.session = SessionProgress()
+        self.session.add_commodity(SessionProgress.Commodities("republicanfieldsupplies", "Archer's Field Supplies", "Sol", 52, 0))
+        self.session.add_commodity(SessionProgress.Commodities("republicanfieldsupplies", "Archer's Field Supplies", "Uzumoku", 0, 30))
+        self.session.add_commodity(SessionProgress.Commodities("republicanfieldsupplies", "Archer's Field Supplies", "LHS 3197", 0, 22))
+        self.session.add_commodity(SessionProgress.Commodities("powerpropagandadata", "Power Political Data", "Uzumoku", 0, 2))
+        self.session.add_commodity(SessionProgress.Commodities("powerpropagandadata", "Power Political Data", "Uzumoku", 0, 1))
+
+    def test_totals(self):
+        self.assertEqual(self.session.total_commodities_collected, 52)
+        self.assertEqual(self.session.total_commodities_delivered, 55)
+        self.assertEqual(self.session.total_commodities_delivered_by_system("Uzumoku"), 33)
+        self.assertEqual(self.session.total_commodities_delivered_by_system("LHS 3197"), 22)
+        self.assertEqual(self.session.total_commodities_delivered_by_system("Sol"), 0)
+        self.assertEqual(self.session.total_commodities_delivered_by_type("Power Political Data"), 3)
+        self.assertEqual(self.session.total_commodities_delivered_by_type("Unknown"), 0)
+
+    def test_totals_match_rows(self):
+        """
+        The running totals are the sums over the commodity rows.
+        """
+        self.assertEqual(self.session.total_commodities_delivered, sum(c.delivered for c in self.session.commodities))
+        for system in self.session.commodities_delivered_systems:
+            self.assertEqual(self.session.total_commodities_delivered_by_system(system),
+                             sum(c.delivered for c in self.session.commodities if c.delivered_system == system))
+
+    def test_clear(self):
+        self.session.clear_commodities()
+        self.assertEqual(self.session.total_commodities_collected, 0)
+        self.assertEqual(self.session.total_commodities_delivered_by_system("Uzumoku"), 0)
+        self.assertEqual(self.session.commodities_delivered_types, [])
+
+    def test_carry_over(self):
+        session = SessionProgress()
+        session.carry_over(self.session)
+        session.add_commodity(SessionProgress.Commodities("powerpropagandadata", "Power Political Data", "Uzumoku", 0, 4))
+        self.assertEqual(session.total_commodities_delivered, 59)
+        self.assertEqual(session.total_commodities_delivered_by_type("Power Political Data"), 7)
+
+    def test_activity_total(self):
+        activities = self.session.activities
+        activities.add(ActivityKind.BOUNTIES, 20)
+        activities.add(ActivityKind.UNKNOWN, 44)
+        activities.add_mined(300, "platinum", 12)
+        activities.add(ActivityKind.DONATION_MISSIONS, 44)
+        activities.add(ActivityKind.UNKNOWN, -44)
+        self.assertEqual(activities.get_total_merits(), 364)
+        self.assertEqual(activities.get_total_merits(), sum(merits for _, merits in activities.items()))
+
+class TestCommodityLedger(unittest.TestCase):
+    def setUp(self):
+        self.ledger = SessionProgress.CommodityLedger()
+
+    def test_journal_entries(self):
+        self.assertTrue(self.ledger.add_journal_entry("Sol", {"event": "PowerplayCollect", "Type": "republicanfieldsupplies",
+                                                              "Type_Localised": "Archer's Field Supplies", "Count": 52}))
+        self.assertTrue(self.ledger.add_journal_entry("Uzumoku", {"event": "PowerplayDeliver", "Type": "republicanfieldsupplies",
+                                                                  "Type_Localised": "Archer's Field Supplies", "Count": 50}))
+        self.assertTrue(self.ledger.add_journal_entry("Uzumoku", {"event": "DeliverPowerMicroResources", "TotalCount": 3, "MicroResources": [
+            {"Name": "powerpropagandadata", "Name_Localised": "Power Political Data", "Category": "Data", "Count": 2},
+            {"Name": "powerclassifieddata", "Name_Localised": "Power Classified Data", "Category": "Data", "Count": 1},
+            {"Name": "chemicalsample", "Name_Localised": "Chemical Sample", "Category": "Item", "Count": 4}]}))
+        self.assertEqual(self.ledger.collected, 52)
+        self.assertEqual(self.ledger.delivered, 53)
+        self.assertEqual(self.ledger.delivered_by_system, {"Uzumoku": 53})
+        self.assertEqual(self.ledger.delivered_by_type, {"Archer's Field Supplies": 50, "Power Political Data": 2, "Power Classified Data": 1})
+        self.assertEqual(set(self.ledger.rows), {("republicanfieldsupplies", "Sol"), ("republicanfieldsupplies", "Uzumoku"),
+                                                 ("powerpropagandadata", "Uzumoku"), ("powerclassifieddata", "Uzumoku")})
+
+    def test_spyware_not_collected(self):
+        self.assertFalse(self.ledger.add_journal_entry("Sol", {"event": "PowerplayCollect", "Type": "powerspyware", "Type_Localised": "Power Spyware", "Count": 1}))
+        self.assertEqual(self.ledger.rows, {})
+
+    def test_rows_merged(self):
+        for _ in range(3):
+            self.ledger.add_journal_entry("Uzumoku", {"event": "PowerplayDeliver", "Type": "powerpropagandadata", "Type_Localised": "Power Political Data", "Count": 2})
+        self.assertEqual(len(self.ledger.rows), 1)
+        self.assertEqual(self.ledger.rows[("powerpropagandadata", "Uzumoku")].delivered, 6)
+
+class TestActivities(unittest.TestCase):
+    def setUp(self):
+        self.activities = SessionProgress.Activities()
+
+    def test_add(self):
+        self.assertEqual(self.activities.add(ActivityKind.CARTOGRAPHY, 57), 57)
+        self.assertEqual(self.activities.add(ActivityKind.CARTOGRAPHY, 3), 60)
+        self.assertEqual(self.activities[ActivityKind.CARTOGRAPHY], 60)
+        self.assertEqual(self.activities[ActivityKind.BOUNTIES], 0)
+
+    def test_items_in_display_order(self):
+        self.activities.add(ActivityKind.RIVAL_POWER_KILLS, 5)
+        items = list(self.activities.items())
+        self.assertEqual([kind for kind, _ in items], list(ActivityKind))
+        self.assertEqual(items[-1], (ActivityKind.RIVAL_POWER_KILLS, 5))
+        self.assertEqual(ActivityKind.SHIP_SCANS.heading, "Ship\\Wake Scans:")
+
+    def test_mined_by_commodity(self):
+        self.activities.add_mined(300, "platinum", 12)
+        self.activities.add_mined(100, "painite", 4)
+        self.activities.add_mined(200, "platinum", 8)
+        self.assertEqual(self.activities[ActivityKind.MINED], 600)
+        self.assertEqual(list(self.activities.mined_commodities), ["platinum", "painite"])
+        self.assertEqual(self.activities.mined_commodities["platinum"].tonnage, 20)
+
+    def test_snapshot_and_merge(self):
+        self.activities.add(ActivityKind.UNKNOWN, -10)
+        self.activities.add_mined(300, "platinum", 12)
+        other = SessionProgress.Activities()
+        other.add(ActivityKind.UNKNOWN, 25)
+        other.add_mined(50, "platinum", 2)
+        self.activities.merge(other)
+        snapshot = self.activities.snapshot()
+        self.assertEqual(len(snapshot), len(ActivityKind))
+        self.assertEqual(snapshot[ActivityKind.UNKNOWN], 15)
+        self.assertEqual(snapshot[ActivityKind.MINED], 350)
+        self.assertEqual(self.activities.get_total_merits(), 365)
+        self.assertEqual(self.activities.mined_commodities["platinum"].tonnage, 14)
+
+if __name__ == "__main__":
+    unittest.main()
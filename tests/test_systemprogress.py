@@ -0,0 +1,31 @@
+import unittest
+from sessionprogress import SessionProgress
+from systemprogress import SystemProgress
+
+class TestSystemProgress(unittest.TestCase):
+    def test_positions_per_system(self):
+        """
+        Setting the position of one system leaves every other system where it was.
+        """
+        sol = SystemProgress("Sol")
+        lave = SystemProgress("Lave")
+        lave.set_position([75.75, 48.75, 70.75])
+        self.assertEqual(sol.position, SystemProgress.SystemPosition(0.0, 0.0, 0.0))
+        self.assertEqual(lave.position, (75.75, 48.75, 70.75))
+        self.assertEqual((lave.x, lave.y, lave.z), (75.75, 48.75, 70.75))
+
+    def test_position_is_read_only(self):
+        system = SystemProgress("Sol")
+        with self.assertRaises(AttributeError):
+            system.position.x = 1.0
+        with self.assertRaises(AttributeError):
+            system.position = SystemProgress.SystemPosition(1.0, 2.0, 3.0)
+
+    def test_slots(self):
+        for record in (SystemProgress(), SessionProgress.Commodities(), SessionProgress.Activities.MinedCommodity()):
+            self.assertFalse(hasattr(record, "__dict__"))
+            with self.assertRaises(AttributeError):
+                record.misspelt = 1
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from systemprogress import SystemProgress
+from systemregistry import SystemRegistry
+
+def make_system(name, address=None, earnings=0):
+    system = SystemProgress()
+    system.system = name
+    system.system_address = address
+    system.earnings = earnings
+    return system
+
+class TestSystemRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = SystemRegistry()
+        self.registry.add(make_system("Sol", 10477373803))
+        self.registry.add(make_system("Lave", 7269634680241))
+        self.registry.add(make_system("Eranin"))
+
+    def test_get_by_address(self):
+        self.assertEqual(self.registry.get("Sol", 10477373803).system, "Sol")
+
+    def test_get_by_name(self):
+        self.assertEqual(self.registry.get("Lave").system_address, 7269634680241)
+        self.assertIsNone(self.registry.get("Achenar"))
+
+    def test_address_learnt_from_name(self):
+        """
+        A system first seen without an address picks it up on the first lookup that has one.
+        """
+        eranin = self.registry.get("Eranin", 2832631632594)
+        self.assertIsNotNone(eranin)
+        self.assertEqual(eranin.system_address, 2832631632594)
+        self.assertIs(self.registry.get("", 2832631632594), eranin)
+
+    def test_same_name_different_address(self):
+        self.assertIsNone(self.registry.get("Sol", 1))
+
+    def test_add_existing_returns_registered(self):
+        sol = self.registry.get("Sol")
+        self.assertIs(self.registry.add(make_system("Sol", 10477373803, 100)), sol)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_insertion_order(self):
+        self.registry.add(make_system("Achenar", 164098653))
+        self.assertEqual([s.system for s in self.registry], ["Sol", "Lave", "Eranin", "Achenar"])
+
+    def test_clear(self):
+        self.registry.clear()
+        self.assertEqual(len(self.registry), 0)
+        self.assertIsNone(self.registry.get("Sol", 10477373803))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from versioncheck import VersionCheck
+
+class StubReleases(BaseHTTPRequestHandler):
+    """
+    The GitHub latest release API, with an ETag.
+    """
+    tag_name = "v1.2.0"
+    delay = 0.0
+    requests: list = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        time.sleep(self.delay)
+        etag = f'"{self.tag_name}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"tag_name": self.tag_name}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestVersionCheck(unittest.TestCase):
+    def setUp(self):
+        StubReleases.tag_name = "v1.2.0"
+        StubReleases.delay = 0.0
+        StubReleases.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubReleases)
+        self.server.daemon_threads = True
+        # The client hanging up on a slow response is expected
+        self.server.handle_error = lambda request, client_address: None
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/repos/alby666/EDMC-PowerPlayProgress/releases/latest"
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "version.json")
+        self.now = 1000000.0
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def check(self, **kwargs) -> VersionCheck:
+        return VersionCheck(self.cache_path, self.url, ttl=3600, clock=lambda: self.now, **kwargs)
+
+    def test_newer_version(self):
+        self.assertEqual(self.check().newer_version("1.1.9"), "1.2.0")
+        self.assertEqual(self.check().newer_version("1.2.0"), "")
+
+    def test_cached_within_ttl(self):
+        self.check().latest_tag()
+        self.now += 3599
+        self.assertEqual(self.check().latest_tag(), "v1.2.0")
+        self.assertEqual(len(StubReleases.requests), 1)
+
+    def test_conditional_request_after_ttl(self):
+        self.check().latest_tag()
+        self.now += 3601
+        self.assertEqual(self.check().latest_tag(), "v1.2.0")
+        self.assertEqual(len(StubReleases.requests), 2)
+        self.assertEqual(StubReleases.requests[1].get("If-None-Match"), '"v1.2.0"')
+        # The 304 refreshes the cache
+        self.now += 1800
+        self.check().latest_tag()
+        self.assertEqual(len(StubReleases.requests), 2)
+
+    def test_new_release_after_ttl(self):
+        self.check().latest_tag()
+        StubReleases.tag_name = "v1.3.0"
+        self.now += 3601
+        self.assertEqual(self.check().newer_version("1.2.0"), "1.3.0")
+
+    def test_timeout_in_background(self):
+        """
+        A slow server neither blocks the caller nor the check for longer than the timeout.
+        """
+        StubReleases.delay = 1.0
+        check = self.check(timeout=0.2)
+        start = time.monotonic()
+        with self.assertLogs("PowerPlayProgress", level="ERROR"):
+            check.start()
+            self.assertIsNone(check.result)
+            while check.result is None and time.monotonic() - start < 0.9:
+                time.sleep(0.02)
+        self.assertEqual(check.result, "")
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_unreachable_uses_stale_cache(self):
+        self.check().latest_tag()
+        self.server.shutdown()
+        self.server.server_close()
+        self.now += 3601
+        with self.assertLogs("PowerPlayProgress", level="ERROR"):
+            self.assertEqual(self.check(timeout=0.5).latest_tag(), "v1.2.0")
+
+if __name__ == "__main__":
+    unittest.main()